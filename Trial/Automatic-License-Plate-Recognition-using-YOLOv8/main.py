@@ -1,18 +1,23 @@
-from ultralytics import YOLO
 import cv2
+import numpy as np
 
 import util
-from sort.sort import *
-from util import get_car, read_license_plate, write_csv
+from util import get_car, read_license_plates, write_csv
+from model_registry import acquire_yolo
+from tracker import SortTracker
+from plate_consensus import TrackPlateConsensus
 
 
 results = {}
 
-mot_tracker = Sort()
+mot_tracker = SortTracker()
+
+# per-car vote over the plate reads; OCR stops once a car's plate has settled
+plate_consensus = TrackPlateConsensus()
 
 # load models
-coco_model = YOLO('yolov8n.pt')
-license_plate_detector = YOLO('license_plate_detector.pt')
+coco_model = acquire_yolo('yolov8n.pt')
+license_plate_detector = acquire_yolo('license_plate_detector.pt')
 
 # load video
 cap = cv2.VideoCapture('./sample.mp4')
@@ -28,25 +33,36 @@ while ret:
     if ret:
         results[frame_nmr] = {}
         # detect vehicles
-        detections = coco_model(frame)[0]
+        detections = coco_model.detect([frame])[0]
         detections_ = []
-        for detection in detections.boxes.data.tolist():
-            x1, y1, x2, y2, score, class_id = detection
+        for (x1, y1, x2, y2), score, class_id in zip(detections.boxes.tolist(), detections.scores.tolist(),
+                                                     detections.class_ids.tolist()):
             if int(class_id) in vehicles:
                 detections_.append([x1, y1, x2, y2, score])
 
         # track vehicles
         track_ids = mot_tracker.update(np.asarray(detections_))
+        plate_consensus.evict(mot_tracker.expired)
 
         # detect license plates
-        license_plates = license_plate_detector(frame)[0]
-        for license_plate in license_plates.boxes.data.tolist():
-            x1, y1, x2, y2, score, class_id = license_plate
+        license_plates = license_plate_detector.detect([frame])[0]
+        assigned = []
+        for (x1, y1, x2, y2), score, class_id in zip(license_plates.boxes.tolist(), license_plates.scores.tolist(),
+                                                     license_plates.class_ids.tolist()):
+            license_plate = [x1, y1, x2, y2, score, class_id]
 
             # assign license plate to car
             xcar1, ycar1, xcar2, ycar2, car_id = get_car(license_plate, track_ids)
 
-            if car_id != -1:
+            if car_id != -1 and plate_consensus.settled(car_id):
+                settled = plate_consensus.get(car_id)
+                results[frame_nmr][car_id] = {'car': {'bbox': [xcar1, ycar1, xcar2, ycar2]},
+                                              'license_plate': {'bbox': [x1, y1, x2, y2],
+                                                                'text': settled.text,
+                                                                'bbox_score': score,
+                                                                'text_score': settled.confidence}}
+
+            elif car_id != -1:
 
                 # crop license plate
                 license_plate_crop = frame[int(y1):int(y2), int(x1): int(x2), :]
@@ -55,15 +71,28 @@ while ret:
                 license_plate_crop_gray = cv2.cvtColor(license_plate_crop, cv2.COLOR_BGR2GRAY)
                 _, license_plate_crop_thresh = cv2.threshold(license_plate_crop_gray, 64, 255, cv2.THRESH_BINARY_INV)
 
-                # read license plate number
-                license_plate_text, license_plate_text_score = read_license_plate(license_plate_crop_thresh)
+                assigned.append((license_plate, (xcar1, ycar1, xcar2, ycar2, car_id), license_plate_crop_thresh))
 
-                if license_plate_text is not None:
-                    results[frame_nmr][car_id] = {'car': {'bbox': [xcar1, ycar1, xcar2, ycar2]},
-                                                  'license_plate': {'bbox': [x1, y1, x2, y2],
-                                                                    'text': license_plate_text,
-                                                                    'bbox_score': score,
-                                                                    'text_score': license_plate_text_score}}
+        # read all license plate numbers of the frame in one batch
+        texts, cache_hits = read_license_plates([crop for _, _, crop in assigned], with_hits=True)
+        for (license_plate, car, _), (license_plate_text, license_plate_text_score), cache_hit in zip(
+                assigned, texts, cache_hits):
+            x1, y1, x2, y2, score, class_id = license_plate
+            xcar1, ycar1, xcar2, ycar2, car_id = car
+
+            if license_plate_text is not None:
+                # a cached read replays an earlier one, so it is not a new vote
+                consensus = plate_consensus.get(car_id)
+                if not cache_hit:
+                    license_plate_text, license_plate_text_score = plate_consensus.add(
+                        car_id, license_plate_text, license_plate_text_score)
+                elif consensus is not None and consensus.text:
+                    license_plate_text, license_plate_text_score = consensus.text, consensus.confidence
+                results[frame_nmr][car_id] = {'car': {'bbox': [xcar1, ycar1, xcar2, ycar2]},
+                                              'license_plate': {'bbox': [x1, y1, x2, y2],
+                                                                'text': license_plate_text,
+                                                                'bbox_score': score,
+                                                                'text_score': license_plate_text_score}}
 
 # write results
 write_csv(results, './test.csv')
\ No newline at end of file
@@ -1,8 +1,20 @@
+import os
+import sys
 import string
-import easyocr
 
-# Initialize the OCR reader
-reader = easyocr.Reader(['en'], gpu=False)
+# The shared model registry lives in the parent (Trial) directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_registry import acquire_easyocr
+from plate_ocr import recognize_plate_crops
+from ocr_cache import OCRCache
+
+# Initialize the OCR reader (shared with any other pipeline in this process)
+reader = acquire_easyocr(['en'], gpu=False)
+
+# Plate reads keyed by a perceptual hash of the crop, so that the near identical
+# crops of a parked or queued car are only read once
+ocr_cache = OCRCache()
 
 # Mapping dictionaries for character conversion
 dict_char_to_int = {'O': '0',
@@ -107,7 +119,8 @@ def format_license(text):
 
 def read_license_plate(license_plate_crop):
     """
-    Read the license plate text from the given cropped image.
+    Read the license plate text from the given cropped image. Crops that look like
+    a recently read one reuse its result from ocr_cache.
 
     Args:
         license_plate_crop (PIL.Image.Image): Cropped image containing the license plate.
@@ -115,7 +128,10 @@ def read_license_plate(license_plate_crop):
     Returns:
         tuple: Tuple containing the formatted license plate text and its confidence score.
     """
+    return ocr_cache.cached(license_plate_crop, _read_license_plate)
 
+
+def _read_license_plate(license_plate_crop):
     detections = reader.readtext(license_plate_crop)
 
     for detection in detections:
@@ -129,6 +145,37 @@ def read_license_plate(license_plate_crop):
     return None, None
 
 
+def read_license_plates(license_plate_crops, with_hits=False):
+    """
+    Read the license plate text of several cropped plates with one OCR batch. Only
+    the crops missing from ocr_cache are read.
+
+    Args:
+        license_plate_crops (list): Cropped images, each containing one license plate.
+        with_hits (bool): Also return, per crop, whether its result was replayed from
+        ocr_cache instead of read.
+
+    Returns:
+        list: (formatted text, confidence score) per crop, in order; (None, None) where
+        no text complying with the format was read. With with_hits, a tuple of that
+        list and the list of cache-hit flags.
+    """
+    return ocr_cache.cached_batch(license_plate_crops, _read_license_plates, with_hits=with_hits)
+
+
+def _read_license_plates(license_plate_crops):
+    results = []
+    for text, score in recognize_plate_crops(reader, license_plate_crops):
+        text = text.upper().replace(' ', '')
+
+        if license_complies_format(text):
+            results.append((format_license(text), score))
+        else:
+            results.append((None, None))
+
+    return results
+
+
 def get_car(license_plate, vehicle_track_ids):
     """
     Retrieve the vehicle coordinates and ID based on the license plate coordinates.
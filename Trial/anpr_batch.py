@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Headless batch processing of recorded video with ANPRBackend.
+
+Every frame (or every --stride'th frame) of each video runs through the full
+pipeline as fast as the CPU allows, and one record per detected vehicle is
+streamed to a JSONL or CSV file (or stdout) as soon as its batch is done.
+Progress and throughput go to stderr. Nothing here imports Qt.
+
+Example:
+    python anpr_batch.py recordings/*.mp4 --output plates.csv
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import queue
+import logging
+import argparse
+import threading
+import cv2
+from typing import Iterator, Optional
+
+from anpr_processor import ANPRBackend
+from ocr_cache import OCRCache
+
+# Output columns, in CSV order
+FIELDS = (
+    'video', 'frame', 'time_s', 'track_id', 'type', 'color', 'confidence', 'bbox',
+    'plate_text', 'plate_ocr_confidence', 'plate_confidence', 'plate_bbox'
+)
+
+
+def setup_logging():
+    """Setup logging configuration."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description='Run ANPR over video files without the GUI')
+    parser.add_argument('videos', nargs='+', help='Video files to process')
+    parser.add_argument('--output', default='-',
+                        help='Output file; .csv writes CSV, anything else JSONL (default: JSONL on stdout)')
+    parser.add_argument('--format', choices=('jsonl', 'csv'),
+                        help='Output format, overriding the output file extension')
+    parser.add_argument('--stride', type=int, default=1, help='Process every Nth frame')
+    parser.add_argument('--batch-size', type=int, default=8, help='Frames per backend call')
+    parser.add_argument('--max-frames', type=int, help='Stop each video after this many frames')
+    parser.add_argument('--roi', type=int, nargs='+', help='ROI polygon as x1 y1 x2 y2 x3 y3 ...')
+    parser.add_argument('--device', default='cpu', help='Torch device, or an ONNX engine name')
+    parser.add_argument('--engine', help="Inference engine ('torch', 'onnxruntime' or 'openvino')")
+    parser.add_argument('--detect-size', type=int,
+                        help='Detect vehicles on frames downscaled to this many pixels on the long side')
+    parser.add_argument('--no-tracking', action='store_true',
+                        help='Recognize every vehicle in every frame instead of once per track')
+    parser.add_argument('--no-ocr-cache', action='store_true', help='Disable the perceptual-hash OCR cache')
+    args = parser.parse_args()
+    if args.stride < 1 or args.batch_size < 1:
+        parser.error('--stride and --batch-size must be at least 1')
+    if args.roi and (len(args.roi) < 4 or len(args.roi) % 2):
+        parser.error('--roi takes an even number of coordinates (a rectangle or polygon)')
+    if args.format is None:
+        args.format = 'csv' if args.output.lower().endswith('.csv') else 'jsonl'
+    return args
+
+
+class VideoReader(threading.Thread):
+    """Decodes a video on a background thread so decoding overlaps inference.
+
+    Frames the stride skips are only grabbed, not decoded. Decoded frames
+    are handed over through a bounded queue, so memory stays flat however
+    far ahead decoding gets.
+    """
+
+    def __init__(self, capture: cv2.VideoCapture, stride: int = 1,
+                 max_frames: Optional[int] = None, prefetch: int = 32):
+        """Initialize the reader.
+
+        Args:
+            capture: Opened video capture
+            stride: Decode every Nth frame
+            max_frames: Stop after this many frames of the video
+            prefetch: Decoded frames that may wait in the queue
+        """
+        super().__init__(daemon=True)
+        self.capture = capture
+        self.stride = stride
+        self.max_frames = max_frames
+        self.frames = queue.Queue(maxsize=prefetch)
+        self.fps = capture.get(cv2.CAP_PROP_FPS) or 0.0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        """Queue (frame index, time in seconds, frame) items, then None at the end."""
+        index = 0
+        try:
+            while not self._stop_event.is_set() and (self.max_frames is None or index < self.max_frames):
+                if index % self.stride:
+                    if not self.capture.grab():
+                        break
+                else:
+                    ok, frame = self.capture.read()
+                    if not ok:
+                        break
+                    # Position of the frame just read, in seconds
+                    msec = self.capture.get(cv2.CAP_PROP_POS_MSEC)
+                    timestamp = msec / 1000 if msec > 0 else (index / self.fps if self.fps else 0.0)
+                    self._put((index, timestamp, frame))
+                index += 1
+        finally:
+            self._put(None)
+
+    def _put(self, item):
+        while not self._stop_event.is_set():
+            try:
+                self.frames.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def stop(self):
+        """Stop decoding; a blocked put gives up within 0.1 s."""
+        self._stop_event.set()
+
+
+class RecordWriter:
+    """Streams vehicle records as JSONL or CSV rows, flushing after every batch."""
+
+    def __init__(self, stream, output_format: str):
+        """Initialize the writer.
+
+        Args:
+            stream: Text stream to write to
+            output_format: 'jsonl' or 'csv'; CSV starts with a header row
+        """
+        self.stream = stream
+        self.output_format = output_format
+        self.records = 0
+        if output_format == 'csv':
+            self._csv = csv.DictWriter(stream, fieldnames=FIELDS)
+            self._csv.writeheader()
+
+    def write(self, record: dict):
+        """Write one record; CSV joins box coordinates with spaces."""
+        if self.output_format == 'csv':
+            row = dict(record)
+            for key in ('bbox', 'plate_bbox'):
+                if row[key] is not None:
+                    row[key] = ' '.join(str(int(v)) for v in row[key])
+            self._csv.writerow(row)
+        else:
+            self.stream.write(json.dumps(record) + '\n')
+        self.records += 1
+
+    def flush(self):
+        self.stream.flush()
+
+
+def vehicle_records(video: str, index: int, timestamp: float, results: dict) -> Iterator[dict]:
+    """Flatten one frame's results into a record per vehicle, with its best plate."""
+    for vehicle in results['vehicles']:
+        plate = vehicle['plates'][0] if vehicle['plates'] else None
+        yield {
+            'video': video,
+            'frame': index,
+            'time_s': round(timestamp, 3),
+            'track_id': vehicle.get('track_id'),
+            'type': vehicle['type'],
+            'color': vehicle['color'],
+            'confidence': round(float(vehicle['confidence']), 4),
+            'bbox': [int(v) for v in vehicle['bbox']],
+            'plate_text': plate['text'] if plate else None,
+            'plate_ocr_confidence': round(float(plate['ocr_confidence']), 4) if plate else None,
+            'plate_confidence': round(float(plate['confidence']), 4) if plate else None,
+            'plate_bbox': [int(v) for v in plate['frame_bbox']] if plate else None
+        }
+
+
+class Progress:
+    """Single-line progress and throughput report on stderr."""
+
+    def __init__(self, interval: float = 1.0):
+        """Initialize the report.
+
+        Args:
+            interval: Seconds between progress lines
+        """
+        self.interval = interval
+        self.start = time.perf_counter()
+        self._last_report = 0.0
+        self.frames = 0
+
+    def update(self, video: str, position: int, total: int, frames: int, force: bool = False):
+        """Count newly processed frames and redraw the line at most once per interval.
+
+        Args:
+            video: Video being processed
+            position: Frames of the video read so far
+            total: Frame count of the video (0 if unknown)
+            frames: Frames processed since the previous call
+            force: Redraw regardless of the interval
+        """
+        self.frames += frames
+        now = time.perf_counter()
+        if not force and now - self._last_report < self.interval:
+            return
+        self._last_report = now
+        fps = self.frames / max(now - self.start, 1e-9)
+        done = f"{position}/{total} ({position / total:.0%})" if total > 0 else f"{position}"
+        sys.stderr.write(f"\r{os.path.basename(video)}: frame {done}, {fps:.1f} frames/s   ")
+        sys.stderr.flush()
+
+
+def process_video(backend: ANPRBackend, video: str, args, writer: RecordWriter, progress: Progress) -> bool:
+    """Run one video through the backend; returns False if it could not be opened."""
+    capture = cv2.VideoCapture(video)
+    if not capture.isOpened():
+        logging.getLogger(__name__).error(f"Could not open video: {video}")
+        return False
+    total = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    if args.max_frames:
+        total = min(total, args.max_frames) if total > 0 else args.max_frames
+    roi = [args.roi[i:i + 2] for i in range(0, len(args.roi), 2)] if args.roi else None
+
+    reader = VideoReader(capture, args.stride, args.max_frames)
+    reader.start()
+    try:
+        done = False
+        position = 0
+        while not done:
+            # Fill a batch with decoded frames; the last one may be short
+            batch = []
+            while len(batch) < args.batch_size:
+                item = reader.frames.get()
+                if item is None:
+                    done = True
+                    break
+                batch.append(item)
+            if not batch:
+                break
+
+            outputs = backend.process_frames(
+                [frame for _, _, frame in batch], [roi] * len(batch), [video] * len(batch)
+            )
+            for (index, timestamp, _), (results, _) in zip(batch, outputs):
+                for record in vehicle_records(video, index, timestamp, results):
+                    writer.write(record)
+            writer.flush()
+            position = batch[-1][0] + 1
+            progress.update(video, position, total, len(batch))
+        progress.update(video, position, total, 0, force=True)
+        sys.stderr.write('\n')
+    finally:
+        reader.stop()
+        reader.join()
+        capture.release()
+        backend.reset_tracking(video)
+    return True
+
+
+def main():
+    """Batch entry point."""
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    args = parse_args()
+
+    # Stage batching and (unless disabled) tracking, plate consensus and the
+    # OCR cache keep the work per frame down; there is no display to pace.
+    # Every model loads before any output is written, so a broken setup
+    # fails here instead of producing records without plates
+    try:
+        backend = ANPRBackend(
+            device=args.device,
+            engine=args.engine,
+            detect_size=args.detect_size,
+            batch_stages=True,
+            tracking=not args.no_tracking,
+            ocr_cache=None if args.no_ocr_cache else OCRCache(),
+            lazy_load=False
+        )
+    except Exception as e:
+        logger.error(f"Could not load the ANPR models: {str(e)}")
+        sys.exit(1)
+
+    stream = sys.stdout if args.output == '-' else open(args.output, 'w', newline='')
+    writer = RecordWriter(stream, args.format)
+    progress = Progress()
+    failed = 0
+    try:
+        for video in args.videos:
+            if not process_video(backend, video, args, writer, progress):
+                failed += 1
+    except KeyboardInterrupt:
+        sys.stderr.write('\n')
+        logger.warning("Interrupted")
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+    elapsed = time.perf_counter() - progress.start
+    logger.info(f"Processed {progress.frames} frames from {len(args.videos) - failed} video(s) in {elapsed:.1f} s "
+                f"({progress.frames / max(elapsed, 1e-9):.1f} frames/s), wrote {writer.records} records")
+    if backend.ocr_cache is not None:
+        stats = backend.ocr_cache.stats()
+        logger.info(f"OCR cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%})")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
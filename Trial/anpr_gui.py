@@ -4,9 +4,11 @@
 import sys
 import os
 import logging
+import argparse
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import Qt, QSettings, QCoreApplication
 from ui_mainwindow import MainWindow
+from ui_multicamera import MultiCameraWindow
 
 def setup_logging():
     """Setup logging configuration."""
@@ -44,11 +46,29 @@ def setup_qt_environment():
     logger.info(f"DYLD_LIBRARY_PATH: {os.environ.get('DYLD_LIBRARY_PATH', 'Not set')}")
     logger.info(f"DYLD_FRAMEWORK_PATH: {os.environ.get('DYLD_FRAMEWORK_PATH', 'Not set')}")
 
+def parse_args():
+    """Parse command line options, leaving Qt's own options in place."""
+    parser = argparse.ArgumentParser(description='ANPR GUI')
+    parser.add_argument('--sources', nargs='+',
+                        help='Camera indices or video paths for the multi-camera grid view')
+    parser.add_argument('--motion-threshold', nargs='+', type=float,
+                        help='Skip inference on frames whose motion score is below this; '
+                             'one value for all sources or one per source')
+    parser.add_argument('--latency-budget', type=float,
+                        help='Adapt the processing stride to keep latency under this many milliseconds')
+    args, qt_args = parser.parse_known_args()
+    if args.sources:
+        args.sources = [int(source) if source.isdigit() else source for source in args.sources]
+    if args.motion_threshold and len(args.motion_threshold) not in (1, len(args.sources or [None])):
+        parser.error('--motion-threshold takes one value or one per source')
+    return args, [sys.argv[0]] + qt_args
+
 def main():
     """Main application entry point."""
     # Setup logging
     setup_logging()
     logger = logging.getLogger(__name__)
+    args, qt_argv = parse_args()
     
     try:
         # Setup Qt environment
@@ -57,7 +77,7 @@ def main():
         # Enable high DPI scaling (modern approach)
         QCoreApplication.setAttribute(Qt.ApplicationAttribute.AA_Use96Dpi)
         
-        app = QApplication(sys.argv)
+        app = QApplication(qt_argv)
         
         # Set application info for QSettings
         app.setOrganizationName("ANPR Solutions")
@@ -69,8 +89,16 @@ def main():
             with open(style_file, "r") as f:
                 app.setStyleSheet(f.read())
         
-        # Create and show main window
-        window = MainWindow()
+        # Create and show main window; several sources open the grid view
+        latency_budget = args.latency_budget / 1000 if args.latency_budget else None
+        if args.sources:
+            thresholds = args.motion_threshold or [None]
+            if len(thresholds) == 1:
+                thresholds = thresholds * len(args.sources)
+            window = MultiCameraWindow(args.sources, thresholds, latency_budget)
+        else:
+            window = MainWindow(motion_threshold=(args.motion_threshold or [None])[0],
+                                latency_budget=latency_budget)
         window.show()
         
         # Start event loop
@@ -1,14 +1,66 @@
 # ANPR Backend class for vehicle detection and license plate recognition
+import os
+import gc
 import cv2
+import time
+import threading
 import numpy as np
 from pathlib import Path
-from ultralytics import YOLO
 import easyocr
 import logging
-from typing import Dict, List, Tuple, Optional, Union
+from typing import Dict, Hashable, List, Sequence, Tuple, Optional, Union
 import re
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from box_utils import (assign_to_containers, centres_in_mask, letterbox, offset_box, polygon_bounds,
+                       polygon_mask, roi_polygon, unletterbox_boxes)
+from track_cache import TrackAttributeCache, appearance_signature
+from plate_consensus import TrackPlateConsensus
+from ocr_cache import OCRCache
+from tracker import SortTracker
+from plate_ocr import recognize_plate_crop, recognize_plate_crops
+from model_registry import acquire_easyocr, acquire_yolo, registry, release
+from yolo_engines import check_engine_options
+
+
+# Resident set size of this process in bytes, or None where it cannot be read
+def _resident_bytes() -> Optional[int]:
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+# Size of a loaded model's weights in bytes
+def _weight_bytes(model) -> Optional[int]:
+    try:
+        if isinstance(model, easyocr.Reader):
+            tensors = []
+            for module in (model.detector, model.recognizer):
+                tensors += list(module.parameters()) + list(module.buffers())
+            return sum(t.numel() * t.element_size() for t in tensors)
+        return model.weight_bytes
+    except (AttributeError, OSError):
+        return None
+
+class ModelLoadError(RuntimeError):
+    """A model could not be loaded; unlike inference errors, stages let it propagate."""
+
+
 class ANPRBackend:
+    PLATE_STRATEGIES = ('per_vehicle', 'full_frame')
+    OCR_MODES = ('recognize', 'readtext')
+    
+    # Optional stages and the model each one needs
+    STAGE_MODELS = {'classification': 'vehicle_classifier', 'plates': 'plate_detector', 'ocr': 'ocr'}
+    
     # Initialize the ANPR backend with all necessary models and configurations
     def __init__(
         self,
@@ -16,22 +68,148 @@ class ANPRBackend:
         plate_model_path: Union[str, Path] = 'models/license_plate_detector.pt',
         classifier_model_path: Union[str, Path] = 'models/vehicle_type_classifier.pt',
         device: str = 'cpu',
-        confidence: float = 0.25
+        engine: Optional[str] = None,
+        engine_threads: Optional[int] = None,
+        precision: str = 'fp32',
+        calibration_dir: Optional[Union[str, Path]] = None,
+        confidence: float = 0.25,
+        batch_stages: bool = False,
+        batch_size: int = 16,
+        plate_input_size: int = 320,
+        detect_size: Optional[int] = None,
+        plate_strategy: str = 'per_vehicle',
+        plate_containment: float = 0.8,
+        ocr_mode: str = 'recognize',
+        ocr_cache: Optional[OCRCache] = None,
+        color_pixel_budget: Optional[int] = None,
+        tracking: bool = False,
+        track_max_age: int = 30,
+        cache_min_confidence: Optional[Dict[str, float]] = None,
+        appearance_threshold: float = 0.15,
+        plate_settle_reads: int = 3,
+        enable_classification: bool = True,
+        enable_plates: bool = True,
+        enable_ocr: bool = True,
+        lazy_load: bool = True,
+        idle_timeout: Optional[float] = None,
+        warmup: bool = False,
+        warmup_runs: int = 2,
+        warmup_frame_shape: Tuple[int, int] = (720, 1280)
     ):
         self.logger = logging.getLogger(__name__)
         self.device = device
         self.confidence = confidence
         
-        # Load pretrained models only
-        try:
-            self.vehicle_detector = YOLO(vehicle_model_path)
-            self.plate_detector = YOLO(plate_model_path)
-            self.vehicle_classifier = YOLO(classifier_model_path)
-            self.ocr = easyocr.Reader(['en'], gpu=False)
-            self.logger.info("All pretrained models loaded successfully")
-        except Exception as e:
-            self.logger.error(f"Error loading models: {str(e)}")
-            raise
+        # The YOLO stages run on PyTorch by default; 'onnxruntime' or
+        # 'openvino' (as engine, or as device) runs an ONNX export on the CPU
+        self.engine = engine
+        self.engine_threads = engine_threads
+        
+        # Reduced precision ('int8_dynamic', 'int8_static', 'bf16') applies to
+        # the YOLO stages on the ONNX engines; 'int8_static' is calibrated on
+        # the frames in calibration_dir
+        self.precision = precision
+        self.calibration_dir = calibration_dir
+        
+        # Batched mode runs the classifier and plate detector once per frame
+        # over all vehicle crops instead of once per vehicle; both modes run
+        # the per-vehicle plate detector at plate_input_size
+        self.batch_stages = batch_stages
+        self.batch_size = batch_size
+        self.plate_input_size = plate_input_size
+        
+        # Two-resolution mode: vehicles are detected on a copy of the frame
+        # downscaled to detect_size pixels on its long side, while plate
+        # detection and OCR crop from the full-resolution frame
+        self.detect_size = detect_size
+        
+        # 'per_vehicle' runs the plate detector inside every vehicle crop,
+        # 'full_frame' runs it once and assigns plates to vehicles by containment
+        if plate_strategy not in self.PLATE_STRATEGIES:
+            raise ValueError(f"Unknown plate strategy: {plate_strategy}")
+        self.plate_strategy = plate_strategy
+        self.plate_containment = plate_containment
+        
+        # 'recognize' feeds plate crops straight to the OCR recognizer (rows
+        # split geometrically); 'readtext' also runs EasyOCR's text detector
+        if ocr_mode not in self.OCR_MODES:
+            raise ValueError(f"Unknown OCR mode: {ocr_mode}")
+        self.ocr_mode = ocr_mode
+        
+        # Optional perceptual-hash cache of OCR results, so that the near
+        # identical plate crops of a parked or queued vehicle are read once;
+        # it is thread-safe and can be shared between backends
+        self.ocr_cache = ocr_cache
+        
+        # Tracked mode keeps type and colour per track and only re-runs a
+        # stage when its cached confidence is low or the vehicle's appearance
+        # changed. Plate text is a character-level vote over the track's OCR
+        # reads; once the vote has not changed for plate_settle_reads reads
+        # the plate is settled and OCR stops for that track
+        # Each video stream gets its own tracker and cache, so one backend
+        # can serve several cameras
+        self.tracking = tracking
+        self.track_max_age = track_max_age
+        self.cache_min_confidence = cache_min_confidence
+        self.appearance_threshold = appearance_threshold
+        self.plate_settle_reads = plate_settle_reads
+        self._track_states = {}
+        
+        # ROI bounding rectangles and polygon masks, keyed by ROI and frame size
+        self._roi_regions = {}
+        
+        # Number of frames processed and of crops (or frames, for full-frame
+        # plates) sent to each stage
+        self.stage_calls = {'frame': 0, 'classify': 0, 'color': 0, 'plate_detect': 0, 'ocr': 0}
+        
+        # Disabled stages are skipped by the pipeline and their models are
+        # never loaded; vehicle detection is always on
+        self.stage_enabled = {
+            'classification': enable_classification,
+            'plates': enable_plates,
+            'ocr': enable_ocr
+        }
+        
+        # Pretrained models load on the first call to their stage (or all at
+        # once when lazy_load is False); models unused for idle_timeout
+        # seconds are released again. Models come from the process-wide
+        # registry, so backends and other pipelines share one copy
+        engine_options = {
+            'engine': engine, 'device': device, 'threads': engine_threads,
+            'precision': precision, 'calibration_dir': calibration_dir
+        }
+        self._model_loaders = {
+            'vehicle_detector': lambda: acquire_yolo(vehicle_model_path, **engine_options),
+            'plate_detector': lambda: acquire_yolo(plate_model_path, **engine_options),
+            'vehicle_classifier': lambda: acquire_yolo(classifier_model_path, **engine_options),
+            'ocr': lambda: acquire_easyocr(['en'], gpu=False)
+        }
+        self._models = {}
+        self._model_lock = threading.RLock()
+        self.idle_timeout = idle_timeout
+        
+        # Configuration errors surface here even when loading is lazy:
+        # the engine must support the precision, and the weights of every
+        # enabled stage must exist
+        check_engine_options(engine, device, precision, calibration_dir)
+        model_paths = {
+            'vehicle_detector': vehicle_model_path,
+            'plate_detector': plate_model_path,
+            'vehicle_classifier': classifier_model_path
+        }
+        for name in self.required_models():
+            if name in model_paths and not Path(model_paths[name]).exists():
+                raise FileNotFoundError(f"Weights for {name} not found: {model_paths[name]}")
+        if not lazy_load:
+            self.load()
+        
+        # Warm-up runs dummy inputs through every enabled stage so the first
+        # real frames do not pay for lazy initialisation; `ready` is set once
+        # it has finished
+        self.ready = threading.Event()
+        self.warmup_runs = warmup_runs
+        self.warmup_frame_shape = warmup_frame_shape
+        self.warmup_times = {}
         
         # Color ranges in HSV
         self.color_ranges = {
@@ -44,61 +222,375 @@ class ANPRBackend:
             'silver': [(0, 0, 140), (180, 30, 200)],
             'grey': [(0, 0, 70), (180, 30, 140)]
         }
+        
+        # Colour lookup tables are built once from color_ranges; crops larger
+        # than the pixel budget are strided down before classification
+        self.color_pixel_budget = color_pixel_budget
+        self._build_color_lut()
+        
+        if warmup:
+            self.warmup()
     
-    # Detect vehicles in the frame
-    def detect_vehicles(self, frame: np.ndarray) -> List[Dict]:
-        try:
-            results = self.vehicle_detector(frame, conf=self.confidence, device=self.device)[0]
-            detections = []
-            
-            for box in results.boxes:
-                bbox = box.xyxy[0].cpu().numpy().tolist()
-                detection = {
-                    'bbox': bbox,
-                    'confidence': float(box.conf),
-                    'class_id': int(box.cls),
-                    'class_name': results.names[int(box.cls)]
+    # Return a model, loading it on first use and marking it as recently used
+    def _model(self, name: str):
+        with self._model_lock:
+            entry = self._models.get(name)
+            if entry is None:
+                before = _resident_bytes()
+                start = time.perf_counter()
+                try:
+                    model = self._model_loaders[name]()
+                except Exception as e:
+                    self.logger.error(f"Error loading {name}: {str(e)}")
+                    raise ModelLoadError(f"Could not load {name}: {e}") from e
+                after = _resident_bytes()
+                entry = {
+                    'model': model,
+                    'resident_bytes': after - before if before is not None and after is not None else None,
+                    'weight_bytes': _weight_bytes(model),
+                    'load_time': time.perf_counter() - start
                 }
-                detections.append(detection)
-            
-            return detections
+                self._models[name] = entry
+                resident = entry['resident_bytes']
+                self.logger.info(
+                    f"Loaded {name} in {entry['load_time']:.2f}s"
+                    + (f", +{resident / 2**20:.0f} MB resident" if resident is not None else "")
+                )
+            entry['last_used'] = time.monotonic()
+            return entry['model']
+    
+    @property
+    def vehicle_detector(self):
+        return self._model('vehicle_detector')
+    
+    @property
+    def plate_detector(self):
+        return self._model('plate_detector')
+    
+    @property
+    def vehicle_classifier(self):
+        return self._model('vehicle_classifier')
+    
+    @property
+    def ocr(self):
+        return self._model('ocr')
+    
+    # Names of the models the enabled stages need
+    def required_models(self) -> List[str]:
+        names = ['vehicle_detector']
+        for stage, name in self.STAGE_MODELS.items():
+            if self.stage_enabled[stage] and (stage != 'ocr' or self.stage_enabled['plates']):
+                names.append(name)
+        return names
+    
+    # Load models up front (default: every model an enabled stage needs)
+    def load(self, names: Optional[List[str]] = None):
+        for name in self.required_models() if names is None else names:
+            self._model(name)
+    
+    # Release loaded models (default: all of them); they reload on next use
+    def unload(self, names: Optional[List[str]] = None):
+        with self._model_lock:
+            names = list(self._models) if names is None else names
+            entries = {name: self._models.pop(name) for name in names if name in self._models}
+        for entry in entries.values():
+            release(entry['model'])
+        released = list(entries)
+        if released:
+            gc.collect()
+            self.logger.info(f"Unloaded {', '.join(released)}")
+            # A reloaded model has to warm up again
+            if set(released) & set(self.required_models()):
+                self.ready.clear()
+    
+    # Release models that have not been used for idle_timeout seconds
+    def unload_idle(self, idle_timeout: Optional[float] = None) -> List[str]:
+        idle_timeout = self.idle_timeout if idle_timeout is None else idle_timeout
+        if idle_timeout is None:
+            return []
+        now = time.monotonic()
+        with self._model_lock:
+            idle = [name for name, entry in self._models.items() if now - entry['last_used'] > idle_timeout]
+        self.unload(idle)
+        return idle
+    
+    # Run dummy inputs through every enabled stage at the configured input
+    # sizes, then set `ready`; returns each stage's per-run latency in ms
+    def warmup(self, runs: Optional[int] = None) -> Dict[str, List[float]]:
+        runs = self.warmup_runs if runs is None else runs
+        height, width = self.warmup_frame_shape
+        frame = np.full((height, width, 3), 114, dtype=np.uint8)
+        crop = np.full((max(1, height // 3), max(1, width // 4), 3), 114, dtype=np.uint8)
+        plate = np.full((48, 192, 3), 255, dtype=np.uint8)
+        cv2.putText(plate, 'AB12CD3456', (6, 34), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 0, 0), 2)
+        
+        # The same calls the pipeline makes, so every predictor and input
+        # shape it will use is initialised
+        imgsz = self._detect_imgsz(None, frame.shape)
+        stages = {'vehicle_detector': lambda: self.detect_vehicles_batch([frame], imgsz)
+                  if self.batch_stages else self.detect_vehicles(frame, imgsz)}
+        if self.stage_enabled['classification']:
+            stages['vehicle_classifier'] = (lambda: self.classify_vehicles([crop])) if self.batch_stages \
+                else (lambda: self.classify_vehicle(crop))
+        if self.stage_enabled['plates']:
+            if self.plate_strategy == 'full_frame':
+                stages['plate_detector'] = lambda: self.detect_plates(frame)
+            elif self.batch_stages:
+                stages['plate_detector'] = lambda: self.detect_plates_batch([crop])
+            else:
+                stages['plate_detector'] = lambda: self.detect_plates(crop, self.plate_input_size)
+            if self.stage_enabled['ocr']:
+                stages['ocr'] = lambda: self._recognize_plates([plate])
+        
+        self.ready.clear()
+        self.load(list(stages))
+        times = {}
+        for name, run in stages.items():
+            times[name] = []
+            for _ in range(max(1, runs)):
+                start = time.perf_counter()
+                run()
+                times[name].append((time.perf_counter() - start) * 1000)
+        
+        self.warmup_times = times
+        self.ready.set()
+        self.logger.info("Warm-up finished: " + ", ".join(
+            f"{name} {t[0]:.0f}->{t[-1]:.0f} ms" for name, t in times.items()
+        ))
+        return times
+    
+    # Turn an optional stage on or off, releasing its model when disabled
+    def set_stage_enabled(self, stage: str, enabled: bool):
+        if stage not in self.stage_enabled:
+            raise ValueError(f"Unknown stage: {stage}")
+        self.stage_enabled[stage] = enabled
+        if not enabled:
+            self.unload([self.STAGE_MODELS[stage]])
+    
+    # Memory attributed to each model: the process RSS growth while it loaded
+    # (zero when another holder had already loaded it) and the size of its weights
+    def memory_report(self) -> Dict:
+        mb = lambda n: None if n is None else n / 2**20
+        now = time.monotonic()
+        required = self.required_models()
+        with self._model_lock:
+            models = {}
+            for name in self._model_loaders:
+                entry = self._models.get(name)
+                models[name] = {
+                    'loaded': entry is not None,
+                    'required': name in required,
+                    'resident_mb': mb(entry['resident_bytes']) if entry else None,
+                    'weights_mb': mb(entry['weight_bytes']) if entry else None,
+                    'load_time': entry['load_time'] if entry else None,
+                    'idle_seconds': now - entry['last_used'] if entry else None,
+                    'holders': registry.refcount(entry['model']) if entry else 0
+                }
+        return {'models': models, 'process_resident_mb': mb(_resident_bytes())}
+    
+    # Convert one vehicle detector result into detection dicts
+    def _parse_vehicle_boxes(self, results) -> List[Dict]:
+        detections = []
+        
+        for box, conf, class_id in zip(results.boxes, results.scores, results.class_ids):
+            detection = {
+                'bbox': box.tolist(),
+                'confidence': float(conf),
+                'class_id': int(class_id),
+                'class_name': results.names[int(class_id)]
+            }
+            detections.append(detection)
+        
+        return detections
+    
+    # Detect vehicles in the frame, optionally at a different detector input size
+    def detect_vehicles(self, frame: np.ndarray, imgsz: Optional[int] = None) -> List[Dict]:
+        try:
+            results = self.vehicle_detector.detect([frame], conf=self.confidence, imgsz=imgsz)[0]
+            return self._parse_vehicle_boxes(results)
+        except ModelLoadError:
+            raise
         except Exception as e:
             self.logger.error(f"Vehicle detection error: {str(e)}")
             return []
     
-    # Detect license plates in the frame
-    def detect_plates(self, frame: np.ndarray) -> List[Dict]:
+    # Detect vehicles in several frames (e.g. from different cameras) with one call
+    def detect_vehicles_batch(self, frames: List[np.ndarray], imgsz: Optional[int] = None) -> List[List[Dict]]:
+        all_detections = []
+        try:
+            for start in range(0, len(frames), self.batch_size):
+                batch_results = self.vehicle_detector.detect(
+                    frames[start:start + self.batch_size], conf=self.confidence, imgsz=imgsz
+                )
+                all_detections.extend(self._parse_vehicle_boxes(results) for results in batch_results)
+            return all_detections
+        except ModelLoadError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Batched vehicle detection error: {str(e)}")
+            return [[] for _ in frames]
+    
+    # Detect license plates in the frame; with imgsz the frame is letterboxed
+    # to that square first, exactly as detect_plates_batch does with every
+    # crop, so per-vehicle crops give the same detections on either path
+    def detect_plates(self, frame: np.ndarray, imgsz: Optional[int] = None) -> List[Dict]:
         try:
-            results = self.plate_detector(frame, conf=self.confidence, device=self.device)[0]
+            if imgsz:
+                return self._detect_plates_letterboxed([frame], imgsz)[0]
+            results = self.plate_detector.detect([frame], conf=self.confidence)[0]
             detections = []
             
-            for box in results.boxes:
-                bbox = box.xyxy[0].cpu().numpy().tolist()
+            for box, conf in zip(results.boxes, results.scores):
                 detection = {
-                    'bbox': bbox,
-                    'confidence': float(box.conf)
+                    'bbox': box.tolist(),
+                    'confidence': float(conf)
                 }
                 detections.append(detection)
             
             return detections
+        except ModelLoadError:
+            raise
         except Exception as e:
             self.logger.error(f"License plate detection error: {str(e)}")
             return []
     
+    # Detect license plates in several vehicle crops with one forward pass per
+    # batch, at plate_input_size
+    def detect_plates_batch(self, crops: List[np.ndarray]) -> List[List[Dict]]:
+        all_detections = [[] for _ in crops]
+        try:
+            for start in range(0, len(crops), self.batch_size):
+                chunk = crops[start:start + self.batch_size]
+                all_detections[start:start + len(chunk)] = self._detect_plates_letterboxed(
+                    chunk, self.plate_input_size
+                )
+            
+            return all_detections
+        except ModelLoadError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Batched license plate detection error: {str(e)}")
+            return all_detections
+    
+    # One plate detector pass over crops letterboxed to a common square, so
+    # the predictor stacks them without resizing and boxes map back exactly
+    def _detect_plates_letterboxed(self, crops: List[np.ndarray], size: int) -> List[List[Dict]]:
+        boxed = [letterbox(crop, size) for crop in crops]
+        batch_results = self.plate_detector.detect(
+            [image for image, _, _ in boxed], conf=self.confidence, imgsz=size
+        )
+        
+        detections = [[] for _ in crops]
+        for i, (results, (_, scale, pad)) in enumerate(zip(batch_results, boxed)):
+            if not len(results.boxes):
+                continue
+            boxes = unletterbox_boxes(results.boxes, scale, pad, crops[i].shape[:2])
+            detections[i] = [
+                {'bbox': box.tolist(), 'confidence': float(conf)}
+                for box, conf in zip(boxes, results.scores)
+            ]
+        return detections
+    
     # Classify vehicle type from cropped image
     def classify_vehicle(self, vehicle_crop: np.ndarray) -> Tuple[str, float]:
         try:
-            results = self.vehicle_classifier(vehicle_crop, device=self.device)[0]
-            class_id = results.probs.top1
-            confidence = float(results.probs.top1conf)
+            results = self.vehicle_classifier.classify([vehicle_crop])[0]
+            class_id = results.top1
+            confidence = results.top1conf
             class_name = results.names[class_id]
             return class_name, confidence
+        except ModelLoadError:
+            raise
         except Exception as e:
             self.logger.error(f"Vehicle classification error: {str(e)}")
             return "unknown", 0.0
     
+    # Classify several vehicle crops with one forward pass per batch
+    def classify_vehicles(self, crops: List[np.ndarray]) -> List[Tuple[str, float]]:
+        classifications = [("unknown", 0.0)] * len(crops)
+        try:
+            for start in range(0, len(crops), self.batch_size):
+                # Crops go in unpadded: the classify transforms resize and
+                # centre-crop each one, matching the per-vehicle path
+                chunk = crops[start:start + self.batch_size]
+                batch_results = self.vehicle_classifier.classify(chunk)
+                
+                for offset, results in enumerate(batch_results):
+                    class_id = results.top1
+                    classifications[start + offset] = (
+                        results.names[class_id], results.top1conf
+                    )
+            
+            return classifications
+        except ModelLoadError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Batched vehicle classification error: {str(e)}")
+            return classifications
+    
+    # Build the HSV -> colour lookup tables from color_ranges
+    def _build_color_lut(self):
+        # Every (low, high) pair in color_ranges is an HSV box and gets one
+        # bit. Per-channel tables hold the bits of the boxes each channel
+        # value falls into, so ANDing the three lookups gives the set of
+        # boxes a pixel belongs to, exactly as cv2.inRange would
+        self._color_names = list(self.color_ranges)
+        box_colors = []
+        lut = np.zeros((1, 256, 3), dtype=np.uint16)
+        values = np.arange(256)
+        
+        for color_index, ranges in enumerate(self.color_ranges.values()):
+            for i in range(0, len(ranges), 2):
+                bit = np.uint16(1 << len(box_colors))
+                for channel in range(3):
+                    inside = (values >= ranges[i][channel]) & (values <= ranges[i + 1][channel])
+                    lut[0, inside, channel] |= bit
+                box_colors.append(color_index)
+        
+        if len(box_colors) > 16:
+            raise ValueError("color_ranges supports at most 16 HSV ranges")
+        
+        # Membership of each colour for every possible box bitmask; a colour
+        # with several ranges (red) counts a pixel once if any range matches
+        masks = np.arange(1 << len(box_colors))
+        membership = np.zeros((len(masks), len(self._color_names)), dtype=np.int64)
+        for bit, color_index in enumerate(box_colors):
+            membership[:, color_index] |= (masks >> bit) & 1
+        
+        self._color_lut = lut
+        self._color_membership = membership
+    
     # Detect the dominant color of the vehicle
-    def detect_color(self, vehicle_crop: np.ndarray) -> Tuple[str, float]:
+    def detect_color(self, vehicle_crop: np.ndarray, hsv: Optional[np.ndarray] = None) -> Tuple[str, float]:
+        try:
+            # Convert to HSV color space unless the caller already has it
+            if hsv is None:
+                hsv = cv2.cvtColor(vehicle_crop, cv2.COLOR_BGR2HSV)
+            
+            # Stride large crops down to the pixel budget
+            h, w = hsv.shape[:2]
+            if self.color_pixel_budget and h * w > self.color_pixel_budget:
+                step = int(np.ceil(np.sqrt(h * w / self.color_pixel_budget)))
+                hsv = hsv[::step, ::step]
+            
+            # One lookup pass labels every pixel with its set of matching ranges
+            labels = np.bitwise_and.reduce(cv2.LUT(hsv, self._color_lut), axis=2)
+            counts = np.bincount(labels.ravel(), minlength=len(self._color_membership))
+            color_pixels = counts @ self._color_membership
+            
+            # argmax keeps the first colour on ties, like the mask loop did
+            best = int(np.argmax(color_pixels))
+            max_pixels = int(color_pixels[best])
+            detected_color = self._color_names[best] if max_pixels > 0 else "unknown"
+            
+            confidence = max_pixels / (hsv.shape[0] * hsv.shape[1])
+            return detected_color, confidence
+        except Exception as e:
+            self.logger.error(f"Color detection error: {str(e)}")
+            return "unknown", 0.0
+    
+    # Reference colour detection with one inRange mask per colour range
+    def _detect_color_masks(self, vehicle_crop: np.ndarray) -> Tuple[str, float]:
         try:
             # Convert to HSV color space
             hsv = cv2.cvtColor(vehicle_crop, cv2.COLOR_BGR2HSV)
@@ -129,14 +621,27 @@ class ANPRBackend:
             self.logger.error(f"Color detection error: {str(e)}")
             return "unknown", 0.0
     
-    # Recognize text on the license plate
+    # Recognize text on the license plate, through the OCR cache if there is one
     def recognize_plate(self, plate_crop: np.ndarray) -> Tuple[str, float]:
+        if self.ocr_cache is not None:
+            return self.ocr_cache.cached(plate_crop, self._recognize_plate)
+        return self._recognize_plate(plate_crop)
+    
+    def _recognize_plate(self, plate_crop: np.ndarray) -> Tuple[str, float]:
         try:
             # Preprocess the plate image
             gray = cv2.cvtColor(plate_crop, cv2.COLOR_BGR2GRAY)
             clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
             enhanced = clahe.apply(gray)
             
+            # The crop is already a tight plate box, so text detection is
+            # only needed in readtext mode
+            if self.ocr_mode == 'recognize':
+                text, conf = recognize_plate_crop(self.ocr, enhanced)
+                if not text:
+                    return "", 0.0
+                return self._post_process_plate_text(text), conf
+            
             # OCR
             result = self.ocr.readtext(enhanced)
             if not result or not result[0]:
@@ -159,10 +664,43 @@ class ANPRBackend:
             text = self._post_process_plate_text(text)
             
             return text, conf
+        except ModelLoadError:
+            raise
         except Exception as e:
             self.logger.error(f"Plate recognition error: {str(e)}")
             return "", 0.0
     
+    # Recognize several plate crops (e.g. all plates of a frame) with one OCR
+    # batch; with an OCR cache only the crops it misses are read
+    def recognize_plates(self, plate_crops: List[np.ndarray]) -> List[Tuple[str, float]]:
+        return self._recognize_plates_cached(plate_crops)[0]
+    
+    # Batched recognition through the OCR cache, with a flag per crop telling
+    # whether its result is a cache hit rather than a fresh read
+    def _recognize_plates_cached(self, plate_crops: List[np.ndarray]) -> Tuple[List[Tuple[str, float]], List[bool]]:
+        if self.ocr_cache is not None:
+            return self.ocr_cache.cached_batch(plate_crops, self._recognize_plates, with_hits=True)
+        return self._recognize_plates(plate_crops), [False] * len(plate_crops)
+    
+    def _recognize_plates(self, plate_crops: List[np.ndarray]) -> List[Tuple[str, float]]:
+        if self.ocr_mode == 'readtext':
+            return [self._recognize_plate(crop) for crop in plate_crops]
+        try:
+            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
+            enhanced = [
+                clahe.apply(cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)) if crop.size else crop
+                for crop in plate_crops
+            ]
+            return [
+                (self._post_process_plate_text(text), conf) if text else ("", 0.0)
+                for text, conf in recognize_plate_crops(self.ocr, enhanced)
+            ]
+        except ModelLoadError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Batched plate recognition error: {str(e)}")
+            return [("", 0.0)] * len(plate_crops)
+    
     # Post-process the recognized plate text
     def _post_process_plate_text(self, text: str) -> str:
         # Remove spaces and special characters
@@ -183,57 +721,285 @@ class ANPRBackend:
         
         return text
     
-    # Process a frame and return vehicle detections with visualization
-    def process_frame(
+    # Detect plates once on the full frame and hand each vehicle the plates it contains
+    def detect_plates_full_frame(
         self,
         frame: np.ndarray,
-        roi: Optional[Tuple[int, int, int, int]] = None
-    ) -> Tuple[Dict, np.ndarray]:
-        if roi:
-            x1, y1, x2, y2 = roi
-            frame = frame[y1:y2, x1:x2]
+        vehicle_boxes: List[Tuple[int, int, int, int]],
+        region: Optional[Tuple[int, int, int, int]] = None
+    ) -> List[List[Dict]]:
+        plate_detections = [[] for _ in vehicle_boxes]
+        if not vehicle_boxes:
+            return plate_detections
         
-        # Make a copy for visualization
-        viz_frame = frame.copy()
+        # Only search the ROI's bounding rectangle when one is given
+        if region is not None:
+            r_x1, r_y1, r_x2, r_y2 = region
+            frame_plates = self.detect_plates(frame[r_y1:r_y2, r_x1:r_x2])
+            for plate in frame_plates:
+                plate['bbox'] = offset_box(plate['bbox'], r_x1, r_y1)
+        else:
+            frame_plates = self.detect_plates(frame)
+        if not frame_plates:
+            return plate_detections
         
-        # Detect vehicles
-        vehicle_detections = self.detect_vehicles(frame)
-        results = {'vehicles': []}
+        plate_boxes = np.array([plate['bbox'] for plate in frame_plates], dtype=np.float32)
+        owners = assign_to_containers(plate_boxes, np.array(vehicle_boxes, dtype=np.float32),
+                                      self.plate_containment)
+        
+        # Express plate boxes relative to their vehicle crop, as the
+        # per-vehicle strategy does
+        for plate, owner in zip(frame_plates, owners):
+            if owner < 0:
+                continue
+            v_x1, v_y1 = vehicle_boxes[owner][:2]
+            plate_detections[owner].append({
+                'bbox': offset_box(plate['bbox'], -v_x1, -v_y1),
+                'confidence': plate['confidence']
+            })
+        
+        return plate_detections
+    
+    # Tracker, attribute cache and plate consensus of one video stream, created on first use
+    def _track_state(self, stream_id: Hashable) -> Tuple[SortTracker, TrackAttributeCache, TrackPlateConsensus]:
+        if stream_id not in self._track_states:
+            self._track_states[stream_id] = (
+                SortTracker(max_age=self.track_max_age),
+                TrackAttributeCache(self.cache_min_confidence, self.appearance_threshold),
+                TrackPlateConsensus(self.plate_settle_reads)
+            )
+        return self._track_states[stream_id]
+    
+    # Forget tracks and cached attributes of one stream (or all), e.g. when a source changes
+    def reset_tracking(self, stream_id: Optional[Hashable] = None):
+        if stream_id is None:
+            self._track_states.clear()
+        else:
+            self._track_states.pop(stream_id, None)
+    
+    # Bounding rectangle of an ROI (polygon points, or a legacy (x1, y1, x2, y2)
+    # rectangle) clipped to the frame, and the polygon's mask over it (None
+    # for rectangles)
+    def _roi_region(self, roi, shape: Tuple[int, ...]) -> Tuple[Tuple[int, int, int, int], Optional[np.ndarray]]:
+        is_rectangle = np.ndim(roi) == 1
+        points = roi_polygon(roi)
+        
+        key = (tuple(shape[:2]), is_rectangle, points.tobytes())
+        region = self._roi_regions.get(key)
+        if region is None:
+            bounds = polygon_bounds(points, shape)
+            region = (bounds, None if is_rectangle else polygon_mask(points, bounds))
+            if len(self._roi_regions) >= 32:
+                self._roi_regions.clear()
+            self._roi_regions[key] = region
+        return region
+    
+    # Vehicle detection input for a frame: its ROI crop, downscaled in
+    # two-resolution mode, with the detector input size, the ROI rectangle and
+    # mask, and the scale from the input back to frame pixels
+    def _detection_input(self, frame: np.ndarray, roi: Optional[Sequence]) -> Tuple:
+        bounds, mask = (None, None) if roi is None or not len(roi) else self._roi_region(roi, frame.shape)
+        crop = frame
+        if bounds is not None:
+            x1, y1, x2, y2 = bounds
+            crop = frame[y1:y2, x1:x2]
         
+        scale = 1.0
+        if self.detect_size and crop.size:
+            scale = min(1.0, self.detect_size / max(frame.shape[:2]))
+            if scale < 1.0:
+                size = (max(1, round(crop.shape[1] * scale)), max(1, round(crop.shape[0] * scale)))
+                crop = cv2.resize(crop, size, interpolation=cv2.INTER_AREA)
+        return crop, self._detect_imgsz(bounds, frame.shape), bounds, mask, scale
+    
+    # Detector input size: the two-resolution size (or the detector's own) for
+    # the whole frame, shrunk for an ROI so its crop is detected at the same
+    # scale and a smaller ROI means a smaller (cheaper) input
+    def _detect_imgsz(self, bounds, shape: Tuple[int, ...]) -> Optional[int]:
+        full = self.detect_size or self.vehicle_detector.imgsz
+        fraction = 1.0
+        if bounds is not None:
+            x1, y1, x2, y2 = bounds
+            fraction = max((x2 - x1) / shape[1], (y2 - y1) / shape[0])
+        elif not self.detect_size:
+            return None
+        return max(32, int(np.ceil(full * fraction / 32)) * 32)
+    
+    # Move detections from detection-input to frame coordinates, dropping
+    # those whose centre lies outside the ROI polygon
+    def _to_frame_coordinates(self, detections: List[Dict], bounds, mask, scale: float) -> List[Dict]:
+        if not detections:
+            return detections
+        if scale != 1.0:
+            for detection in detections:
+                detection['bbox'] = [c / scale for c in detection['bbox']]
+        if bounds is None:
+            return detections
+        if mask is not None:
+            inside = centres_in_mask(np.array([d['bbox'] for d in detections], dtype=np.float32), mask)
+            detections = [d for d, keep in zip(detections, inside) if keep]
+        for detection in detections:
+            detection['bbox'] = offset_box(detection['bbox'], bounds[0], bounds[1])
+        return detections
+    
+    # Run type, colour, plate and OCR stages for every detected vehicle
+    def _analyse_vehicles(
+        self,
+        frame: np.ndarray,
+        vehicle_detections: List[Dict],
+        stream_id: Hashable = 0,
+        region: Optional[Tuple[int, int, int, int]] = None
+    ) -> List[Dict]:
+        boxes = []
+        crops = []
         for vehicle in vehicle_detections:
-            bbox = vehicle['bbox']
-            v_x1, v_y1, v_x2, v_y2 = [int(x) for x in bbox]
-            vehicle_crop = frame[v_y1:v_y2, v_x1:v_x2]
-            
-            # Get vehicle type and color
-            vehicle_type, type_conf = self.classify_vehicle(vehicle_crop)
-            color, color_conf = self.detect_color(vehicle_crop)
-            
-            # Detect license plate
-            plate_detections = self.detect_plates(vehicle_crop)
-            plates = []
-            
-            if plate_detections:
-                # Get the plate with highest confidence
-                best_plate = max(plate_detections, key=lambda x: x['confidence'])
-                p_bbox = best_plate['bbox']
-                p_x1, p_y1, p_x2, p_y2 = [int(x) for x in p_bbox]
+            v_x1, v_y1, v_x2, v_y2 = [int(x) for x in vehicle['bbox']]
+            boxes.append((v_x1, v_y1, v_x2, v_y2))
+            crops.append(frame[v_y1:v_y2, v_x1:v_x2])
+        
+        # Empty crops (degenerate boxes) cannot go through the models
+        valid = [i for i, crop in enumerate(crops) if crop.size > 0]
+        types = [("unknown", 0.0)] * len(crops)
+        colors = [("unknown", 0.0)] * len(crops)
+        plate_texts = [None] * len(crops)
+        plate_detections = [[] for _ in crops]
+        
+        # In tracked mode each vehicle carries a track ID and stages whose
+        # cached output is still trusted are skipped
+        track_ids = [None] * len(crops)
+        signatures = [None] * len(crops)
+        if self.tracking:
+            tracker, track_cache, plate_consensus = self._track_state(stream_id)
+            track_ids = tracker.assign(np.array(boxes, dtype=np.float32)).tolist()
+            track_cache.evict(tracker.expired)
+            plate_consensus.evict(tracker.expired)
+            for i in valid:
+                signatures[i] = appearance_signature(crops[i])
+        
+        need_type, need_color = list(valid), list(valid)
+        if self.tracking:
+            need_type, need_color = [], []
+            for i in valid:
+                cached_type = track_cache.get(track_ids[i], 'type', signatures[i])
+                if cached_type is None:
+                    need_type.append(i)
+                else:
+                    types[i] = cached_type
                 
-                # Get plate coordinates relative to full frame
-                p_x1, p_x2 = p_x1 + v_x1, p_x2 + v_x1
-                p_y1, p_y2 = p_y1 + v_y1, p_y2 + v_y1
+                cached_color = track_cache.get(track_ids[i], 'color', signatures[i])
+                if cached_color is None:
+                    need_color.append(i)
+                else:
+                    colors[i] = cached_color
                 
-                # Recognize plate text
-                plate_crop = frame[p_y1:p_y2, p_x1:p_x2]
-                plate_text, plate_conf = self.recognize_plate(plate_crop)
+                if plate_consensus.settled(track_ids[i]):
+                    settled = plate_consensus.get(track_ids[i])
+                    plate_texts[i] = (settled.text, settled.confidence)
+        
+        if not self.stage_enabled['classification']:
+            need_type = []
+        
+        self.stage_calls['classify'] += len(need_type)
+        if self.batch_stages:
+            for i, classification in zip(need_type, self.classify_vehicles([crops[i] for i in need_type])):
+                types[i] = classification
+        else:
+            for i in need_type:
+                types[i] = self.classify_vehicle(crops[i])
+        
+        if self.stage_enabled['plates']:
+            if self.plate_strategy == 'full_frame':
+                self.stage_calls['plate_detect'] += 1
+                plate_detections = self.detect_plates_full_frame(frame, boxes, region)
+            elif self.batch_stages:
+                self.stage_calls['plate_detect'] += len(valid)
+                for i, detections in zip(valid, self.detect_plates_batch([crops[i] for i in valid])):
+                    plate_detections[i] = detections
+            else:
+                self.stage_calls['plate_detect'] += len(valid)
+                for i in valid:
+                    plate_detections[i] = self.detect_plates(crops[i], self.plate_input_size)
+        
+        # Convert the region covering all vehicles to HSV once and hand out
+        # per-vehicle views instead of converting every crop
+        self.stage_calls['color'] += len(need_color)
+        if need_color:
+            u_x1 = max(0, min(boxes[i][0] for i in need_color))
+            u_y1 = max(0, min(boxes[i][1] for i in need_color))
+            u_x2 = max(boxes[i][2] for i in need_color)
+            u_y2 = max(boxes[i][3] for i in need_color)
+            hsv_region = cv2.cvtColor(frame[u_y1:u_y2, u_x1:u_x2], cv2.COLOR_BGR2HSV)
+            for i in need_color:
+                # Same clipping as the BGR crop so the view matches it pixel for pixel
+                h_y1, h_x1 = max(0, boxes[i][1]) - u_y1, max(0, boxes[i][0]) - u_x1
+                hsv_crop = hsv_region[h_y1:h_y1 + crops[i].shape[0], h_x1:h_x1 + crops[i].shape[1]]
+                colors[i] = self.detect_color(crops[i], hsv=hsv_crop)
+        
+        # Keep each vehicle's most confident plate, in frame coordinates
+        best_plates = [None] * len(crops)
+        for i, detections in enumerate(plate_detections):
+            if detections:
+                best_plate = max(detections, key=lambda x: x['confidence'])
+                p_x1, p_y1, p_x2, p_y2 = [int(x) for x in best_plate['bbox']]
+                v_x1, v_y1 = boxes[i][:2]
+                best_plates[i] = (best_plate, (p_x1 + v_x1, p_y1 + v_y1, p_x2 + v_x1, p_y2 + v_y1))
+        
+        # Recognize, in one batch, every plate whose track has not settled its text
+        need_ocr = []
+        for i, best in enumerate(best_plates):
+            if best is None:
+                continue
+            if not self.stage_enabled['ocr']:
+                plate_texts[i] = ("", 0.0)
+            elif plate_texts[i] is None:
+                need_ocr.append(i)
+        
+        if need_ocr:
+            plate_crops = []
+            for i in need_ocr:
+                p_x1, p_y1, p_x2, p_y2 = best_plates[i][1]
+                plate_crops.append(frame[max(0, p_y1):p_y2, max(0, p_x1):p_x2])
+            plate_reads, cache_hits = self._recognize_plates_cached(plate_crops)
+            self.stage_calls['ocr'] += cache_hits.count(False)
+            for i, plate_text, cache_hit in zip(need_ocr, plate_reads, cache_hits):
+                if track_ids[i] is not None:
+                    # Report the track's consensus rather than this frame's
+                    # read; a cache hit replays an earlier read, so it is not
+                    # a new vote
+                    if cache_hit:
+                        consensus = plate_consensus.get(track_ids[i])
+                        consensus = (consensus.text, consensus.confidence) if consensus else ("", 0.0)
+                    else:
+                        consensus = plate_consensus.add(track_ids[i], *plate_text)
+                    if consensus[0]:
+                        plate_text = consensus
+                plate_texts[i] = plate_text
+        
+        vehicles = []
+        for i, vehicle in enumerate(vehicle_detections):
+            v_x1, v_y1, v_x2, v_y2 = boxes[i]
+            vehicle_type, type_conf = types[i]
+            color, color_conf = colors[i]
+            plates = []
+            
+            if best_plates[i] is not None:
+                best_plate, (p_x1, p_y1, p_x2, p_y2) = best_plates[i]
+                plate_text, plate_conf = plate_texts[i]
                 
                 plates.append({
                     'bbox': [p_x1 - v_x1, p_y1 - v_y1, p_x2 - v_x1, p_y2 - v_y1],
+                    'frame_bbox': [p_x1, p_y1, p_x2, p_y2],
                     'text': plate_text,
                     'ocr_confidence': plate_conf,
                     'confidence': float(best_plate['confidence'])
                 })
             
+            if track_ids[i] is not None and crops[i].size:
+                if i in need_type:
+                    track_cache.put(track_ids[i], 'type', vehicle_type, type_conf, signatures[i])
+                if i in need_color:
+                    track_cache.put(track_ids[i], 'color', color, color_conf, signatures[i])
+            
             # Store results
             vehicle_result = {
                 'bbox': vehicle['bbox'],
@@ -242,6 +1008,77 @@ class ANPRBackend:
                 'confidence': type_conf,
                 'plates': plates
             }
-            results['vehicles'].append(vehicle_result)
+            if track_ids[i] is not None:
+                vehicle_result['track_id'] = track_ids[i]
+            vehicles.append(vehicle_result)
         
-        return results, viz_frame
\ No newline at end of file
+        return vehicles
+    
+    # Process a frame and return vehicle detections with visualization; with
+    # an ROI (polygon points, or an (x1, y1, x2, y2) rectangle) only its
+    # bounding rectangle is searched, vehicles centred outside the polygon are
+    # dropped, and all boxes are in frame coordinates. In two-resolution mode
+    # the visualization frame is the downscaled copy (see results['viz_scale'])
+    def process_frame(
+        self,
+        frame: np.ndarray,
+        roi: Optional[Sequence] = None,
+        stream_id: Hashable = 0
+    ) -> Tuple[Dict, np.ndarray]:
+        self.unload_idle()
+        crop, imgsz, bounds, mask, scale = self._detection_input(frame, roi)
+        
+        # Detect vehicles
+        self.stage_calls['frame'] += 1
+        vehicle_detections = self.detect_vehicles(crop, imgsz) if crop.size else []
+        vehicle_detections = self._to_frame_coordinates(vehicle_detections, bounds, mask, scale)
+        results = {'vehicles': self._analyse_vehicles(frame, vehicle_detections, stream_id, bounds)}
+        
+        viz_frame, results['viz_scale'] = self._viz_frame(frame, crop, bounds, scale)
+        return results, viz_frame
+    
+    # Process frames from several streams, detecting vehicles in all of them with one call
+    def process_frames(
+        self,
+        frames: List[np.ndarray],
+        rois: Optional[List[Optional[Sequence]]] = None,
+        stream_ids: Optional[List[Hashable]] = None
+    ) -> List[Tuple[Dict, np.ndarray]]:
+        rois = rois or [None] * len(frames)
+        stream_ids = stream_ids or [0] * len(frames)
+        
+        self.unload_idle()
+        inputs = [self._detection_input(frame, roi) for frame, roi in zip(frames, rois)]
+        self.stage_calls['frame'] += len(frames)
+        
+        # Frames are batched by detector input size; ROIs lying entirely
+        # outside their frame leave nothing to detect in
+        by_imgsz = {}
+        for i, (crop, imgsz, _, _, _) in enumerate(inputs):
+            if crop.size:
+                by_imgsz.setdefault(imgsz, []).append(i)
+        all_detections = [[] for _ in frames]
+        for imgsz, indices in by_imgsz.items():
+            for i, detections in zip(indices, self.detect_vehicles_batch([inputs[i][0] for i in indices], imgsz)):
+                all_detections[i] = detections
+        
+        outputs = []
+        for frame, vehicle_detections, (crop, _, bounds, mask, scale), stream_id in zip(
+                frames, all_detections, inputs, stream_ids):
+            vehicle_detections = self._to_frame_coordinates(vehicle_detections, bounds, mask, scale)
+            results = {'vehicles': self._analyse_vehicles(frame, vehicle_detections, stream_id, bounds)}
+            viz_frame, results['viz_scale'] = self._viz_frame(frame, crop, bounds, scale)
+            outputs.append((results, viz_frame))
+        return outputs
+    
+    # Frame for visualization and its scale relative to the input frame; the
+    # two-resolution path reuses the downscaled detection input when it is the
+    # whole frame instead of copying the full-resolution frame
+    def _viz_frame(self, frame: np.ndarray, crop: np.ndarray, bounds, scale: float) -> Tuple[np.ndarray, float]:
+        if scale == 1.0:
+            return frame.copy(), 1.0
+        if bounds is None:
+            return crop, scale
+        h, w = frame.shape[:2]
+        size = (max(1, round(w * scale)), max(1, round(h * scale)))
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA), scale
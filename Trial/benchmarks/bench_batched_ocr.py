@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark OCR time per frame against the number of plates in the frame,
+comparing one recognize_plate call per plate with a single recognize_plates
+batch, and check that both return the same text.
+"""
+
+import os
+import sys
+import time
+import argparse
+import cv2
+import numpy as np
+
+# Add the Trial directory to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from anpr_processor import ANPRBackend
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def median_ms(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-plate vs batched OCR latency')
+    parser.add_argument('--plates', type=str, required=True, help='Folder of plate crops')
+    parser.add_argument('--max-plates', type=int, default=10, help='Largest plate count to test')
+    parser.add_argument('--repeats', type=int, default=5, help='Timed runs per configuration')
+    args = parser.parse_args()
+
+    crops = []
+    for name in sorted(os.listdir(args.plates)):
+        if name.lower().endswith(IMAGE_EXTENSIONS):
+            image = cv2.imread(os.path.join(args.plates, name))
+            if image is not None:
+                crops.append(image)
+    if not crops:
+        print(f"No images found in {args.plates}")
+        return
+
+    backend = ANPRBackend()
+    backend.recognize_plates(crops[:1])  # load the reader
+
+    print(f"{'Plates':>6} {'Looped (ms)':>12} {'Batched (ms)':>13} {'Speedup':>8} {'Same text':>10}")
+    for count in range(1, args.max_plates + 1):
+        frame_crops = [crops[i % len(crops)] for i in range(count)]
+        looped, looped_text = median_ms(lambda: [backend.recognize_plate(c) for c in frame_crops], args.repeats)
+        batched, batched_text = median_ms(lambda: backend.recognize_plates(frame_crops), args.repeats)
+        same = sum(a[0] == b[0] for a, b in zip(looped_text, batched_text))
+        print(f"{count:>6} {looped:>12.1f} {batched:>13.1f} {looped / batched:>7.2f}x {same:>6}/{count}")
+
+
+if __name__ == '__main__':
+    main()
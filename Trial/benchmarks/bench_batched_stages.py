@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-frame latency of the per-vehicle stages against vehicle count,
+comparing the looped path with the batched path of ANPRBackend. Both paths
+run the plate detector at the same input size, so the speedup is batching
+alone; the script also checks that they find the same plates.
+"""
+
+import os
+import sys
+import time
+import argparse
+import cv2
+import numpy as np
+
+# Add the Trial directory to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from anpr_processor import ANPRBackend
+
+
+def grid_detections(frame: np.ndarray, count: int):
+    """Lay out `count` synthetic vehicle boxes on a grid covering the frame."""
+    h, w = frame.shape[:2]
+    cols = int(np.ceil(np.sqrt(count)))
+    rows = int(np.ceil(count / cols))
+    cell_w, cell_h = w // cols, h // rows
+    detections = []
+    for i in range(count):
+        r, c = divmod(i, cols)
+        detections.append({
+            'bbox': [c * cell_w, r * cell_h, (c + 1) * cell_w, (r + 1) * cell_h],
+            'confidence': 1.0,
+            'class_id': 2,
+            'class_name': 'car'
+        })
+    return detections
+
+
+def time_stages(backend, frame, detections, repeats):
+    vehicles = backend._analyse_vehicles(frame, detections)  # warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        backend._analyse_vehicles(frame, detections)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1000, vehicles
+
+
+def plates_match(looped, batched, tolerance):
+    """Whether both paths found the same plates, boxes within `tolerance` pixels."""
+    for a, b in zip(looped, batched):
+        if len(a['plates']) != len(b['plates']):
+            return False
+        for plate_a, plate_b in zip(a['plates'], b['plates']):
+            if np.abs(np.subtract(plate_a['frame_bbox'], plate_b['frame_bbox'])).max() > tolerance:
+                return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batched vs looped per-vehicle stage latency')
+    parser.add_argument('--image', type=str, required=True, help='Frame to tile vehicle crops from')
+    parser.add_argument('--max-vehicles', type=int, default=15, help='Largest vehicle count to test')
+    parser.add_argument('--repeats', type=int, default=5, help='Timed runs per configuration')
+    parser.add_argument('--device', type=str, default='cpu', help='Inference device')
+    parser.add_argument('--plate-size', type=int, default=320, help='Plate detector input size for both paths')
+    parser.add_argument('--tolerance', type=float, default=2.0, help='Plate box difference (px) still counted as a match')
+    args = parser.parse_args()
+
+    frame = cv2.imread(args.image)
+    if frame is None:
+        print(f"Failed to load image: {args.image}")
+        return
+
+    backend = ANPRBackend(device=args.device, plate_input_size=args.plate_size)
+
+    print(f"Plate detector input: {args.plate_size}px on both paths")
+    print(f"{'Vehicles':>8} {'Looped (ms)':>12} {'Batched (ms)':>13} {'Speedup':>8} {'Plates match':>13}")
+    mismatches = 0
+    for count in range(1, args.max_vehicles + 1):
+        detections = grid_detections(frame, count)
+        backend.batch_stages = False
+        looped, looped_vehicles = time_stages(backend, frame, detections, args.repeats)
+        backend.batch_stages = True
+        batched, batched_vehicles = time_stages(backend, frame, detections, args.repeats)
+        match = plates_match(looped_vehicles, batched_vehicles, args.tolerance)
+        mismatches += not match
+        print(f"{count:>8} {looped:>12.1f} {batched:>13.1f} {looped / batched:>7.2f}x {'yes' if match else 'NO':>13}")
+    if mismatches:
+        print(f"Plate detections differed between the paths for {mismatches} vehicle count(s)")
+
+
+if __name__ == '__main__':
+    main()
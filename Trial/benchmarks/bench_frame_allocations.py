@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark steady-state frame-buffer allocations per displayed frame for the
+legacy copy/convert display path and the FrameRing path used by CameraThread.
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+import tracemalloc
+import cv2
+import numpy as np
+
+# Add the Trial directory to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_ring import FrameRing
+
+
+def write_test_video(path: str, width: int, height: int, frames: int):
+    """Write a short synthetic MJPG clip to decode from."""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 30, (width, height))
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    for i in range(frames):
+        writer.write(np.roll(base, i * 8, axis=1))
+    writer.release()
+
+
+def legacy_path(capture: cv2.VideoCapture):
+    """read() -> copy() in the slot -> BGR2RGB for the QImage."""
+    ret, frame = capture.read()
+    if not ret:
+        return False
+    frame = frame.copy()
+    cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return True
+
+
+def ring_path(capture: cv2.VideoCapture, capture_ring: FrameRing, display_ring: FrameRing, shape):
+    """grab() -> retrieve() into a capture slot -> copyto a display slot."""
+    if not capture.grab():
+        return False
+    slot = capture_ring.acquire(shape)
+    ret, _ = capture.retrieve(capture_ring.buffer(slot))
+    if not ret:
+        return False
+    display_slot = display_ring.acquire(shape)
+    np.copyto(display_ring.buffer(display_slot), capture_ring.buffer(slot))
+    display_ring.commit(display_slot, 0)
+    return True
+
+
+def measure(step, frames: int, frame_bytes: int, warmup: int = 5):
+    """Average transient allocation per frame, in frame-sized units."""
+    for _ in range(warmup):
+        step()
+    tracemalloc.start()
+    allocated = 0
+    for _ in range(frames):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        if not step():
+            break
+        allocated += tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return allocated / frames / frame_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Frame allocations per displayed frame')
+    parser.add_argument('--width', type=int, default=1920, help='Frame width')
+    parser.add_argument('--height', type=int, default=1080, help='Frame height')
+    parser.add_argument('--frames', type=int, default=60, help='Frames to measure')
+    args = parser.parse_args()
+
+    shape = (args.height, args.width, 3)
+    frame_bytes = int(np.prod(shape))
+    total = args.frames + 10
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = os.path.join(tmp, 'bench.avi')
+        write_test_video(video, args.width, args.height, total)
+
+        capture = cv2.VideoCapture(video)
+        legacy = measure(lambda: legacy_path(capture), args.frames, frame_bytes)
+        capture.release()
+
+        capture = cv2.VideoCapture(video)
+        capture_ring, display_ring = FrameRing(6), FrameRing(4)
+        ring = measure(lambda: ring_path(capture, capture_ring, display_ring, shape), args.frames, frame_bytes)
+        capture.release()
+
+    print(f"Frame size: {args.width}x{args.height} ({frame_bytes / 1e6:.1f} MB)")
+    print(f"Legacy path:    {legacy:5.2f} frame-sized allocations per frame")
+    print(f"FrameRing path: {ring:5.2f} frame-sized allocations per frame")
+    print(f"Ring buffers allocated in total: {capture_ring.allocations + display_ring.allocations}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Measure how many frames of a recording the motion gate would skip at
+several thresholds, what the gate itself costs per frame, and how much
+backend inference time that saves.
+"""
+
+import os
+import sys
+import time
+import argparse
+import cv2
+import numpy as np
+
+# Add the Trial directory to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motion_gate import MotionGate
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Motion gate skip rate and cost')
+    parser.add_argument('--video', type=str, required=True, help='Recording to replay')
+    parser.add_argument('--thresholds', type=float, nargs='+', default=[0.0005, 0.002, 0.01],
+                        help='Motion thresholds to compare')
+    parser.add_argument('--skip-frames', type=int, default=2, help='Gate every nth frame, as CameraThread does')
+    parser.add_argument('--max-frames', type=int, default=3000, help='Frames to read')
+    parser.add_argument('--inference', action='store_true',
+                        help='Also time ANPRBackend.process_frame to estimate the time saved')
+    args = parser.parse_args()
+
+    # One gate per threshold, fed in a single pass; only every
+    # skip_frames-th frame reaches the gate
+    gates = [MotionGate(threshold) for threshold in args.thresholds]
+    scores = [[] for _ in gates]
+    sample = []
+    capture = cv2.VideoCapture(args.video)
+    for index in range(args.max_frames):
+        ok, frame = capture.read()
+        if not ok:
+            break
+        if index % args.skip_frames:
+            continue
+        for gate, gate_scores in zip(gates, scores):
+            gate.check(frame)
+            gate_scores.append(gate.score)
+        if args.inference and index % 50 == 0:
+            sample.append(frame)
+    capture.release()
+    checked = gates[0].frames_checked
+    if not checked:
+        print(f"No frames read from {args.video}")
+        return
+
+    inference_ms = None
+    if sample:
+        from anpr_processor import ANPRBackend
+        backend = ANPRBackend()
+        backend.warmup()
+        start = time.perf_counter()
+        for frame in sample:
+            backend.process_frame(frame)
+        inference_ms = (time.perf_counter() - start) * 1000 / len(sample)
+
+    print(f"{checked} frames checked")
+    print(f"{'threshold':>10}{'gated':>8}{'gate ms':>9}{'median score':>14}{'saved ms/frame':>16}")
+    for gate, gate_scores in zip(gates, scores):
+        gated = gate.frames_gated / checked
+        gate_ms = gate.gate_time * 1000 / checked
+        saved = f"{gated * inference_ms - gate_ms:.1f}" if inference_ms is not None else '-'
+        print(f"{gate.threshold:>10.4f}{gated:>8.1%}{gate_ms:>9.2f}{np.median(gate_scores):>14.4f}{saved:>16}")
+
+if __name__ == '__main__':
+    main()
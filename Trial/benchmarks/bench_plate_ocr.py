@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Compare recognition-only OCR with EasyOCR's readtext (text detection plus
+recognition) on labelled plate crops: latency per crop and exact-match
+accuracy after the backend's post-processing.
+
+The label file uses the dataset format read by DatasetLoader: one JSON
+object per line with "img_path" and "label".
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+# Add the Trial directory to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from anpr_processor import ANPRBackend
+from integrated_anpr.utils.dataset_loader import DatasetLoader
+
+
+def normalise(text: str) -> str:
+    return ''.join(c for c in text.upper() if c.isalnum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Recognition-only OCR vs readtext on plate crops')
+    parser.add_argument('--label_file', type=str, required=True, help='JSONL file of plate crops and labels')
+    parser.add_argument('--limit', type=int, default=None, help='Use at most this many crops')
+    args = parser.parse_args()
+
+    dataset = DatasetLoader(args.label_file)
+    samples = []
+    for item in dataset.get_data()[:args.limit]:
+        image = dataset.load_image(item.get('img_path'))
+        if image is not None:
+            samples.append((image, normalise(item.get('label', ''))))
+    if not samples:
+        print("No plate crops loaded")
+        return
+
+    backend = ANPRBackend()
+    backend.recognize_plate(samples[0][0])  # load the reader
+
+    print(f"{len(samples)} plate crops")
+    print(f"{'mode':<11}{'mean (ms)':>10}{'p95 (ms)':>10}{'exact':>8}")
+    for mode in ANPRBackend.OCR_MODES:
+        backend.ocr_mode = mode
+        latencies, correct = [], 0
+        for image, label in samples:
+            start = time.perf_counter()
+            text, _ = backend.recognize_plate(image)
+            latencies.append((time.perf_counter() - start) * 1000)
+            correct += normalise(text) == label
+        print(f"{mode:<11}{np.mean(latencies):>10.1f}{np.percentile(latencies, 95):>10.1f}"
+              f"{correct / len(samples):>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
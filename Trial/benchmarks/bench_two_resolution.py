@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark the two-resolution pipeline against the single-resolution one:
+vehicle detection on a downscaled copy of the frame at several sizes, with
+plates read from full-resolution crops. Reports per-frame latency, vehicle
+detection latency and how many vehicles and plate texts each setting finds.
+"""
+
+import os
+import sys
+import time
+import argparse
+import cv2
+import numpy as np
+
+# Add the Trial directory to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from anpr_processor import ANPRBackend
+
+
+def read_frames(source: str, count: int):
+    """Read up to `count` frames from a video file or a single image."""
+    image = cv2.imread(source)
+    if image is not None:
+        return [image] * count
+
+    capture = cv2.VideoCapture(source)
+    frames = []
+    while len(frames) < count:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        frames.append(frame)
+    capture.release()
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Single- vs two-resolution pipeline latency')
+    parser.add_argument('--source', type=str, required=True, help='Video file or image (ideally 1080p or 4K)')
+    parser.add_argument('--frames', type=int, default=30, help='Frames to time per setting')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[640, 480, 320],
+                        help='Long-side sizes for vehicle detection')
+    args = parser.parse_args()
+
+    frames = read_frames(args.source, args.frames)
+    if not frames:
+        print(f"Failed to read frames from {args.source}")
+        return
+    h, w = frames[0].shape[:2]
+    print(f"{len(frames)} frames of {w}x{h}")
+
+    print(f"{'detect size':<13}{'frame (ms)':>11}{'detect (ms)':>12}{'vehicles':>10}{'plates read':>13}")
+    for size in [None] + args.sizes:
+        backend = ANPRBackend(detect_size=size, warmup_frame_shape=(h, w))
+        backend.warmup()
+
+        latencies, detect_times, vehicles, plates = [], [], 0, 0
+        for frame in frames:
+            start = time.perf_counter()
+            results, _ = backend.process_frame(frame)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+            crop, imgsz, _, _, _ = backend._detection_input(frame, None)
+            start = time.perf_counter()
+            backend.detect_vehicles(crop, imgsz)
+            detect_times.append((time.perf_counter() - start) * 1000)
+
+            vehicles += len(results['vehicles'])
+            plates += sum(1 for v in results['vehicles'] for p in v['plates'] if p['text'])
+
+        label = 'native' if size is None else str(size)
+        print(f"{label:<13}{np.mean(latencies):>11.1f}{np.mean(detect_times):>12.1f}{vehicles:>10}{plates:>13}")
+
+
+if __name__ == '__main__':
+    main()
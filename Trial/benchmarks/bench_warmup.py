@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark first-frame latency against steady-state latency of ANPRBackend,
+with and without the warm-up phase. Model loading is timed separately so it
+does not hide the cost of the first inference.
+"""
+
+import os
+import sys
+import time
+import argparse
+import cv2
+import numpy as np
+
+# Add the Trial directory to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from anpr_processor import ANPRBackend
+
+
+def read_frames(source: str, count: int):
+    """Read up to `count` frames from a video file or a single image."""
+    image = cv2.imread(source)
+    if image is not None:
+        return [image] * count
+
+    capture = cv2.VideoCapture(source)
+    frames = []
+    while len(frames) < count:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        frames.append(frame)
+    capture.release()
+    return frames
+
+
+def frame_latencies(backend, frames):
+    latencies = []
+    for frame in frames:
+        start = time.perf_counter()
+        backend.process_frame(frame)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='First-frame vs steady-state latency')
+    parser.add_argument('--source', type=str, required=True, help='Video file or image')
+    parser.add_argument('--frames', type=int, default=30, help='Frames to time per backend')
+    parser.add_argument('--engine', type=str, default=None, help='torch, onnxruntime or openvino')
+    parser.add_argument('--batch-stages', action='store_true', help='Use the batched per-vehicle stages')
+    args = parser.parse_args()
+
+    frames = read_frames(args.source, args.frames)
+    if not frames:
+        print(f"Failed to read frames from {args.source}")
+        return
+    options = {'engine': args.engine, 'batch_stages': args.batch_stages,
+               'warmup_frame_shape': frames[0].shape[:2]}
+
+    print(f"{'backend':<10}{'load (s)':>10}{'warm-up (s)':>13}{'first (ms)':>12}"
+          f"{'steady (ms)':>13}{'first/steady':>14}")
+    for warm in (False, True):
+        backend = ANPRBackend(**options)
+
+        start = time.perf_counter()
+        backend.load()
+        load_time = time.perf_counter() - start
+
+        warmup_time = 0.0
+        if warm:
+            start = time.perf_counter()
+            backend.warmup()
+            warmup_time = time.perf_counter() - start
+
+        latencies = frame_latencies(backend, frames)
+        steady = float(np.median(latencies[len(latencies) // 2:]))
+        print(f"{'warm' if warm else 'cold':<10}{load_time:>10.2f}{warmup_time:>13.2f}"
+              f"{latencies[0]:>12.1f}{steady:>13.1f}{latencies[0] / steady:>13.2f}x")
+        del backend
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Check that the lookup-table colour classifier matches the inRange reference
+on a folder of vehicle crops, and compare their speed.
+"""
+
+import os
+import sys
+import time
+import argparse
+import cv2
+
+# Add the Trial directory to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from anpr_processor import ANPRBackend
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare LUT colour detection with the inRange reference')
+    parser.add_argument('--images', type=str, required=True, help='Folder of vehicle crops')
+    parser.add_argument('--budget', type=int, default=4096, help='Pixel budget for the subsampled run')
+    args = parser.parse_args()
+
+    crops = []
+    for name in sorted(os.listdir(args.images)):
+        if name.lower().endswith(IMAGE_EXTENSIONS):
+            image = cv2.imread(os.path.join(args.images, name))
+            if image is not None:
+                crops.append((name, image))
+    if not crops:
+        print(f"No images found in {args.images}")
+        return
+
+    backend = ANPRBackend()
+    timings = {'inRange': 0.0, 'LUT': 0.0, f'LUT@{args.budget}px': 0.0}
+    mismatches = 0
+    budget_agree = 0
+
+    for name, crop in crops:
+        start = time.perf_counter()
+        reference = backend._detect_color_masks(crop)
+        timings['inRange'] += time.perf_counter() - start
+
+        backend.color_pixel_budget = None
+        start = time.perf_counter()
+        lut_result = backend.detect_color(crop)
+        timings['LUT'] += time.perf_counter() - start
+
+        backend.color_pixel_budget = args.budget
+        start = time.perf_counter()
+        budget_result = backend.detect_color(crop)
+        timings[f'LUT@{args.budget}px'] += time.perf_counter() - start
+
+        if lut_result != reference:
+            mismatches += 1
+            print(f"MISMATCH {name}: reference={reference} lut={lut_result}")
+        budget_agree += budget_result[0] == reference[0]
+
+    print(f"\n{len(crops)} crops, {mismatches} mismatches between LUT and inRange")
+    print(f"Subsampled LUT agrees on colour for {budget_agree}/{len(crops)} crops")
+    for method, total in timings.items():
+        print(f"{method:<16} {total / len(crops) * 1000:8.3f} ms/crop")
+
+
+if __name__ == '__main__':
+    main()
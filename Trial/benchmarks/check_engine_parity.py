@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Check that the ONNX Runtime / OpenVINO engines reproduce the PyTorch
+detections and classifications on a folder of images, and compare their speed.
+Exits with a non-zero status when any image falls outside the tolerance.
+"""
+
+import os
+import sys
+import time
+import argparse
+import cv2
+import numpy as np
+
+# Add the Trial directory to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from box_utils import iou_matrix
+from yolo_engines import load_yolo_engine
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def match_detections(reference, candidate, min_iou):
+    """Return the worst IoU between matched boxes, or None if the box sets differ."""
+    if len(reference.boxes) != len(candidate.boxes):
+        return None
+    if not len(reference.boxes):
+        return 1.0
+
+    ious = iou_matrix(reference.boxes, candidate.boxes)
+    best = ious.argmax(axis=1)
+    if len(set(best.tolist())) != len(best):
+        return None
+    if np.any(reference.class_ids != candidate.class_ids[best]):
+        return None
+    worst = float(ious[np.arange(len(best)), best].min())
+    return worst if worst >= min_iou else None
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare inference engines against the PyTorch path')
+    parser.add_argument('--images', type=str, required=True, help='Folder of frames (or vehicle crops for --task classify)')
+    parser.add_argument('--model', type=str, default='models/vehicle_detector.pt', help='Model weights')
+    parser.add_argument('--task', choices=['detect', 'classify'], default='detect', help='Model task')
+    parser.add_argument('--engines', nargs='+', default=['onnxruntime', 'openvino'], help='Engines to compare')
+    parser.add_argument('--conf', type=float, default=0.25, help='Detection confidence threshold')
+    parser.add_argument('--min-iou', type=float, default=0.9, help='Minimum IoU between matched boxes')
+    parser.add_argument('--prob-tol', type=float, default=0.02, help='Maximum top-1 probability difference')
+    args = parser.parse_args()
+
+    images = []
+    for name in sorted(os.listdir(args.images)):
+        if name.lower().endswith(IMAGE_EXTENSIONS):
+            image = cv2.imread(os.path.join(args.images, name))
+            if image is not None:
+                images.append((name, image))
+    if not images:
+        print(f"No images found in {args.images}")
+        return
+
+    reference_engine = load_yolo_engine(args.model, 'torch')
+    run = 'detect' if args.task == 'detect' else 'classify'
+    run_kwargs = {'conf': args.conf} if args.task == 'detect' else {}
+
+    # One warm-up call per engine so load and first-call costs are not timed
+    reference_run = getattr(reference_engine, run)
+    reference_run([images[0][1]], **run_kwargs)
+    reference = []
+    reference_time = 0.0
+    for _, image in images:
+        output, elapsed = timed(reference_run, [image], **run_kwargs)
+        reference.append(output[0])
+        reference_time += elapsed
+    print(f"torch: {reference_time / len(images) * 1000:.1f} ms/image")
+
+    failures = 0
+    for engine_name in args.engines:
+        try:
+            engine = load_yolo_engine(args.model, engine_name)
+        except ImportError as e:
+            print(f"{engine_name}: skipped ({e})")
+            continue
+
+        engine_run = getattr(engine, run)
+        engine_run([images[0][1]], **run_kwargs)
+        mismatches = 0
+        worst = 1.0
+        elapsed_total = 0.0
+
+        for (name, image), expected in zip(images, reference):
+            output, elapsed = timed(engine_run, [image], **run_kwargs)
+            elapsed_total += elapsed
+            output = output[0]
+
+            if args.task == 'detect':
+                score = match_detections(expected, output, args.min_iou)
+                if score is None:
+                    mismatches += 1
+                    print(f"MISMATCH {engine_name} {name}: torch={len(expected.boxes)} boxes, "
+                          f"{engine_name}={len(output.boxes)} boxes")
+                else:
+                    worst = min(worst, score)
+            else:
+                delta = abs(expected.top1conf - float(output.probs[expected.top1]))
+                if output.top1 != expected.top1 or delta > args.prob_tol:
+                    mismatches += 1
+                    print(f"MISMATCH {engine_name} {name}: torch={expected.names[expected.top1]} "
+                          f"{engine_name}={output.names[output.top1]} (delta {delta:.3f})")
+
+        failures += mismatches
+        summary = f"worst IoU {worst:.3f}" if args.task == 'detect' else f"prob tolerance {args.prob_tol}"
+        print(f"{engine_name}: {elapsed_total / len(images) * 1000:.1f} ms/image, "
+              f"{mismatches}/{len(images)} mismatches, {summary}, "
+              f"speedup x{reference_time / max(elapsed_total, 1e-9):.2f}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Load every ANPR pipeline in one process and check that they share a single
+copy of each network through the model registry, reporting resident memory
+after each pipeline is loaded.
+"""
+
+import os
+import sys
+import argparse
+
+# Add the Trial directory to the path
+TRIAL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(TRIAL_DIR)
+
+from anpr_processor import ANPRBackend, _resident_bytes
+from model_registry import registry
+
+
+def resident_mb():
+    resident = _resident_bytes()
+    return '-' if resident is None else f"{resident / 2**20:.0f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that pipelines share loaded models')
+    parser.add_argument('--skip-yolov8-trial', action='store_true',
+                        help='Do not import the YOLOv8 trial util module')
+    args = parser.parse_args()
+
+    print(f"start: {resident_mb()}")
+
+    backend = ANPRBackend()
+    backend.load()
+    print(f"ANPRBackend: {resident_mb()}")
+
+    from integrated_anpr.models.anpr_model import ANPRModel
+    anpr_model = ANPRModel()
+    print(f"ANPRModel: {resident_mb()}")
+
+    from integrated_anpr.models.model_handler import ModelHandler
+    handler = ModelHandler()
+    print(f"ModelHandler: {resident_mb()}")
+
+    readers = [backend.ocr, anpr_model.reader, handler.reader]
+    if not args.skip_yolov8_trial:
+        sys.path.append(os.path.join(TRIAL_DIR, 'Automatic-License-Plate-Recognition-using-YOLOv8'))
+        import util
+        readers.append(util.reader)
+        print(f"YOLOv8 trial util: {resident_mb()}")
+
+    print("\nLoaded models (holders):")
+    for key, refs in registry.loaded().items():
+        print(f"  {refs}  {key[0]} {key[1] or ''} {key[2] or ''} {key[3]}")
+
+    # One reader per device: ModelHandler asks for the GPU, so it only
+    # shares the CPU reader on machines without CUDA
+    instances = len({id(reader) for reader in readers})
+    devices = len({str(reader.device) for reader in readers})
+    shared = instances == devices
+    print(f"\nEasyOCR readers shared: {'yes' if shared else 'NO'} "
+          f"({len(readers)} holders, {instances} instances, {devices} devices)")
+    sys.exit(0 if shared else 1)
+
+
+if __name__ == '__main__':
+    main()
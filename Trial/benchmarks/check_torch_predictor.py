@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Check that TorchEngine's persistent predictor returns the same detections as
+ultralytics' model.predict() with the same settings. Square images are cropped
+to 16:9 first, since padding of non-square inputs is where the two can differ.
+Exits with a non-zero status when any image falls outside the tolerance.
+"""
+
+import os
+import sys
+import argparse
+import cv2
+import numpy as np
+
+# Add the Trial directory to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from box_utils import iou_matrix
+from yolo_engines import Detections, TorchEngine
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def non_square(image):
+    """The image itself, or a centred 16:9 crop of it if it is square."""
+    h, w = image.shape[:2]
+    if h != w:
+        return image
+    crop_h = w * 9 // 16
+    top = (h - crop_h) // 2
+    return image[top:top + crop_h]
+
+
+def compare(expected, output, min_iou, score_tol):
+    """Return None if the detections match, otherwise what differs."""
+    if len(expected.boxes) != len(output.boxes):
+        return f"{len(expected.boxes)} vs {len(output.boxes)} boxes"
+    if not len(expected.boxes):
+        return None
+
+    ious = iou_matrix(expected.boxes, output.boxes)
+    best = ious.argmax(axis=1)
+    if len(set(best.tolist())) != len(best):
+        return "boxes do not pair up"
+    if np.any(expected.class_ids != output.class_ids[best]):
+        return "classes differ"
+    worst_iou = float(ious[np.arange(len(best)), best].min())
+    if worst_iou < min_iou:
+        return f"IoU {worst_iou:.3f}"
+    score_delta = float(np.abs(expected.scores - output.scores[best]).max())
+    if score_delta > score_tol:
+        return f"score difference {score_delta:.4f}"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the persistent Torch predictor with model.predict()')
+    parser.add_argument('--images', type=str, required=True, help='Folder of frames')
+    parser.add_argument('--model', type=str, default='models/vehicle_detector.pt', help='Detector weights')
+    parser.add_argument('--conf', type=float, default=0.25, help='Detection confidence threshold')
+    parser.add_argument('--imgsz', type=int, help='Inference size (default: the model\'s own)')
+    parser.add_argument('--min-iou', type=float, default=0.99, help='Minimum IoU between matched boxes')
+    parser.add_argument('--score-tol', type=float, default=1e-3, help='Maximum confidence difference')
+    args = parser.parse_args()
+
+    images = []
+    for name in sorted(os.listdir(args.images)):
+        if name.lower().endswith(IMAGE_EXTENSIONS):
+            image = cv2.imread(os.path.join(args.images, name))
+            if image is not None:
+                images.append((name, non_square(image)))
+    if not images:
+        print(f"No images found in {args.images}")
+        return
+
+    engine = TorchEngine(args.model)
+    settings = {'conf': args.conf}
+    if args.imgsz:
+        settings['imgsz'] = args.imgsz
+
+    failures = 0
+    for name, image in images:
+        results = engine.model.predict(image, verbose=False, device=engine.device, **settings)[0]
+        reference = Detections(
+            results.boxes.xyxy.cpu().numpy(),
+            results.boxes.conf.cpu().numpy(),
+            results.boxes.cls.cpu().numpy().astype(np.int64),
+            results.names
+        )
+        output = engine.detect([image], **settings)[0]
+        problem = compare(reference, output, args.min_iou, args.score_tol)
+        if problem:
+            failures += 1
+            print(f"MISMATCH {name} ({image.shape[1]}x{image.shape[0]}): {problem}")
+
+    print(f"{len(images) - failures}/{len(images)} images match model.predict()")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Load the ANPR models one at a time and report the resident memory and weight
+size attributed to each, for sizing deployment hardware.
+"""
+
+import os
+import sys
+import argparse
+
+# Add the Trial directory to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from anpr_processor import ANPRBackend
+
+
+def fmt(value, unit=' MB'):
+    return '-' if value is None else f"{value:.1f}{unit}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report the memory used by each ANPR model')
+    parser.add_argument('--engine', type=str, default=None, help='torch, onnxruntime or openvino')
+    parser.add_argument('--precision', type=str, default='fp32', help='Model precision')
+    parser.add_argument('--no-classification', action='store_true', help='Disable vehicle-type classification')
+    parser.add_argument('--no-plates', action='store_true', help='Disable plate detection and OCR')
+    parser.add_argument('--no-ocr', action='store_true', help='Disable OCR')
+    args = parser.parse_args()
+
+    backend = ANPRBackend(
+        engine=args.engine,
+        precision=args.precision,
+        enable_classification=not args.no_classification,
+        enable_plates=not args.no_plates,
+        enable_ocr=not args.no_ocr
+    )
+    baseline = backend.memory_report()['process_resident_mb']
+    backend.load()
+    report = backend.memory_report()
+
+    print(f"{'model':<20}{'loaded':>8}{'resident':>12}{'weights':>12}{'load':>9}")
+    for name, model in report['models'].items():
+        print(f"{name:<20}{'yes' if model['loaded'] else 'no':>8}{fmt(model['resident_mb']):>12}"
+              f"{fmt(model['weights_mb']):>12}{fmt(model['load_time'], 's'):>9}")
+    print(f"process resident: {fmt(baseline)} before loading, {fmt(report['process_resident_mb'])} after")
+
+
+if __name__ == '__main__':
+    main()
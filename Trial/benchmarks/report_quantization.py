@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Run the full-precision and reduced-precision YOLO stages side by side on a
+folder of frames and report mAP@0.5 / recall deltas and per-stage latency.
+
+The vehicle detector is scored against YOLO-format labels when --labels is given
+(one <image stem>.txt per frame, lines of "class cx cy w h" normalised),
+otherwise against the fp32 detections. The classifier runs on vehicle crops
+cut from the fp32 vehicle detections and is scored by top-1 agreement.
+"""
+
+import os
+import sys
+import time
+import argparse
+import cv2
+import numpy as np
+
+# Add the Trial directory to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from box_utils import iou_matrix
+from yolo_engines import Detections, load_yolo_engine
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def load_labels(path, shape):
+    """Read a YOLO-format label file into (boxes, class_ids) in pixels."""
+    if not os.path.exists(path):
+        return np.zeros((0, 4), np.float32), np.zeros(0, np.int64)
+    rows = np.loadtxt(path, ndmin=2)
+    if not rows.size:
+        return np.zeros((0, 4), np.float32), np.zeros(0, np.int64)
+    h, w = shape[:2]
+    cx, cy, bw, bh = rows[:, 1] * w, rows[:, 2] * h, rows[:, 3] * w, rows[:, 4] * h
+    boxes = np.stack([cx - bw / 2, cy - bh / 2, cx + bw / 2, cy + bh / 2], axis=1).astype(np.float32)
+    return boxes, rows[:, 0].astype(np.int64)
+
+
+def average_precision(predictions, ground_truth, iou_threshold=0.5):
+    """mAP and recall over a dataset.
+
+    Args:
+        predictions: Per-image Detections
+        ground_truth: Per-image (boxes, class_ids)
+    """
+    classes = set()
+    for boxes, class_ids in ground_truth:
+        classes.update(class_ids.tolist())
+
+    aps, matched_total, gt_total = [], 0, 0
+    for cls in sorted(classes):
+        scores, hits = [], []
+        num_gt = 0
+        for det, (gt_boxes, gt_ids) in zip(predictions, ground_truth):
+            gt = gt_boxes[gt_ids == cls]
+            num_gt += len(gt)
+            mask = det.class_ids == cls
+            boxes, confs = det.boxes[mask], det.scores[mask]
+            order = np.argsort(-confs)
+            taken = np.zeros(len(gt), dtype=bool)
+            ious = iou_matrix(boxes[order], gt) if len(gt) and len(boxes) else np.zeros((len(boxes), len(gt)))
+            for row, index in enumerate(order):
+                scores.append(confs[index])
+                best = int(ious[row].argmax()) if len(gt) else -1
+                hit = best >= 0 and ious[row, best] >= iou_threshold and not taken[best]
+                if hit:
+                    taken[best] = True
+                hits.append(hit)
+        if not num_gt:
+            continue
+
+        order = np.argsort(-np.asarray(scores))
+        tp = np.cumsum(np.asarray(hits, dtype=np.float64)[order])
+        recall = tp / num_gt
+        precision = tp / np.arange(1, len(tp) + 1)
+        # All-point interpolated area under the precision-recall curve
+        envelope = np.concatenate([[0.0], precision, [0.0]])
+        envelope = np.maximum.accumulate(envelope[::-1])[::-1]
+        steps = np.diff(np.concatenate([[0.0], recall]))
+        aps.append(float(np.sum(steps * envelope[1:-1])))
+        matched_total += int(tp[-1]) if len(tp) else 0
+        gt_total += num_gt
+
+    mean_ap = float(np.mean(aps)) if aps else 0.0
+    recall = matched_total / gt_total if gt_total else 0.0
+    return mean_ap, recall
+
+
+def run_stage(engine, method, inputs, **kwargs):
+    """Run one stage over every input, returning outputs and mean ms per input."""
+    fn = getattr(engine, method)
+    if inputs:
+        fn([inputs[0]], **kwargs)
+    outputs, elapsed = [], 0.0
+    for item in inputs:
+        start = time.perf_counter()
+        outputs.append(fn([item], **kwargs)[0])
+        elapsed += time.perf_counter() - start
+    return outputs, elapsed / max(len(inputs), 1) * 1000
+
+
+def as_ground_truth(detections):
+    return [(det.boxes, det.class_ids) for det in detections]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report accuracy and latency of reduced-precision models')
+    parser.add_argument('--images', type=str, required=True, help='Folder of evaluation frames')
+    parser.add_argument('--labels', type=str, default=None, help='YOLO-format labels for the vehicle detector')
+    parser.add_argument('--calibration', type=str, default=None, help='Calibration frames (defaults to --images)')
+    parser.add_argument('--engine', type=str, default='onnxruntime', help='onnxruntime or openvino')
+    parser.add_argument('--precisions', nargs='+', default=['int8_dynamic', 'int8_static'],
+                        help='Reduced precisions to compare with fp32')
+    parser.add_argument('--vehicle-model', type=str, default='models/vehicle_detector.pt')
+    parser.add_argument('--plate-model', type=str, default='models/license_plate_detector.pt')
+    parser.add_argument('--classifier-model', type=str, default='models/vehicle_type_classifier.pt')
+    parser.add_argument('--conf', type=float, default=0.25, help='Detection confidence threshold')
+    args = parser.parse_args()
+
+    frames = []
+    for name in sorted(os.listdir(args.images)):
+        if name.lower().endswith(IMAGE_EXTENSIONS):
+            image = cv2.imread(os.path.join(args.images, name))
+            if image is not None:
+                frames.append((name, image))
+    if not frames:
+        print(f"No images found in {args.images}")
+        return
+    images = [image for _, image in frames]
+    calibration = args.calibration or args.images
+
+    # A low threshold keeps the precision-recall curve intact for mAP
+    detect_kwargs = {'conf': 0.001}
+    stages = {}
+
+    def evaluate(precision):
+        options = {'engine': args.engine, 'precision': precision, 'calibration_dir': calibration}
+        vehicle = load_yolo_engine(args.vehicle_model, **options)
+        plate = load_yolo_engine(args.plate_model, **options)
+        classifier = load_yolo_engine(args.classifier_model, **options)
+        return {
+            'vehicle': run_stage(vehicle, 'detect', images, **detect_kwargs),
+            'plate': run_stage(plate, 'detect', images, **detect_kwargs),
+            'classifier': (classifier, None)
+        }
+
+    stages['fp32'] = evaluate('fp32')
+    for precision in args.precisions:
+        try:
+            stages[precision] = evaluate(precision)
+        except (ImportError, ValueError) as e:
+            print(f"{precision}: skipped ({e})")
+
+    # Vehicle crops from the fp32 detections feed every classifier
+    reference_vehicles = stages['fp32']['vehicle'][0]
+    crops = []
+    for image, det in zip(images, reference_vehicles):
+        for box, conf in zip(det.boxes.astype(int), det.scores):
+            x1, y1, x2, y2 = box
+            if conf >= args.conf and x2 > x1 and y2 > y1:
+                crops.append(image[y1:y2, x1:x2])
+    for results in stages.values():
+        results['classifier'] = run_stage(results['classifier'][0], 'classify', crops)
+
+    def thresholded(detections):
+        out = []
+        for det in detections:
+            keep = det.scores >= args.conf
+            out.append(Detections(det.boxes[keep], det.scores[keep], det.class_ids[keep], det.names))
+        return out
+
+    # Without labels the fp32 detections above the normal threshold are the reference
+    truth = {
+        'vehicle': as_ground_truth(thresholded(stages['fp32']['vehicle'][0])),
+        'plate': as_ground_truth(thresholded(stages['fp32']['plate'][0]))
+    }
+    if args.labels:
+        truth['vehicle'] = [
+            load_labels(os.path.join(args.labels, os.path.splitext(name)[0] + '.txt'), image.shape)
+            for name, image in frames
+        ]
+    reference_labels = [c.top1 for c in stages['fp32']['classifier'][0]]
+    baseline = {}
+
+    print(f"\n{len(images)} frames, {len(crops)} vehicle crops, engine {args.engine}, "
+          f"reference: {'labels' if args.labels else 'fp32'} for vehicles, fp32 for plates and types")
+    print(f"{'stage':<11}{'precision':<14}{'ms/input':>9}{'mAP@0.5':>9}{'dmAP':>8}"
+          f"{'recall':>8}{'drecall':>9}{'speedup':>9}")
+    for stage in ('vehicle', 'plate', 'classifier'):
+        for precision, results in stages.items():
+            outputs, ms = results[stage]
+            if stage == 'classifier':
+                agree = np.mean([c.top1 == r for c, r in zip(outputs, reference_labels)]) if crops else 0.0
+                score, recall = float(agree), float(agree)
+            else:
+                score, recall = average_precision(outputs, truth[stage])
+            if precision == 'fp32':
+                baseline[stage] = (score, recall, ms)
+            base_score, base_recall, base_ms = baseline[stage]
+            print(f"{stage:<11}{precision:<14}{ms:>9.1f}{score:>9.3f}{score - base_score:>+8.3f}"
+                  f"{recall:>8.3f}{recall - base_recall:>+9.3f}{base_ms / max(ms, 1e-9):>8.2f}x")
+    print("(classifier columns are top-1 agreement with fp32)")
+
+
+if __name__ == '__main__':
+    main()
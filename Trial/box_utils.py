@@ -0,0 +1,202 @@
+# Bounding-box and image geometry helpers shared by the ANPR pipeline
+import cv2
+import numpy as np
+from typing import List, Tuple
+
+
+def letterbox(
+    image: np.ndarray,
+    size: int,
+    color: Tuple[int, int, int] = (114, 114, 114)
+) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+    """Resize an image into a square canvas while keeping its aspect ratio.
+
+    Args:
+        image: BGR image to resize
+        size: Side length of the square output
+        color: Padding colour (YOLO's default grey)
+
+    Returns:
+        Tuple of (letterboxed image, scale factor, (pad_x, pad_y))
+    """
+    h, w = image.shape[:2]
+    scale = min(size / h, size / w)
+    new_w = max(1, int(round(w * scale)))
+    new_h = max(1, int(round(h * scale)))
+    pad_x = (size - new_w) // 2
+    pad_y = (size - new_h) // 2
+
+    canvas = np.full((size, size, 3), color, dtype=np.uint8)
+    interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+    canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = cv2.resize(
+        image, (new_w, new_h), interpolation=interpolation
+    )
+    return canvas, scale, (pad_x, pad_y)
+
+
+def unletterbox_boxes(
+    boxes: np.ndarray,
+    scale: float,
+    pad: Tuple[int, int],
+    shape: Tuple[int, int]
+) -> np.ndarray:
+    """Map (N, 4) xyxy boxes from letterboxed coordinates back to the source image.
+
+    Args:
+        boxes: Boxes in letterboxed image coordinates
+        scale: Scale factor returned by letterbox()
+        pad: (pad_x, pad_y) returned by letterbox()
+        shape: (height, width) of the source image, used for clipping
+
+    Returns:
+        Boxes in source image coordinates
+    """
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4).copy()
+    boxes[:, [0, 2]] -= pad[0]
+    boxes[:, [1, 3]] -= pad[1]
+    boxes /= scale
+    boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, shape[1])
+    boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, shape[0])
+    return boxes
+
+
+def offset_box(box: List[float], dx: float, dy: float) -> List[float]:
+    """Translate an xyxy box by (dx, dy)."""
+    x1, y1, x2, y2 = box
+    return [x1 + dx, y1 + dy, x2 + dx, y2 + dy]
+
+
+def box_areas(boxes: np.ndarray) -> np.ndarray:
+    """Areas of (N, 4) xyxy boxes."""
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    return (boxes[:, 2] - boxes[:, 0]).clip(0) * (boxes[:, 3] - boxes[:, 1]).clip(0)
+
+
+def intersection_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise intersection areas between (N, 4) and (M, 4) xyxy boxes."""
+    a = np.asarray(a, dtype=np.float32).reshape(-1, 4)
+    b = np.asarray(b, dtype=np.float32).reshape(-1, 4)
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    return (x2 - x1).clip(0) * (y2 - y1).clip(0)
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU between (N, 4) and (M, 4) xyxy boxes."""
+    inter = intersection_matrix(a, b)
+    union = box_areas(a)[:, None] + box_areas(b)[None, :] - inter
+    return inter / np.maximum(union, 1e-9)
+
+
+def containment_matrix(inner: np.ndarray, outer: np.ndarray) -> np.ndarray:
+    """Fraction of each inner box's area that lies inside each outer box, shape (N, M)."""
+    inter = intersection_matrix(inner, outer)
+    return inter / np.maximum(box_areas(inner)[:, None], 1e-9)
+
+
+def assign_to_containers(
+    inner: np.ndarray,
+    outer: np.ndarray,
+    min_containment: float = 0.8
+) -> np.ndarray:
+    """Assign every inner box (e.g. a plate) to the outer box (e.g. a vehicle) containing it.
+
+    Args:
+        inner: (N, 4) xyxy boxes to assign
+        outer: (M, 4) xyxy candidate containers
+        min_containment: Minimum fraction of the inner box that must be covered
+
+    Returns:
+        (N,) array of outer indices, -1 where no container qualifies
+    """
+    inner = np.asarray(inner, dtype=np.float32).reshape(-1, 4)
+    outer = np.asarray(outer, dtype=np.float32).reshape(-1, 4)
+    if not len(inner) or not len(outer):
+        return np.full(len(inner), -1, dtype=np.int64)
+
+    containment = containment_matrix(inner, outer)
+    # Overlapping vehicles can both contain a plate; IoU breaks the tie in
+    # favour of the tighter container
+    score = np.where(containment >= min_containment,
+                     containment + 1e-3 * iou_matrix(inner, outer), -1.0)
+    best = score.argmax(axis=1)
+    best[score[np.arange(len(inner)), best] < 0] = -1
+    return best
+
+
+def nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float = 0.45) -> np.ndarray:
+    """Greedy non-maximum suppression.
+
+    Args:
+        boxes: (N, 4) xyxy boxes
+        scores: (N,) box scores
+        iou_threshold: Boxes overlapping a kept box by more than this are suppressed
+
+    Returns:
+        Indices of kept boxes, highest score first
+    """
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    areas = box_areas(boxes)
+    order = np.argsort(scores)[::-1]
+    keep = []
+    while order.size:
+        best = order[0]
+        keep.append(best)
+        rest = order[1:]
+        x1 = np.maximum(boxes[best, 0], boxes[rest, 0])
+        y1 = np.maximum(boxes[best, 1], boxes[rest, 1])
+        x2 = np.minimum(boxes[best, 2], boxes[rest, 2])
+        y2 = np.minimum(boxes[best, 3], boxes[rest, 3])
+        inter = (x2 - x1).clip(0) * (y2 - y1).clip(0)
+        iou = inter / np.maximum(areas[best] + areas[rest] - inter, 1e-9)
+        order = rest[iou <= iou_threshold]
+    return np.array(keep, dtype=np.int64)
+
+
+def roi_polygon(roi) -> np.ndarray:
+    """ROI as (N, 2) polygon vertices; an (x1, y1, x2, y2) rectangle becomes its four corners."""
+    points = np.asarray(roi, dtype=np.float32)
+    if points.ndim == 1:
+        x1, y1, x2, y2 = points
+        return np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2]], dtype=np.float32)
+    return points.reshape(-1, 2)
+
+
+def polygon_bounds(points, shape: Tuple[int, ...]) -> Tuple[int, int, int, int]:
+    """Bounding rectangle of a polygon, clipped to an image.
+
+    Args:
+        points: (N, 2) polygon vertices in image coordinates
+        shape: Shape of the image, (height, width, ...)
+
+    Returns:
+        Integer (x1, y1, x2, y2) rectangle; empty if the polygon lies outside the image
+    """
+    points = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+    x1 = int(min(max(0, np.floor(points[:, 0].min())), shape[1]))
+    y1 = int(min(max(0, np.floor(points[:, 1].min())), shape[0]))
+    x2 = int(max(min(shape[1], np.ceil(points[:, 0].max())), x1))
+    y2 = int(max(min(shape[0], np.ceil(points[:, 1].max())), y1))
+    return x1, y1, x2, y2
+
+
+def polygon_mask(points, bounds: Tuple[int, int, int, int]) -> np.ndarray:
+    """Boolean mask of a polygon over the rectangle returned by polygon_bounds()."""
+    x1, y1, x2, y2 = bounds
+    mask = np.zeros((y2 - y1, x2 - x1), dtype=np.uint8)
+    points = np.asarray(points, dtype=np.float32).reshape(-1, 2) - (x1, y1)
+    cv2.fillPoly(mask, [np.round(points).astype(np.int32)], 1)
+    return mask.astype(bool)
+
+
+def centres_in_mask(boxes: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Whether the centre of each (N, 4) xyxy box falls on a set pixel of a mask in the same coordinates."""
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    if not mask.size:
+        return np.zeros(len(boxes), dtype=bool)
+    h, w = mask.shape[:2]
+    cx = ((boxes[:, 0] + boxes[:, 2]) / 2).astype(np.int64).clip(0, w - 1)
+    cy = ((boxes[:, 1] + boxes[:, 3]) / 2).astype(np.int64).clip(0, h - 1)
+    return mask[cy, cx]
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ============================================================================
+# Camera Manager Module
+# This module runs several camera sources against one shared ANPR backend,
+# batching frames from different cameras into a single inference call.
+# ============================================================================
+
+import time
+import logging
+from functools import partial
+from typing import Dict, Union
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from camera_thread import CameraThread
+from shared_inference import SharedInference
+
+
+class CameraManager(QObject):
+    """Owns one CameraThread per camera and a single shared inference worker."""
+
+    # Signals, all tagged with the camera ID
+    frame_ready = Signal(str, int, int)  # (camera_id, display_ring slot, sequence number)
+    results_ready = Signal(str, object)  # (camera_id, FrameResult)
+    metrics_ready = Signal(dict)
+    error = Signal(str, str)
+
+    def __init__(self, backend, max_batch: int = 8, metrics_interval_ms: int = 1000):
+        """Initialize the camera manager.
+
+        Args:
+            backend: ANPRBackend shared by all cameras
+            max_batch: Maximum number of camera frames per inference call
+            metrics_interval_ms: How often metrics_ready is emitted
+        """
+        super().__init__()
+        self.logger = logging.getLogger(__name__)
+        self.backend = backend
+        self.engine = SharedInference(backend, max_batch)
+        self.cameras: Dict[str, CameraThread] = {}
+
+        self._last_counts = {}
+        self._last_metrics_time = time.time()
+        self._metrics_timer = QTimer(self)
+        self._metrics_timer.setInterval(metrics_interval_ms)
+        self._metrics_timer.timeout.connect(self._emit_metrics)
+
+    def add_camera(self, camera_id: str, source: Union[int, str], **kwargs) -> CameraThread:
+        """Create a camera stream that uses the shared inference worker.
+
+        Args:
+            camera_id: Unique camera name
+            source: Camera source (device index or video file path)
+            **kwargs: Extra CameraThread settings
+        """
+        if camera_id in self.cameras:
+            raise ValueError(f"Camera already registered: {camera_id}")
+
+        thread = CameraThread(source, **kwargs)
+        thread.set_inference_engine(self.engine, camera_id)
+        thread.frame_ready.connect(partial(self.frame_ready.emit, camera_id))
+        thread.results_ready.connect(partial(self.results_ready.emit, camera_id))
+        thread.error.connect(partial(self.error.emit, camera_id))
+        self.cameras[camera_id] = thread
+        return thread
+
+    def remove_camera(self, camera_id: str):
+        """Stop and forget a camera."""
+        thread = self.cameras.pop(camera_id, None)
+        if thread is not None:
+            thread.stop()
+            self.engine.unregister(camera_id)
+            self._last_counts.pop(camera_id, None)
+
+    def start(self):
+        """Start the shared inference worker and every camera."""
+        self.engine.start()
+        for thread in self.cameras.values():
+            thread.start()
+        self._last_metrics_time = time.time()
+        self._metrics_timer.start()
+
+    def stop(self):
+        """Stop all cameras and the shared inference worker."""
+        self._metrics_timer.stop()
+        for thread in self.cameras.values():
+            thread.stop()
+        self.engine.stop()
+
+    def get_metrics(self) -> Dict:
+        """Per-camera and aggregate throughput since the previous call."""
+        now = time.time()
+        interval = max(now - self._last_metrics_time, 1e-6)
+        self._last_metrics_time = now
+        engine_metrics = self.engine.get_metrics()
+
+        cameras = {}
+        for camera_id, thread in self.cameras.items():
+            stats = thread.get_stats()
+            stream = engine_metrics['streams'].get(camera_id, {})
+            captured, processed = stats['frames_captured'], stats['frames_processed']
+            last_captured, last_processed = self._last_counts.get(camera_id, (0, 0))
+            self._last_counts[camera_id] = (captured, processed)
+
+            cameras[camera_id] = {
+                'display_fps': stats['fps'],
+                'capture_fps': (captured - last_captured) / interval,
+                'processed_fps': (processed - last_processed) / interval,
+                'frames_processed': processed,
+                'inference_dropped': stream.get('dropped', 0),
+                'render_dropped': stats['dropped']['render'],
+                'inference_ms': stream.get('inference_ms', 0.0),
+                'motion_score': stats['motion']['score'],
+                'frames_gated': stats['motion']['frames_gated'],
+                'cpu_saved_s': stats['motion']['cpu_saved_s'],
+                'stride': stats['stride']['stride'],
+                'stride_decision': stats['stride'].get('last_decision'),
+                'latency_ms': stats['stride'].get('latency_ms')
+            }
+
+        return {
+            'cameras': cameras,
+            'total_processed_fps': sum(c['processed_fps'] for c in cameras.values()),
+            'total_capture_fps': sum(c['capture_fps'] for c in cameras.values()),
+            'mean_batch_size': engine_metrics['mean_batch_size'],
+            'total_cpu_saved_s': sum(c['cpu_saved_s'] for c in cameras.values()),
+            'ocr_cache': self.backend.ocr_cache.stats() if self.backend.ocr_cache is not None else None
+        }
+
+    def _emit_metrics(self):
+        self.metrics_ready.emit(self.get_metrics())
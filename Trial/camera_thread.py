@@ -12,15 +12,42 @@ import numpy as np
 from PySide6.QtCore import QThread, Signal
 from PySide6.QtGui import QImage
 import time
+import threading
 from typing import Optional, Union, Dict
 import logging
 from pathlib import Path
 
+from frame_queue import FrameQueue
+from frame_ring import FrameRing
+from frame_result import FrameResult
+from pacing import FramePacer
+from box_utils import roi_polygon
+from motion_gate import MotionGate
+from stride_controller import StrideController
+
 class CameraThread(QThread):
-    """Thread for handling camera capture operations."""
+    """Thread for handling camera capture operations.
+    
+    Capture, ANPR inference and rendering run as three stages connected by
+    bounded queues, so a slow inference never stalls the camera: capture
+    runs at camera rate on a worker thread, inference consumes the freshest
+    frame on a second worker, and this QThread renders and emits frames.
+    
+    Frames live in preallocated rings owned by the thread: capture decodes
+    straight into capture_ring, render composes into display_ring, and
+    queues and signals carry only slot indices and sequence numbers.
+    
+    A displayed frame that is also being processed is held for up to one
+    frame interval for its own result; if the result is in time, the frame
+    is rendered from the backend's visualization frame with exactly its
+    detections. Frames are displayed at the backend's visualization scale,
+    so in two-resolution mode the display uses the downscaled frames.
+    """
     
     # Signals
-    frame_ready = Signal(np.ndarray)
+    frame_ready = Signal(int, int)  # (display_ring slot, frame sequence number)
+    results_ready = Signal(object)  # FrameResult
+    stats_ready = Signal(dict)
     error = Signal(str)
     
     def __init__(
@@ -28,7 +55,17 @@ class CameraThread(QThread):
         source: Union[int, str] = 0,
         fps: float = 30.0,
         frame_width: Optional[int] = None,
-        frame_height: Optional[int] = None
+        frame_height: Optional[int] = None,
+        inference_queue_size: int = 1,
+        inference_policy: str = 'latest_wins',
+        render_queue_size: int = 2,
+        render_policy: str = 'drop_oldest',
+        capture_mode: str = 'read',
+        display_fps: Optional[float] = None,
+        low_latency: bool = False,
+        motion_threshold: Optional[float] = None,
+        motion_hold: float = 2.0,
+        latency_budget: Optional[float] = None
     ):
         """Initialize camera thread.
         
@@ -37,6 +74,24 @@ class CameraThread(QThread):
             fps: Target frames per second
             frame_width: Target frame width (None for default)
             frame_height: Target frame height (None for default)
+            inference_queue_size: Capacity of the capture -> inference queue
+            inference_policy: Overflow policy of the inference queue
+            render_queue_size: Capacity of the capture -> render queue
+            render_policy: Overflow policy of the render queue
+            capture_mode: 'read' decodes every frame; 'grab' only grabs
+                frames that are neither processed nor displayed and calls
+                retrieve() for the rest
+            display_fps: Rate at which frames are displayed (None for every frame)
+            low_latency: For live sources, keep a one-frame capture buffer and
+                let the camera pace capture instead of the fps timer
+            motion_threshold: Enable the motion gate: frames whose motion
+                score (fraction of changed ROI pixels) is below this are not
+                sent to inference (None runs inference on every frame)
+            motion_hold: Seconds the last results stay drawn once the
+                motion gate starts skipping frames
+            latency_budget: Adapt the processing stride (skip_frames) to
+                keep capture-to-result latency under this many seconds
+                (None keeps the fixed stride)
         """
         super().__init__()
         self.logger = logging.getLogger(__name__)
@@ -46,6 +101,15 @@ class CameraThread(QThread):
         self.frame_width = frame_width
         self.frame_height = frame_height
         self.frame_delay = 1.0 / fps
+        self.target_fps = fps
+        if capture_mode not in ('read', 'grab'):
+            raise ValueError(f"Unknown capture mode: {capture_mode}")
+        self.capture_mode = capture_mode
+        self.display_fps = display_fps
+        self.low_latency = low_latency
+        self.frames_grabbed_only = 0
+        self._frame_shape = None
+        self._stop_event = threading.Event()
         
         self.running = False
         self.frame = None
@@ -56,22 +120,88 @@ class CameraThread(QThread):
         self.fps = 0
         self.last_fps_time = time.time()
         self.skip_frames = 2  # Process every nth frame
+        self._frames_since_process = 0
+        self.stride_controller = (
+            StrideController(latency_budget, initial_stride=self.skip_frames)
+            if latency_budget is not None else None
+        )
         
         # ANPR settings
         self.anpr_backend = None
+        self.inference_engine = None
+        self.camera_id = None
         self.roi_points = None
         self.draw_detections = True
+        
+        # Frame buffers: enough capture slots for every queued frame, one
+        # frame in each consumer and one being decoded
+        self.capture_ring = FrameRing(inference_queue_size + render_queue_size + 3)
+        self.display_ring = FrameRing(4)
+        
+        # Pipeline stages and the queues between them; dropped frames give
+        # their capture slot back
+        release = lambda item: self.capture_ring.unpin(item[2])
+        self.inference_queue = FrameQueue(inference_queue_size, inference_policy, on_drop=release)
+        self.render_queue = FrameQueue(render_queue_size, render_policy, on_drop=release)
+        self.result_queue = FrameQueue(1, 'latest_wins')
+        self._workers = []
+        self._last_results = None
+        self._viz_scale = 1.0
+        self.inference_time = 0.0
+        # Written by the inference stage and read by get_stats; the lock
+        # keeps the pair consistent for the mismatch check in the GUI
+        self._count_lock = threading.Lock()
+        self.frames_processed = 0
+        self.backend_inferences = 0
+        
+        # Motion gate: skip inference while the scene is static
+        self.motion_gate = None
+        self.motion_hold = motion_hold
+        self.set_motion_threshold(motion_threshold)
+        self._gated = False
+        self._last_results_time = 0.0
+        self._mean_inference_time = 0.0
     
     def set_anpr_backend(self, backend):
         """Set the ANPR backend processor."""
         self.anpr_backend = backend
+    
+    def set_inference_engine(self, engine, camera_id):
+        """Send frames to a SharedInference worker instead of a private inference stage.
+        
+        Args:
+            engine: SharedInference serving several cameras
+            camera_id: Identifier this camera's results are routed by
+        """
+        self.inference_engine = engine
+        self.camera_id = camera_id
+        engine.register(camera_id, self._on_shared_result,
+                        release=lambda item: self.capture_ring.unpin(item[2]))
         
     def set_roi(self, points):
-        """Set the region of interest for detection."""
+        """Set the region of interest for detection.
+        
+        Args:
+            points: Polygon vertices in frame coordinates, or an
+                (x1, y1, x2, y2) rectangle; None for the whole frame
+        """
         self.roi_points = points
     
+    def set_motion_threshold(self, threshold: Optional[float]):
+        """Set the motion gate sensitivity (None disables the gate).
+        
+        Args:
+            threshold: Motion score below which frames skip inference
+        """
+        if threshold is None:
+            self.motion_gate = None
+        elif self.motion_gate is None:
+            self.motion_gate = MotionGate(threshold)
+        else:
+            self.motion_gate.threshold = threshold
+    
     def run(self):
-        """Thread main loop."""
+        """Thread main loop: start the capture and inference stages, then render."""
         try:
             # Open video capture
             self._capture = cv2.VideoCapture(self.source)
@@ -85,58 +215,322 @@ class CameraThread(QThread):
             if self.frame_height is not None:
                 self._capture.set(cv2.CAP_PROP_FRAME_HEIGHT, self.frame_height)
             
+            # Keep the driver from queueing stale frames on live sources
+            if self.low_latency and self._is_live_source():
+                self._capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            
+            self._stop_event.clear()
             self.running = True
-            last_frame_time = 0
+            self._workers = [
+                threading.Thread(target=self._capture_loop, name='camera-capture', daemon=True)
+            ]
+            if self.inference_engine is None:
+                self._workers.append(
+                    threading.Thread(target=self._inference_loop, name='camera-inference', daemon=True)
+                )
+            for worker in self._workers:
+                worker.start()
             
-            while self.running:
-                # Control FPS
-                current_time = time.time()
-                elapsed = current_time - last_frame_time
-                
-                if elapsed < self.frame_delay:
-                    continue
-                
-                # Read frame
-                ret, frame = self._capture.read()
-                
-                if not ret or frame is None:
-                    self.error.emit("Failed to read frame from camera")
-                    continue
-                
-                # Update FPS
-                self.frame_count += 1
-                if self.frame_count % 30 == 0:
-                    current_time = time.time()
-                    self.fps = 30 / (current_time - self.last_fps_time)
-                    self.last_fps_time = current_time
-                
-                # Process frame with ANPR backend
-                if self.anpr_backend and self.frame_count % self.skip_frames == 0:
-                    try:
-                        # Run ANPR detection
-                        results = self.anpr_backend.process_frame(frame, self.roi_points)
-                        
-                        # Draw detections on frame
-                        frame = self._draw_detections(frame, results)
-                        
-                    except Exception as e:
-                        self.logger.error(f"ANPR processing error: {str(e)}")
-                
-                # Emit frame
-                self.frame = frame
-                self.frame_ready.emit(frame)
-                last_frame_time = current_time
+            self._render_loop()
             
         except Exception as e:
             self.logger.error(f"Camera thread error: {str(e)}")
             self.error.emit(str(e))
         
         finally:
+            self.running = False
+            for worker in self._workers:
+                worker.join()
+            self._workers = []
             self._cleanup()
     
+    def _is_live_source(self) -> bool:
+        """Whether the source is a camera or network stream rather than a file."""
+        if isinstance(self.source, int):
+            return True
+        return str(self.source).lower().startswith(('rtsp://', 'rtmp://', 'http://', 'https://'))
+    
+    def _capture_loop(self):
+        """Capture stage: read frames at camera rate and feed the other stages."""
+        # A live camera already delivers frames at its own rate; pacing it
+        # as well would only add latency in low-latency mode
+        live_paced = self.low_latency and self._is_live_source()
+        pacer = FramePacer(0 if live_paced else self.target_fps, self._stop_event)
+        display_pacer = FramePacer(self.display_fps or 0)
+        
+        while self.running:
+            # Sleep until the next frame deadline
+            current_time = pacer.wait()
+            if not self.running:
+                break
+            
+            if not self._capture.grab():
+                self.error.emit("Failed to read frame from camera")
+                continue
+            
+            self.frame_count += 1
+            has_inference = self.anpr_backend is not None or self.inference_engine is not None
+            # Counting from the last processed frame lets the stride change
+            # between any two frames
+            self._frames_since_process += 1
+            process = has_inference and self._frames_since_process >= self.skip_frames
+            if process:
+                self._frames_since_process = 0
+            display = display_pacer.due()
+            
+            # Frames nobody will look at are grabbed but never decoded
+            if self.capture_mode == 'grab' and not (process or display):
+                self.frames_grabbed_only += 1
+                continue
+            
+            slot = self._retrieve_into_ring()
+            if slot is None:
+                continue
+            
+            # Static scenes skip inference; an unpinned slot is simply reused
+            gate = self.motion_gate
+            if process and gate is not None:
+                process = gate.check(self.capture_ring.buffer(slot), self.roi_points)
+                self._gated = not process
+                if not (process or display):
+                    continue
+            
+            # One pin per consumer; each releases it when done with the frame
+            item = (self.frame_count, current_time, slot)
+            self.capture_ring.pin(slot, count=int(process) + int(display))
+            if process and self.inference_engine is not None:
+                self.inference_engine.submit(self.camera_id, item, self.capture_ring.buffer(slot), self.roi_points)
+            elif process:
+                self.inference_queue.put(item)
+            if display:
+                # The render stage waits briefly for the results of processed frames
+                self.render_queue.put(item + (process,))
+    
+    def _retrieve_into_ring(self) -> Optional[int]:
+        """Decode the grabbed frame directly into a free capture_ring slot."""
+        shape = self._frame_shape
+        slot = self.capture_ring.acquire(shape) if shape is not None else None
+        if shape is not None and slot is None:
+            self.logger.warning("All capture buffers are in use; dropping frame")
+            return None
+        
+        # The first frame reveals the frame size; after that, retrieve()
+        # decodes into the slot buffer without allocating
+        if slot is not None:
+            ret, frame = self._capture.retrieve(self.capture_ring.buffer(slot))
+        else:
+            ret, frame = self._capture.retrieve()
+        if not ret or frame is None:
+            self.error.emit("Failed to read frame from camera")
+            return None
+        
+        if slot is None or frame.shape != shape:
+            self._frame_shape = frame.shape
+            slot = self.capture_ring.acquire(frame.shape)
+            if slot is None:
+                return None
+            np.copyto(self.capture_ring.buffer(slot), frame)
+        
+        self.capture_ring.commit(slot, self.frame_count)
+        return slot
+    
+    def _inference_loop(self):
+        """Inference stage: run the ANPR backend on the freshest queued frame."""
+        while self.running:
+            item = self.inference_queue.get(timeout=0.1)
+            if item is None:
+                continue
+            
+            seq, timestamp, slot = item
+            if not self.anpr_backend:
+                self.capture_ring.unpin(slot)
+                continue
+            frame = self.capture_ring.buffer(slot)
+            try:
+                start = time.time()
+                calls_before = self.anpr_backend.stage_calls['frame']
+                results, viz_frame = self.anpr_backend.process_frame(frame, self.roi_points)
+                self.inference_time = time.time() - start
+                self._update_mean_inference_time()
+                inferences = self.anpr_backend.stage_calls['frame'] - calls_before
+                self._publish_result(seq, timestamp, results, self.inference_time, inferences, viz_frame)
+            except Exception as e:
+                self.logger.error(f"ANPR processing error: {str(e)}")
+            finally:
+                self.capture_ring.unpin(slot)
+    
+    def _on_shared_result(self, item, results: Optional[Dict], inference_time: float):
+        """Receive this camera's result from the shared inference worker."""
+        seq, timestamp, slot = item
+        self.capture_ring.unpin(slot)
+        if results is None:
+            return
+        self.inference_time = inference_time
+        self._update_mean_inference_time()
+        self._publish_result(seq, timestamp, results, inference_time, 1)
+    
+    def _update_mean_inference_time(self):
+        """Running mean of the inference time, used to estimate the CPU the motion gate saves."""
+        if self._mean_inference_time:
+            self._mean_inference_time += 0.1 * (self.inference_time - self._mean_inference_time)
+        else:
+            self._mean_inference_time = self.inference_time
+    
+    def _publish_result(
+        self,
+        seq: int,
+        timestamp: float,
+        results: Dict,
+        inference_time: float,
+        inferences: int,
+        viz_frame: Optional[np.ndarray] = None
+    ):
+        """Hand a processed frame's results to the render stage and the GUI.
+        
+        Args:
+            seq: Sequence number of the processed frame
+            timestamp: Capture time of the frame
+            results: Backend results for the frame
+            inference_time: Seconds spent in the backend
+            inferences: Backend frame calls made to produce the results
+            viz_frame: The backend's visualization frame, at results['viz_scale']
+                (None if the backend did not return one)
+        """
+        with self._count_lock:
+            self.frames_processed += 1
+            self.backend_inferences += inferences
+        if self.stride_controller is not None:
+            latency = time.perf_counter() - timestamp
+            self.skip_frames = self.stride_controller.update(latency, inference_time, self.frame_delay, timestamp)
+        result = FrameResult(seq, timestamp, results['vehicles'], inference_time)
+        self.result_queue.put((result, viz_frame, results.get('viz_scale', 1.0)))
+        self.results_ready.emit(result)
+    
+    def _wait_for_result(self, seq: int):
+        """Newest queued (result, viz frame, scale), waiting up to one frame interval for frame seq's."""
+        deadline = time.perf_counter() + self.frame_delay
+        latest = None
+        while True:
+            queued = self.result_queue.get(timeout=max(0.0, deadline - time.perf_counter()))
+            if queued is None:
+                return latest
+            latest = queued
+            if queued[0].seq >= seq:
+                return latest
+    
+    def _render_loop(self):
+        """Render stage: draw the latest results on each captured frame and emit it."""
+        rendered = 0
+        
+        while self.running:
+            item = self.render_queue.get(timeout=0.1)
+            if item is None:
+                continue
+            
+            seq, _, slot, processed = item
+            latest = self._wait_for_result(seq) if processed else self.result_queue.get_nowait()
+            viz_frame = None
+            if latest is not None:
+                result, viz_frame, self._viz_scale = latest
+                self._last_results = {'vehicles': result.vehicles}
+                self._last_results_time = time.time()
+                if result.seq != seq:
+                    viz_frame = None
+            elif (self._gated and self._last_results is not None and
+                  time.time() - self._last_results_time > self.motion_hold):
+                # Nothing has moved for a while: stop drawing stale detections
+                self._last_results = None
+            
+            # Update FPS
+            rendered += 1
+            if rendered % 30 == 0:
+                current_time = time.time()
+                self.fps = 30 / (current_time - self.last_fps_time)
+                self.last_fps_time = current_time
+                self.stats_ready.emit(self.get_stats())
+            
+            # Compose into a display slot: the inference stage may still be
+            # reading the capture slot, so drawing happens on the copy. The
+            # frame just processed is taken from the backend's visualization
+            # frame; others are scaled to match it
+            source = self.capture_ring.buffer(slot)
+            scale = self._viz_scale
+            if viz_frame is not None:
+                shape = viz_frame.shape
+            elif scale != 1.0:
+                h, w = source.shape[:2]
+                shape = (max(1, round(h * scale)), max(1, round(w * scale))) + source.shape[2:]
+            else:
+                shape = source.shape
+            display_slot = self.display_ring.acquire(shape)
+            if display_slot is None:
+                self.capture_ring.unpin(slot)
+                continue
+            frame = self.display_ring.buffer(display_slot)
+            if viz_frame is not None:
+                np.copyto(frame, viz_frame)
+            elif shape != source.shape:
+                cv2.resize(source, (shape[1], shape[0]), dst=frame, interpolation=cv2.INTER_AREA)
+            else:
+                np.copyto(frame, source)
+            self.capture_ring.unpin(slot)
+            
+            if self._last_results is not None and self.draw_detections:
+                self._draw_detections(frame, self._last_results, scale)
+            self._draw_overlay(frame)
+            
+            # Emit the slot; the receiver reads the buffer in place
+            self.display_ring.commit(display_slot, seq)
+            self.frame = frame
+            self.frame_ready.emit(display_slot, seq)
+    
+    def get_stats(self) -> Dict:
+        """Per-stage queue depth, drop counts and timings."""
+        with self._count_lock:
+            frames_processed, backend_inferences = self.frames_processed, self.backend_inferences
+        return {
+            'fps': self.fps,
+            'frames_captured': self.frame_count,
+            'frames_grabbed_only': self.frames_grabbed_only,
+            'inference_ms': self.inference_time * 1000,
+            'frames_processed': frames_processed,
+            'backend_inferences': backend_inferences,
+            'motion': self._motion_stats(),
+            'stride': self._stride_stats(),
+            'queue_depth': {
+                'inference': self.inference_queue.qsize(),
+                'render': self.render_queue.qsize()
+            },
+            'buffer_allocations': self.capture_ring.allocations + self.display_ring.allocations,
+            'dropped': {
+                'inference': self.inference_queue.dropped,
+                'render': self.render_queue.dropped
+            }
+        }
+    
+    def _stride_stats(self) -> Dict:
+        """Processing stride and, with a latency budget, the controller's state."""
+        if self.stride_controller is None:
+            return {'adaptive': False, 'stride': self.skip_frames}
+        return {'adaptive': True, **self.stride_controller.stats()}
+    
+    def _motion_stats(self) -> Dict:
+        """Motion score, gated-frame count and the inference time the gate saved."""
+        gate = self.motion_gate
+        if gate is None:
+            return {'enabled': False, 'score': 0.0, 'frames_gated': 0, 'cpu_saved_s': 0.0}
+        saved = gate.frames_gated * self._mean_inference_time - gate.gate_time
+        return {
+            'enabled': True,
+            'score': gate.score,
+            'frames_gated': gate.frames_gated,
+            'cpu_saved_s': max(0.0, saved)
+        }
+    
     def stop(self):
         """Stop the camera thread."""
         self.running = False
+        self._stop_event.set()
         self.wait()
     
     def _cleanup(self):
@@ -144,21 +538,31 @@ class CameraThread(QThread):
         if self._capture is not None:
             self._capture.release()
             self._capture = None
+        for queue in (self.inference_queue, self.render_queue, self.result_queue):
+            queue.clear()
+        self.capture_ring.reset()
+        self.display_ring.reset()
+        self._last_results = None
+        self._viz_scale = 1.0
+        self._gated = False
+        if self.motion_gate is not None:
+            self.motion_gate.reset()
         self.frame = None
         self.running = False
     
-    def _draw_detections(self, frame: np.ndarray, results: Dict) -> np.ndarray:
-        """Draw detection results on the frame."""
+    def _draw_detections(self, frame: np.ndarray, results: Dict, scale: float = 1.0) -> np.ndarray:
+        """Draw detection results on a frame displayed at `scale` times the captured size."""
         try:
             # Draw ROI if set
             if self.roi_points is not None:
-                cv2.polylines(frame, [np.array(self.roi_points)], True, (0, 255, 0), 2)
+                polygon = roi_polygon(self.roi_points) * scale
+                cv2.polylines(frame, [polygon.astype(np.int32)], True, (0, 255, 0), 2)
             
             # Draw vehicle detections
             for vehicle in results.get('vehicles', []):
-                # Get bounding box
+                # Get bounding box, scaled from frame to display pixels
                 bbox = vehicle['bbox']
-                x1, y1, x2, y2 = map(int, bbox)
+                x1, y1, x2, y2 = (int(c * scale) for c in bbox)
                 
                 # Draw vehicle box
                 color = (0, 255, 0)  # Green for vehicles
@@ -172,7 +576,7 @@ class CameraThread(QThread):
                 # Draw plate detections
                 for plate in vehicle.get('plates', []):
                     # Get plate bbox relative to vehicle crop
-                    px1, py1, px2, py2 = map(int, plate['bbox'])
+                    px1, py1, px2, py2 = (int(c * scale) for c in plate['bbox'])
                     px1, py1 = px1 + x1, py1 + y1
                     px2, py2 = px2 + x1, py2 + y1
                     
@@ -185,12 +589,20 @@ class CameraThread(QThread):
                         cv2.putText(frame, text, (px1, py2+20),
                                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 2)
             
-            # Draw FPS
-            cv2.putText(frame, f"FPS: {self.fps:.1f}", (10, 30),
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-            
             return frame
             
         except Exception as e:
             self.logger.error(f"Error drawing detections: {str(e)}")
-            return frame 
\ No newline at end of file
+            return frame
+    
+    def _draw_overlay(self, frame: np.ndarray):
+        """Draw the display FPS and the processing stride, whether or not there are detections."""
+        cv2.putText(frame, f"FPS: {self.fps:.1f}", (10, 30),
+                   cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+        stride_text = f"Stride: {self.skip_frames}"
+        if self.stride_controller is not None:
+            controller = self.stride_controller
+            stride_text += (f" ({controller.last_decision}, {controller.latency * 1000:.0f}/"
+                            f"{controller.budget * 1000:.0f} ms)")
+        cv2.putText(frame, stride_text, (10, 60),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2) 
\ No newline at end of file
@@ -0,0 +1,77 @@
+# Bounded, thread-safe queue connecting the stages of the camera pipeline
+import threading
+from collections import deque
+from typing import Any, Callable, Optional
+
+
+class FrameQueue:
+    """Bounded queue that never blocks the producer.
+
+    When the queue is full the overflow policy decides what is lost:
+    'drop_oldest' discards the oldest queued item, 'latest_wins' keeps only
+    the newest item so the consumer always sees the freshest frame.
+    """
+
+    POLICIES = ('drop_oldest', 'latest_wins')
+
+    def __init__(
+        self,
+        maxsize: int = 2,
+        policy: str = 'drop_oldest',
+        on_drop: Optional[Callable[[Any], None]] = None
+    ):
+        """Initialize the queue.
+
+        Args:
+            maxsize: Maximum number of queued items (ignored for 'latest_wins')
+            policy: Overflow policy, one of POLICIES
+            on_drop: Called with every item discarded by the overflow policy
+                or by clear(), e.g. to release a frame buffer
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.policy = policy
+        self.maxsize = 1 if policy == 'latest_wins' else maxsize
+        self.dropped = 0
+        self.on_drop = on_drop
+        self._items = deque()
+        self._cond = threading.Condition()
+
+    def put(self, item: Any):
+        """Add an item, dropping according to the overflow policy."""
+        with self._cond:
+            while len(self._items) >= self.maxsize:
+                dropped = self._items.popleft()
+                self.dropped += 1
+                if self.on_drop is not None:
+                    self.on_drop(dropped)
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """Remove and return the oldest item, or None if the timeout expires."""
+        with self._cond:
+            if not self._items and not self._cond.wait_for(lambda: self._items, timeout):
+                return None
+            return self._items.popleft()
+
+    def get_nowait(self) -> Optional[Any]:
+        """Remove and return the oldest item, or None if the queue is empty."""
+        with self._cond:
+            return self._items.popleft() if self._items else None
+
+    def clear(self):
+        """Discard all queued items without counting them as drops."""
+        with self._cond:
+            if self.on_drop is not None:
+                for item in self._items:
+                    self.on_drop(item)
+            self._items.clear()
+
+    def qsize(self) -> int:
+        """Number of queued items."""
+        with self._cond:
+            return len(self._items)
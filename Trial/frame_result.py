@@ -0,0 +1,17 @@
+# Compact per-frame detection result passed from the camera pipeline to the GUI
+from typing import Dict, List, NamedTuple
+
+
+class FrameResult(NamedTuple):
+    """ANPR output for one processed frame.
+
+    Attributes:
+        seq: Sequence number of the frame within its stream
+        timestamp: Capture time of the frame (time.perf_counter clock)
+        vehicles: Vehicle results as returned by ANPRBackend.process_frame
+        inference_time: Seconds spent in the backend for this frame
+    """
+    seq: int
+    timestamp: float
+    vehicles: List[Dict]
+    inference_time: float
@@ -0,0 +1,95 @@
+# Preallocated ring of frame buffers shared between pipeline stages
+import threading
+import numpy as np
+from typing import Optional, Tuple
+
+
+class FrameRing:
+    """Fixed set of reusable frame buffers addressed by slot index.
+
+    Writers acquire a free slot, fill its buffer in place and commit it with
+    a sequence number. Readers pin a slot while they use its buffer, which
+    keeps writers from reusing it; pinning with an expected sequence number
+    fails if the slot has been recycled since it was announced.
+    """
+
+    def __init__(self, num_slots: int = 4):
+        """Initialize the ring.
+
+        Args:
+            num_slots: Number of frame buffers; must exceed the number of
+                frames that can be in flight at once
+        """
+        if num_slots < 2:
+            raise ValueError("A frame ring needs at least two slots")
+        self.num_slots = num_slots
+        self._buffers = [None] * num_slots
+        self._seqs = [-1] * num_slots
+        self._pins = [0] * num_slots
+        self._next = 0
+        self._lock = threading.Lock()
+
+        # Number of buffer (re)allocations, for allocation benchmarks
+        self.allocations = 0
+
+    def acquire(self, shape: Tuple[int, ...], dtype=np.uint8) -> Optional[int]:
+        """Claim the next unpinned slot for writing, (re)allocating it if needed.
+
+        Returns:
+            Slot index, or None if every slot is pinned
+        """
+        with self._lock:
+            for offset in range(self.num_slots):
+                slot = (self._next + offset) % self.num_slots
+                if self._pins[slot]:
+                    continue
+                buffer = self._buffers[slot]
+                if buffer is None or buffer.shape != tuple(shape) or buffer.dtype != dtype:
+                    self._buffers[slot] = np.empty(shape, dtype=dtype)
+                    self.allocations += 1
+                self._seqs[slot] = -1
+                self._next = (slot + 1) % self.num_slots
+                return slot
+        return None
+
+    def buffer(self, slot: int) -> np.ndarray:
+        """The frame buffer behind a slot."""
+        return self._buffers[slot]
+
+    def commit(self, slot: int, seq: int):
+        """Publish a written slot under its frame sequence number."""
+        with self._lock:
+            self._seqs[slot] = seq
+
+    def seq(self, slot: int) -> int:
+        """Sequence number currently held by a slot (-1 while being written)."""
+        return self._seqs[slot]
+
+    def pin(self, slot: int, expected_seq: Optional[int] = None, count: int = 1) -> bool:
+        """Keep a slot from being reused.
+
+        Args:
+            slot: Slot index
+            expected_seq: If given, only pin while the slot still holds this frame
+            count: Number of pins to add (one per pending consumer)
+
+        Returns:
+            True if the slot was pinned
+        """
+        with self._lock:
+            if expected_seq is not None and self._seqs[slot] != expected_seq:
+                return False
+            self._pins[slot] += count
+            return True
+
+    def unpin(self, slot: int):
+        """Release one pin on a slot."""
+        with self._lock:
+            if self._pins[slot]:
+                self._pins[slot] -= 1
+
+    def reset(self):
+        """Release all pins and forget published frames (buffers are kept)."""
+        with self._lock:
+            self._pins = [0] * self.num_slots
+            self._seqs = [-1] * self.num_slots
@@ -53,13 +53,19 @@ def calculate_accuracy(predictions, ground_truth):
         "total_characters": total_characters
     }
 
-def evaluate_model(label_file_path, output_file=None):
+def evaluate_model(label_file_path, output_file=None, variant_order=None, early_exit=True,
+                   exit_confidence=0.5, learn_order=False):
     """
     Evaluate the ANPR model on the dataset.
     
     Args:
         label_file_path: Path to the label file
         output_file: Path to save the evaluation results
+        variant_order: Order of the OCR image variants (default ANPRModel.OCR_VARIANTS)
+        early_exit: Stop the OCR cascade at the first confident, pattern-valid read
+        exit_confidence: OCR confidence needed to stop early
+        learn_order: Read every variant of every image and report the variant
+            order learned from how often each one was good enough to stop on
         
     Returns:
         Dictionary containing evaluation results
@@ -72,13 +78,16 @@ def evaluate_model(label_file_path, output_file=None):
         print("No data loaded from the dataset")
         return {}
     
-    # Initialize model
-    model = ANPRModel()
+    # Initialize model; the dataset images are plate crops, so the text
+    # detector can be skipped
+    model = ANPRModel(ocr_mode='recognize', variant_order=variant_order, early_exit=early_exit and not learn_order,
+                      exit_confidence=exit_confidence)
     
     # Process each image
     predictions = []
     ground_truth = []
     confidences = []
+    ocr_calls = []
     failed_images = []
     
     print(f"Evaluating model on {len(data)} images...")
@@ -99,13 +108,20 @@ def evaluate_model(label_file_path, output_file=None):
         predictions.append(result["plate_text"])
         ground_truth.append(label)
         confidences.append(result["confidence"])
+        ocr_calls.append(result["ocr_calls"])
     
     # Calculate accuracy
     accuracy = calculate_accuracy(predictions, ground_truth)
     
+    average_ocr_calls = float(np.mean(ocr_calls)) if ocr_calls else 0.0
+    learned_order = model.learned_variant_order() if learn_order else None
+    
     # Prepare results
     results = {
         "accuracy": accuracy,
+        "average_ocr_calls": average_ocr_calls,
+        "variant_stats": model.variant_stats,
+        "learned_variant_order": learned_order,
         "failed_images": failed_images,
         "predictions": list(zip(ground_truth, predictions, confidences))
     }
@@ -114,6 +130,12 @@ def evaluate_model(label_file_path, output_file=None):
     print(f"\nEvaluation Results:")
     print(f"Exact Match Accuracy: {accuracy['exact_accuracy']:.4f} ({accuracy['correct']}/{accuracy['total']})")
     print(f"Character-level Accuracy: {accuracy['character_accuracy']:.4f} ({accuracy['character_correct']}/{accuracy['total_characters']})")
+    print(f"Average OCR calls per image: {average_ocr_calls:.2f} (order: {','.join(model.variant_order)}, "
+          f"early exit: {'on' if model.early_exit else 'off'})")
+    for variant, stats in model.variant_stats.items():
+        print(f"  {variant:<10} calls: {stats['calls']:<6} confident plates: {stats['hits']}")
+    if learned_order:
+        print(f"Learned variant order: {','.join(learned_order)}")
     print(f"Failed to load {len(failed_images)} images")
     
     # Save results to file if specified
@@ -122,6 +144,9 @@ def evaluate_model(label_file_path, output_file=None):
             f.write(f"Evaluation Results:\n")
             f.write(f"Exact Match Accuracy: {accuracy['exact_accuracy']:.4f} ({accuracy['correct']}/{accuracy['total']})\n")
             f.write(f"Character-level Accuracy: {accuracy['character_accuracy']:.4f} ({accuracy['character_correct']}/{accuracy['total_characters']})\n")
+            f.write(f"Average OCR calls per image: {average_ocr_calls:.2f}\n")
+            if learned_order:
+                f.write(f"Learned variant order: {','.join(learned_order)}\n")
             f.write(f"Failed to load {len(failed_images)} images\n\n")
             
             f.write(f"Detailed Results:\n")
@@ -135,9 +160,18 @@ def main():
     parser = argparse.ArgumentParser(description='Evaluate ANPR model on dataset')
     parser.add_argument('--label_file', type=str, required=True, help='Path to the label file')
     parser.add_argument('--output', type=str, help='Path to save the evaluation results')
+    parser.add_argument('--variant_order', type=str,
+                        help='Comma-separated OCR variant order, e.g. ' + ','.join(ANPRModel.OCR_VARIANTS))
+    parser.add_argument('--no_early_exit', action='store_true', help='Read every OCR variant of every image')
+    parser.add_argument('--exit_confidence', type=float, default=0.5, help='OCR confidence needed to stop early')
+    parser.add_argument('--learn_order', action='store_true',
+                        help='Read every variant and report the learned variant order')
     args = parser.parse_args()
     
-    evaluate_model(args.label_file, args.output)
+    variant_order = args.variant_order.split(',') if args.variant_order else None
+    evaluate_model(args.label_file, args.output, variant_order=variant_order,
+                   early_exit=not args.no_early_exit, exit_confidence=args.exit_confidence,
+                   learn_order=args.learn_order)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
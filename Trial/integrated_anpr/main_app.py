@@ -51,8 +51,10 @@ class ANPRApp(QMainWindow):
             }
         """)
         
-        # Initialize model
-        self.model = ANPRModel()
+        # Initialize model. This window feeds whole frames, so OCR has to
+        # find the plate with the text detector, and there is no OCR cache:
+        # a fixed camera's frames hash alike whichever vehicle is in view
+        self.model = ANPRModel(ocr_mode='readtext')
         
         # Initialize video capture
         self.cap = None
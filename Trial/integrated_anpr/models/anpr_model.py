@@ -1,18 +1,71 @@
 import cv2
 import numpy as np
-import easyocr
 import re
 import os
+import sys
 import time
 from typing import Dict, List, Tuple, Optional
 
+# The shared model registry lives at the root of the Trial directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from model_registry import acquire_easyocr, release
+from plate_ocr import recognize_plate_crop
+from ocr_cache import OCRCache
+
 class ANPRModel:
-    def __init__(self):
+    OCR_MODES = ('recognize', 'readtext')
+    
+    # Image variants OCR can be run on, cheapest to prepare first
+    OCR_VARIANTS = ('original', 'gray', 'processed')
+    
+    def __init__(
+        self,
+        ocr_mode: str = 'readtext',
+        variant_order: Optional[List[str]] = None,
+        early_exit: bool = True,
+        exit_confidence: float = 0.5,
+        ocr_cache: Optional[OCRCache] = None
+    ):
         """
         Initialize the ANPR model with EasyOCR for text recognition.
+        
+        Args:
+            ocr_mode: 'readtext' runs EasyOCR's text detector before the
+                recognizer, so the plate can be anywhere in the image;
+                'recognize' skips the detector and is only valid when every
+                image is a tight plate crop
+            variant_order: Order in which the image variants are read
+                (default OCR_VARIANTS); see learned_variant_order
+            early_exit: Stop at the first variant that yields a plate matching
+                the plate pattern with at least exit_confidence
+            exit_confidence: OCR confidence needed to stop early
+            ocr_cache: Optional cache that returns the previous result for
+                images that look like one already recognized; only use it
+                when the images are tight plate crops, since whole frames
+                from a fixed camera hash alike whichever vehicle is in view
         """
-        # Initialize EasyOCR with English language
-        self.reader = easyocr.Reader(['en'], gpu=False)
+        if ocr_mode not in self.OCR_MODES:
+            raise ValueError(f"Unknown OCR mode: {ocr_mode}")
+        self.ocr_mode = ocr_mode
+        
+        variant_order = list(variant_order or self.OCR_VARIANTS)
+        unknown = set(variant_order) - set(self.OCR_VARIANTS)
+        if unknown:
+            raise ValueError(f"Unknown OCR variants: {sorted(unknown)}")
+        self.variant_order = variant_order
+        self.early_exit = early_exit
+        self.exit_confidence = exit_confidence
+        self.ocr_cache = ocr_cache
+        
+        # Per-variant counts of OCR calls and of reads that were good enough
+        # to stop on, and the number of OCR calls made by the last image
+        self.variant_stats = {variant: {"calls": 0, "hits": 0} for variant in self.OCR_VARIANTS}
+        self.last_ocr_calls = 0
+        
+        # Initialize EasyOCR with English language (shared with other
+        # pipelines in this process)
+        self.reader = acquire_easyocr(['en'], gpu=False)
         
         # Define preprocessing parameters
         self.resize_width = 640
@@ -35,6 +88,14 @@ class ANPRModel:
         # Examples: MH02BH1234, AP07BP3220, KA01AB1234
         self.plate_pattern = r'^[A-Z]{2}\d{1,2}[A-Z]{1,2}\d{1,4}[A-Z]?$'
         
+    def close(self):
+        """
+        Give the shared OCR reader back to the model registry.
+        """
+        if self.reader is not None:
+            release(self.reader)
+            self.reader = None
+        
     def preprocess_image(self, image: np.ndarray, resize_width: int = None) -> Tuple[np.ndarray, np.ndarray]:
         """
         Preprocess the image for better OCR results.
@@ -46,6 +107,20 @@ class ANPRModel:
         Returns:
             Tuple of (preprocessed image, resized original image)
         """
+        img_resized = self._resize(image, resize_width)
+        return self._enhance(img_resized), img_resized
+    
+    def _resize(self, image: np.ndarray, resize_width: int = None) -> np.ndarray:
+        """
+        Resize the image to the OCR width, maintaining its aspect ratio.
+        
+        Args:
+            image: Input image
+            resize_width: Optional width to resize the image to
+            
+        Returns:
+            Resized image
+        """
         # Use provided resize width or default
         width = resize_width if resize_width else self.resize_width
         
@@ -54,10 +129,20 @@ class ANPRModel:
         aspect_ratio = h / w
         new_width = width
         new_height = int(aspect_ratio * new_width)
-        img_resized = cv2.resize(image, (new_width, new_height))
+        return cv2.resize(image, (new_width, new_height))
+    
+    def _enhance(self, img_resized: np.ndarray) -> np.ndarray:
+        """
+        Denoise, threshold and contrast-enhance a resized image.
         
+        Args:
+            img_resized: Image returned by _resize
+            
+        Returns:
+            Preprocessed grayscale image
+        """
         # Convert to grayscale
-        gray = cv2.cvtColor(img_resized, cv2.COLOR_BGR2GRAY)
+        gray = cv2.cvtColor(img_resized, cv2.COLOR_BGR2GRAY) if len(img_resized.shape) == 3 else img_resized
         
         # Apply bilateral filter to remove noise while keeping edges sharp
         filtered = cv2.bilateralFilter(gray, 11, 17, 17)
@@ -78,56 +163,120 @@ class ANPRModel:
         clahe_img = clahe.apply(filtered)
         
         # Combine the results
-        combined = cv2.bitwise_or(morph, clahe_img)
-        
-        return combined, img_resized
+        return cv2.bitwise_or(morph, clahe_img)
     
-    def recognize_plate(self, image: np.ndarray) -> Tuple[str, float]:
+    def _variant_image(self, variant: str, resized: np.ndarray) -> np.ndarray:
         """
-        Recognize license plate text from the image.
+        Build one OCR image variant from the resized input.
         
         Args:
-            image: Input image
+            variant: One of OCR_VARIANTS
+            resized: Image returned by _resize
             
         Returns:
-            Tuple of (recognized text, confidence)
+            Image to run OCR on
         """
-        # Try different preprocessing approaches
-        processed_img, resized = self.preprocess_image(image)
+        if variant == 'processed':
+            return self._enhance(resized)
+        if variant == 'gray':
+            return cv2.cvtColor(resized, cv2.COLOR_BGR2GRAY) if len(resized.shape) == 3 else resized
+        return resized
+    
+    def _read_text(self, image: np.ndarray) -> List[Tuple]:
+        """
+        Run OCR on one image variant.
         
-        # Use EasyOCR to recognize text on processed image
-        results_processed = self.reader.readtext(processed_img)
+        Args:
+            image: Plate image (colour, grayscale or binary)
+            
+        Returns:
+            List of (bbox, text, confidence) like EasyOCR's readtext
+        """
+        if self.ocr_mode == 'readtext':
+            return self.reader.readtext(image)
         
-        # Also try with the original resized image
-        results_original = self.reader.readtext(resized)
+        # The input is already a plate, so skip text detection
+        text, conf = recognize_plate_crop(self.reader, image)
+        return [(None, text, conf)] if text else []
+    
+    def recognize_plate(self, image: np.ndarray) -> Tuple[str, float]:
+        """
+        Recognize license plate text from the image.
         
-        # Try with grayscale version of original
-        gray = cv2.cvtColor(resized, cv2.COLOR_BGR2GRAY) if len(resized.shape) == 3 else resized
-        results_gray = self.reader.readtext(gray)
+        The image variants are read in variant_order. With early_exit, the
+        cascade stops at the first read whose post-processed text matches the
+        plate pattern with at least exit_confidence; otherwise every variant
+        is read and the most confident candidate wins.
         
-        # Combine all results
-        all_results = results_processed + results_original + results_gray
+        With an ocr_cache, images that look like a recently recognized one
+        reuse its result without any OCR call.
         
-        if not all_results:
-            return "", 0.0
+        Args:
+            image: Input image
+            
+        Returns:
+            Tuple of (recognized text, confidence)
+        """
+        self.last_ocr_calls = 0
+        if self.ocr_cache is not None:
+            return self.ocr_cache.cached(image, self._recognize_plate)
+        return self._recognize_plate(image)
+    
+    def _recognize_plate(self, image: np.ndarray) -> Tuple[str, float]:
+        """
+        Run the variant cascade of recognize_plate on an image.
+        """
+        resized = self._resize(image)
         
-        # Process all results and find the best match
         candidates = []
-        for bbox, text, conf in all_results:
-            processed_text = self._post_process_text(text)
-            if processed_text:  # Only consider non-empty processed text
-                candidates.append((processed_text, conf))
-        
-        # Sort by confidence
-        candidates.sort(key=lambda x: x[1], reverse=True)
-        
-        # Return the best candidate
+        read = set()
+        for variant in self.variant_order:
+            # The recognizer reads colour input as grayscale, so in recognize
+            # mode the gray variant repeats the original one
+            if self.ocr_mode == 'recognize' and variant in ('original', 'gray') and read & {'original', 'gray'}:
+                continue
+            read.add(variant)
+            
+            results = self._read_text(self._variant_image(variant, resized))
+            self.last_ocr_calls += 1
+            self.variant_stats[variant]["calls"] += 1
+            
+            hit = False
+            for bbox, text, conf in results:
+                processed_text = self._post_process_text(text)
+                if processed_text:  # Only consider non-empty processed text
+                    candidates.append((processed_text, conf))
+                    if conf >= self.exit_confidence and re.match(self.plate_pattern, processed_text):
+                        hit = True
+            if hit:
+                self.variant_stats[variant]["hits"] += 1
+                if self.early_exit:
+                    break
+        
+        # Return the most confident candidate
         if candidates:
-            best_text, best_conf = candidates[0]
-            return best_text, best_conf
+            return max(candidates, key=lambda x: x[1])
         
         return "", 0.0
     
+    def learned_variant_order(self) -> List[str]:
+        """
+        Order the image variants by how often a read of them was good enough
+        to stop on, as counted in variant_stats.
+        
+        Collect the statistics with early_exit disabled (every variant read
+        for every image), e.g. with evaluate_model.py --learn_order, and pass
+        the result as variant_order.
+        
+        Returns:
+            Variant names, most successful first; ties keep OCR_VARIANTS order
+        """
+        def hit_rate(variant):
+            stats = self.variant_stats[variant]
+            return stats["hits"] / stats["calls"] if stats["calls"] else 0.0
+        
+        return sorted(self.OCR_VARIANTS, key=hit_rate, reverse=True)
+    
     def _post_process_text(self, text: str) -> str:
         """
         Post-process the recognized text to correct common OCR errors.
@@ -221,7 +370,8 @@ class ANPRModel:
                 "plate_text": "", 
                 "confidence": 0.0, 
                 "processing_time": 0.0,
-                "success": False
+                "success": False,
+                "ocr_calls": 0
             }
         
         # Start timing
@@ -257,5 +407,6 @@ class ANPRModel:
             "confidence": confidence,
             "processing_time": processing_time,
             "result_image": result_image,
-            "success": bool(plate_text)
+            "success": bool(plate_text),
+            "ocr_calls": self.last_ocr_calls
         }
\ No newline at end of file
@@ -1,30 +1,50 @@
+import os
+import sys
 from typing import List, Tuple, Optional
 import numpy as np
-from ultralytics import YOLO
-import easyocr
 from ..utils.image_processing import extract_plate_region
 
+# The inference engines and model registry live at the root of the Trial directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from model_registry import acquire_easyocr, acquire_yolo, release
+
 class ModelHandler:
-    def __init__(self):
-        """Initialize YOLO and OCR models."""
+    def __init__(self, engine: Optional[str] = None, device: str = 'cpu'):
+        """
+        Initialize YOLO and OCR models.
+        
+        Args:
+            engine: 'torch', 'onnxruntime' or 'openvino' (None picks from device)
+            device: Torch device, or an engine name used as a device
+        """
         # Load YOLOv8 model trained on vehicles
-        self.yolo_model = YOLO('yolov8n.pt')
+        self.yolo_model = acquire_yolo('yolov8n.pt', engine, device)
         # Initialize EasyOCR with English language
-        self.reader = easyocr.Reader(['en'])
+        self.reader = acquire_easyocr(['en'], gpu=True)
+        
+    def close(self):
+        """
+        Give the shared models back to the model registry.
+        """
+        for model in (self.yolo_model, self.reader):
+            if model is not None:
+                release(model)
+        self.yolo_model = self.reader = None
         
     def detect_vehicles(self, image: np.ndarray) -> List[Tuple[int, int, int, int]]:
         """
         Detect vehicles in image using YOLO.
         Returns list of bounding boxes (x1, y1, x2, y2).
         """
-        results = self.yolo_model(image)
+        results = self.yolo_model.detect([image])
         boxes = []
         
         for result in results:
-            for box in result.boxes:
+            for box, class_id in zip(result.boxes, result.class_ids):
                 # Class 2 is car, 3 is motorcycle, 5 is bus, 7 is truck in COCO dataset
-                if box.cls in [2, 3, 5, 7]:
-                    x1, y1, x2, y2 = map(int, box.xyxy[0])
+                if class_id in [2, 3, 5, 7]:
+                    x1, y1, x2, y2 = map(int, box)
                     # Add some padding around the detected vehicle
                     padding = 10
                     x1 = max(0, x1 - padding)
@@ -0,0 +1,139 @@
+# Process-wide registry that hands out one shared instance of each model
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple, Union
+
+from yolo_engines import load_yolo_engine, resolve_engine
+
+
+class ModelRegistry:
+    """Reference-counted cache of loaded models keyed by (model path, languages, device).
+
+    The first acquire of a key loads the model; later acquires return the
+    same instance. Each acquire must be paired with a release, and the
+    instance is dropped when the last holder releases it. Loading happens
+    outside the registry lock, so different models load concurrently while
+    callers asking for the same key wait for the single load.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Dict[str, Any]] = {}
+        self._keys: Dict[int, Hashable] = {}
+
+    def acquire(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the model for `key`, loading it with `loader` if nobody holds it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = {'model': None, 'refs': 0, 'lock': threading.Lock()}
+            entry['refs'] += 1
+
+        try:
+            with entry['lock']:
+                if entry['model'] is None:
+                    model = loader()
+                    with self._lock:
+                        entry['model'] = model
+                        self._keys[id(model)] = key
+        except Exception:
+            self._decref(key)
+            raise
+        return entry['model']
+
+    def release(self, model: Any):
+        """Give back a model obtained from acquire()."""
+        with self._lock:
+            key = self._keys.get(id(model))
+        if key is not None:
+            self._decref(key)
+
+    def _decref(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry['refs'] -= 1
+            if entry['refs'] <= 0:
+                del self._entries[key]
+                if entry['model'] is not None:
+                    self._keys.pop(id(entry['model']), None)
+
+    def refcount(self, model: Any) -> int:
+        """Number of current holders of a model (0 if it is not registered)."""
+        with self._lock:
+            key = self._keys.get(id(model))
+            return self._entries[key]['refs'] if key in self._entries else 0
+
+    def loaded(self) -> Dict[Hashable, int]:
+        """Holder count of every loaded model, by key."""
+        with self._lock:
+            return {key: entry['refs'] for key, entry in self._entries.items() if entry['model'] is not None}
+
+
+# Registry shared by every pipeline in the process
+registry = ModelRegistry()
+
+
+def _torch_device(gpu: Union[bool, str]) -> str:
+    """Device EasyOCR will actually run on, so gpu=True on a CPU-only box shares the CPU reader."""
+    if isinstance(gpu, str):
+        return gpu
+    if gpu:
+        import torch
+
+        if torch.cuda.is_available():
+            return 'cuda'
+    return 'cpu'
+
+
+def acquire_easyocr(langs: Sequence[str] = ('en',), gpu: Union[bool, str] = False, **kwargs):
+    """Shared easyocr.Reader for a language list and device.
+
+    Args:
+        langs: EasyOCR language codes
+        gpu: As for easyocr.Reader
+        **kwargs: Extra easyocr.Reader arguments (part of the key)
+    """
+    device = _torch_device(gpu)
+    key = ('easyocr', None, tuple(langs), device, tuple(sorted(kwargs.items())))
+
+    def load():
+        import easyocr
+
+        return easyocr.Reader(list(langs), gpu=device != 'cpu' and device, **kwargs)
+
+    return registry.acquire(key, load)
+
+
+def acquire_yolo(
+    model_path: Union[str, Path],
+    engine: Optional[str] = None,
+    device: str = 'cpu',
+    threads: Optional[int] = None,
+    precision: str = 'fp32',
+    calibration_dir: Optional[Union[str, Path]] = None
+):
+    """Shared YOLO engine for a weights file, engine, device and precision (and,
+    for 'int8_static', calibration folder).
+
+    Takes the same arguments as yolo_engines.load_yolo_engine().
+    """
+    path = Path(model_path)
+    name, torch_device = resolve_engine(engine, device)
+    # Statically quantized engines differ by the frames they were calibrated
+    # on; other precisions ignore calibration_dir and can be shared
+    calibration = None
+    if precision == 'int8_static' and calibration_dir is not None:
+        calibration = str(Path(calibration_dir).resolve())
+    key: Tuple = ('yolo', str(path.resolve()) if path.exists() else str(path), (),
+                  (name, torch_device, precision, threads, calibration))
+
+    return registry.acquire(key, lambda: load_yolo_engine(
+        model_path, name, torch_device, threads, precision, calibration_dir
+    ))
+
+
+def release(model: Any):
+    """Give back a model obtained from acquire_easyocr() or acquire_yolo()."""
+    registry.release(model)
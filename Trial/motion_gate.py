@@ -0,0 +1,108 @@
+# Cheap frame-differencing gate that skips inference on static scenes
+import time
+import cv2
+import numpy as np
+from typing import Optional, Sequence
+
+from box_utils import roi_polygon
+
+
+class MotionGate:
+    """Decide whether a frame has changed enough to be worth running ANPR on.
+
+    Frames are downscaled to a small grayscale image and compared with a
+    running-average background, so slow lighting changes fade into the
+    background while a passing vehicle does not. The motion score is the
+    fraction of pixels (inside the ROI, if one is set) that differ from the
+    background by more than pixel_threshold.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.002,
+        pixel_threshold: int = 25,
+        width: int = 160,
+        learning_rate: float = 0.05
+    ):
+        """Initialize the gate.
+
+        Args:
+            threshold: Motion score at or above which a frame counts as
+                moving; lower values make the gate more sensitive
+            pixel_threshold: Gray-level difference at which a pixel counts
+                as changed
+            width: Width the frame is downscaled to before differencing
+            learning_rate: Weight of each new frame in the background average
+        """
+        self.threshold = threshold
+        self.pixel_threshold = pixel_threshold
+        self.width = width
+        self.learning_rate = learning_rate
+
+        self._background = None
+        self._mask = None
+        self._mask_key = None
+
+        # Metrics
+        self.score = 0.0
+        self.frames_checked = 0
+        self.frames_gated = 0
+        self.gate_time = 0.0
+
+    def check(self, frame: np.ndarray, roi_points: Optional[Sequence] = None) -> bool:
+        """Update the background with a frame and report whether it moved.
+
+        Args:
+            frame: BGR frame
+            roi_points: Optional ROI polygon (or (x1, y1, x2, y2) rectangle)
+                in frame coordinates
+
+        Returns:
+            True if the frame should be processed
+        """
+        start = time.perf_counter()
+        h, w = frame.shape[:2]
+        scale = self.width / w
+        small = cv2.resize(frame, (self.width, max(1, round(h * scale))), interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        small = cv2.GaussianBlur(small, (5, 5), 0)
+
+        if self._background is None or self._background.shape != small.shape:
+            # Nothing to compare against yet: process the first frame
+            self._background = small.astype(np.float32)
+            self.score = 1.0
+            moving = True
+        else:
+            changed = cv2.absdiff(small, cv2.convertScaleAbs(self._background)) > self.pixel_threshold
+            mask = self._roi_mask(small.shape, scale, roi_points)
+            if mask is not None:
+                self.score = float(np.count_nonzero(changed & mask)) / max(1, int(np.count_nonzero(mask)))
+            else:
+                self.score = float(np.count_nonzero(changed)) / changed.size
+            moving = self.score >= self.threshold
+            cv2.accumulateWeighted(small, self._background, self.learning_rate)
+
+        self.frames_checked += 1
+        if not moving:
+            self.frames_gated += 1
+        self.gate_time += time.perf_counter() - start
+        return moving
+
+    def _roi_mask(self, shape, scale: float, roi_points: Optional[Sequence]) -> Optional[np.ndarray]:
+        """Boolean ROI mask at the downscaled size, rebuilt only when the ROI changes."""
+        if roi_points is None or not len(roi_points):
+            return None
+        points = roi_polygon(roi_points)
+        key = (shape, points.tobytes())
+        if key != self._mask_key:
+            mask = np.zeros(shape, dtype=np.uint8)
+            polygon = np.round(points * scale).astype(np.int32)
+            cv2.fillPoly(mask, [polygon], 1)
+            self._mask = mask.astype(bool)
+            self._mask_key = key
+        return self._mask
+
+    def reset(self):
+        """Forget the background; the next frame is always processed."""
+        self._background = None
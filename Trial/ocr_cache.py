@@ -0,0 +1,189 @@
+# Perceptual-hash cache of plate OCR results
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+
+
+def plate_hash(crop: np.ndarray, size: Tuple[int, int] = (16, 8)) -> Optional[int]:
+    """Difference hash (dHash) of a plate crop.
+
+    The crop is converted to grayscale and shrunk to (width + 1, height);
+    every bit says whether a pixel is brighter than its right neighbour.
+    The hash ignores scale and uniform brightness changes, and its width
+    follows the plate's wide aspect so that characters stay distinguishable.
+
+    Args:
+        crop: BGR or grayscale plate crop
+        size: (width, height) of the bit grid
+
+    Returns:
+        width * height bit hash, or None for an empty crop
+    """
+    if crop is None or crop.size == 0:
+        return None
+    gray = crop if crop.ndim == 2 else cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    width, height = size
+    small = cv2.resize(gray, (width + 1, height), interpolation=cv2.INTER_AREA).astype(np.int16)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+# Marks a cache miss, distinct from any result recognize can return
+_MISS = object()
+
+
+def _distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def _cacheable(result: Any) -> bool:
+    """False for failed reads: None, empty text, or a (text, confidence) pair with either empty."""
+    if isinstance(result, tuple):
+        return bool(result) and bool(result[0]) and (len(result) < 2 or bool(result[1]))
+    return bool(result)
+
+
+class OCRCache:
+    """Bounded LRU cache of OCR results keyed by a perceptual hash of the crop.
+
+    A crop matches the cached entry with the closest hash if their Hamming
+    distance is at most max_distance, so the nearly identical crops of a
+    parked or queued vehicle share one OCR call. Entries expire ttl seconds
+    after they were stored, which bounds how long a misread can be repeated.
+    Failed reads are not stored, so a blurred or half visible plate is read
+    again on the next frame instead of staying unread for ttl seconds.
+    All methods are thread-safe; OCR itself runs outside the lock.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: float = 30.0,
+        max_distance: int = 6,
+        hash_size: Tuple[int, int] = (16, 8)
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+            ttl: Seconds an entry stays valid after it was stored
+            max_distance: Largest Hamming distance (out of width * height
+                bits) at which two crops count as the same plate
+            hash_size: (width, height) of the dHash bit grid
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_distance = max_distance
+        self.hash_size = hash_size
+
+        # hash -> (result, time stored), least recently used first
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def key(self, crop: np.ndarray) -> Optional[int]:
+        """Hash of a crop, or None if it cannot be cached."""
+        return plate_hash(crop, self.hash_size)
+
+    def lookup(self, key: Optional[int], default: Any = None) -> Any:
+        """Cached result for the closest hash within max_distance, or default on a miss."""
+        if key is None:
+            return default
+        now = time.monotonic()
+        with self._lock:
+            expired = [cached for cached, (_, stored) in self._entries.items() if now - stored > self.ttl]
+            for cached in expired:
+                del self._entries[cached]
+            self.expirations += len(expired)
+
+            best, best_distance = None, self.max_distance + 1
+            if key in self._entries:
+                best, best_distance = key, 0
+            else:
+                for cached in self._entries:
+                    distance = _distance(key, cached)
+                    if distance < best_distance:
+                        best, best_distance = cached, distance
+
+            if best is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._entries.move_to_end(best)
+            return self._entries[best][0]
+
+    def store(self, key: Optional[int], result: Any):
+        """Cache a result under a crop's hash."""
+        if key is None:
+            return
+        with self._lock:
+            self._entries[key] = (result, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def cached(self, crop: np.ndarray, recognize: Callable[[np.ndarray], Any]) -> Any:
+        """Return the cached result for a crop, or run recognize(crop) and cache it if it read a plate."""
+        key = self.key(crop)
+        result = self.lookup(key, _MISS)
+        if result is _MISS:
+            result = recognize(crop)
+            if _cacheable(result):
+                self.store(key, result)
+        return result
+
+    def cached_batch(
+        self,
+        crops: Sequence[np.ndarray],
+        recognize: Callable[[List[np.ndarray]], List[Any]],
+        with_hits: bool = False
+    ) -> Union[List[Any], Tuple[List[Any], List[bool]]]:
+        """Like cached, for a batch recognizer: only the misses are passed to recognize.
+
+        Args:
+            crops: Crops to recognize
+            recognize: Batch recognizer called with the crops the cache misses
+            with_hits: Also return, per crop, whether its result came from the
+                cache rather than from recognize
+
+        Returns:
+            Results in input order, and the hit flags if with_hits is set
+        """
+        keys = [self.key(crop) for crop in crops]
+        results = [self.lookup(key, _MISS) for key in keys]
+        hits = [result is not _MISS for result in results]
+        missing = [i for i, hit in enumerate(hits) if not hit]
+        if missing:
+            for i, result in zip(missing, recognize([crops[i] for i in missing])):
+                results[i] = result
+                if _cacheable(result):
+                    self.store(keys[i], result)
+        return (results, hits) if with_hits else results
+
+    def clear(self):
+        """Drop all entries; the counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Entry count and hit, miss, eviction and expiry counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
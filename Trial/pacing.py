@@ -0,0 +1,60 @@
+# Deadline-based frame pacing without busy-waiting
+import time
+import threading
+from typing import Optional
+
+
+class FramePacer:
+    """Sleep until the next frame deadline instead of spinning on the clock.
+
+    Deadlines advance by a fixed interval, so the average rate stays on
+    target even when individual iterations take different amounts of time.
+    If the caller falls more than one interval behind, the schedule is
+    reset rather than bursting to catch up.
+    """
+
+    def __init__(self, fps: float, stop_event: Optional[threading.Event] = None):
+        """Initialize the pacer.
+
+        Args:
+            fps: Target rate in frames per second (<= 0 disables pacing)
+            stop_event: Optional event that interrupts a pending sleep
+        """
+        self.interval = 1.0 / fps if fps > 0 else 0.0
+        self.stop_event = stop_event
+        self._next_deadline = None
+
+    def wait(self) -> float:
+        """Block until the next deadline and return the time it fired."""
+        now = time.perf_counter()
+        if self.interval <= 0:
+            return now
+
+        if self._next_deadline is None or now - self._next_deadline > self.interval:
+            self._next_deadline = now
+        remaining = self._next_deadline - now
+        if remaining > 0:
+            if self.stop_event is not None:
+                self.stop_event.wait(remaining)
+            else:
+                time.sleep(remaining)
+
+        fired = max(now, self._next_deadline)
+        self._next_deadline += self.interval
+        return fired
+
+    def due(self) -> bool:
+        """Non-blocking check: True (and advance the schedule) if a deadline has passed."""
+        now = time.perf_counter()
+        if self.interval <= 0:
+            return True
+        if self._next_deadline is None or now - self._next_deadline > self.interval:
+            self._next_deadline = now
+        if now < self._next_deadline:
+            return False
+        self._next_deadline += self.interval
+        return True
+
+    def reset(self):
+        """Restart the schedule from the next call."""
+        self._next_deadline = None
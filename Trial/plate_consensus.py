@@ -0,0 +1,150 @@
+# Per-track consensus of plate OCR reads across frames
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def _align(read: str, backbone: str) -> List[Optional[str]]:
+    """Align a read to the backbone with minimum edit distance.
+
+    Returns:
+        For every backbone position, the read's character aligned to it, or
+        None where the read has a deletion; characters the read inserts
+        between backbone positions are dropped
+    """
+    n, m = len(read), len(backbone)
+    # cost[i][j]: edit distance between read[:i] and backbone[:j]
+    cost = [[0] * (m + 1) for _ in range(n + 1)]
+    for i in range(1, n + 1):
+        cost[i][0] = i
+    for j in range(1, m + 1):
+        cost[0][j] = j
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            cost[i][j] = min(
+                cost[i - 1][j - 1] + (read[i - 1] != backbone[j - 1]),
+                cost[i - 1][j] + 1,
+                cost[i][j - 1] + 1
+            )
+
+    aligned: List[Optional[str]] = [None] * m
+    i, j = n, m
+    while i and j:
+        if cost[i][j] == cost[i - 1][j - 1] + (read[i - 1] != backbone[j - 1]):
+            aligned[j - 1] = read[i - 1]
+            i, j = i - 1, j - 1
+        elif cost[i][j] == cost[i][j - 1] + 1:
+            j -= 1
+        else:
+            i -= 1
+    return aligned
+
+
+class PlateConsensus:
+    """Confidence-weighted, character-level vote over one track's plate reads.
+
+    Each read is aligned character by character to a backbone: the most
+    confident read among those of the most-voted length. Every backbone
+    position then takes the character (or gap) with the largest summed
+    confidence. The consensus is settled once it has come out the same
+    for settle_reads consecutive reads, after which OCR can stop for the
+    track.
+    """
+
+    def __init__(self, settle_reads: int = 3, max_reads: int = 15):
+        """Initialize the accumulator.
+
+        Args:
+            settle_reads: Consecutive reads with an unchanged consensus that
+                settle the plate
+            max_reads: Only the most confident reads are kept and voted on
+        """
+        self.settle_reads = settle_reads
+        self.max_reads = max_reads
+        self.reads: List[Tuple[str, float]] = []
+        self.text = ""
+        self.confidence = 0.0
+        self.settled = False
+        self._stable = 0
+
+    def add(self, text: str, confidence: float) -> Tuple[str, float]:
+        """Add one OCR read and return the updated (consensus text, confidence).
+
+        Empty reads are ignored and do not count towards settling.
+        """
+        if self.settled or not text:
+            return self.text, self.confidence
+
+        self.reads.append((text, float(confidence)))
+        if len(self.reads) > self.max_reads:
+            self.reads.remove(min(self.reads, key=lambda read: read[1]))
+
+        text, confidence = self._vote()
+        self._stable = self._stable + 1 if text == self.text else 1
+        self.text, self.confidence = text, confidence
+        self.settled = bool(text) and self._stable >= self.settle_reads
+        return self.text, self.confidence
+
+    def _vote(self) -> Tuple[str, float]:
+        """Consensus text and its confidence: the mean share of the vote each character won."""
+        lengths: Dict[int, float] = {}
+        for text, confidence in self.reads:
+            lengths[len(text)] = lengths.get(len(text), 0.0) + confidence
+        length = max(lengths, key=lengths.get)
+        backbone = max((read for read in self.reads if len(read[0]) == length), key=lambda read: read[1])[0]
+
+        votes: List[Dict[Optional[str], float]] = [{} for _ in backbone]
+        total = 0.0
+        for text, confidence in self.reads:
+            total += confidence
+            for position, char in enumerate(_align(text, backbone)):
+                votes[position][char] = votes[position].get(char, 0.0) + confidence
+
+        chars, shares = [], []
+        for position_votes in votes:
+            char = max(position_votes, key=position_votes.get)
+            if char is not None:
+                chars.append(char)
+                shares.append(position_votes[char] / total if total else 0.0)
+        return ''.join(chars), (sum(shares) / len(shares) if shares else 0.0)
+
+
+class TrackPlateConsensus:
+    """PlateConsensus accumulators keyed by track ID."""
+
+    def __init__(self, settle_reads: int = 3, max_reads: int = 15):
+        """Initialize the store.
+
+        Args:
+            settle_reads: Passed to every PlateConsensus
+            max_reads: Passed to every PlateConsensus
+        """
+        self.settle_reads = settle_reads
+        self.max_reads = max_reads
+        self._tracks: Dict[int, PlateConsensus] = {}
+
+    def get(self, track_id: int) -> Optional[PlateConsensus]:
+        """The track's accumulator, or None if it has no reads yet."""
+        return self._tracks.get(track_id)
+
+    def settled(self, track_id: int) -> bool:
+        """Whether OCR can stop for this track."""
+        consensus = self._tracks.get(track_id)
+        return consensus is not None and consensus.settled
+
+    def add(self, track_id: int, text: str, confidence: float) -> Tuple[str, float]:
+        """Add a read to a track and return its (consensus text, confidence)."""
+        consensus = self._tracks.get(track_id)
+        if consensus is None:
+            consensus = self._tracks[track_id] = PlateConsensus(self.settle_reads, self.max_reads)
+        return consensus.add(text, confidence)
+
+    def evict(self, track_ids: Iterable[int]):
+        """Forget expired tracks."""
+        for track_id in track_ids:
+            self._tracks.pop(track_id, None)
+
+    def clear(self):
+        """Forget all tracks."""
+        self._tracks.clear()
+
+    def __len__(self) -> int:
+        return len(self._tracks)
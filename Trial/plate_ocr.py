@@ -0,0 +1,164 @@
+# Recognition-only OCR for crops that already contain just a licence plate
+import cv2
+import numpy as np
+from typing import List, Optional, Tuple
+
+# Characters that can appear on a plate; restricting the decoder to them
+# removes punctuation and lower-case confusions
+PLATE_ALLOWLIST = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def plate_text_regions(
+    gray: np.ndarray,
+    two_row_max_aspect: float = 3.0,
+    max_gap_ink: float = 0.35
+) -> List[List[int]]:
+    """Split a plate crop into its text lines.
+
+    Single-row plates are several times wider than tall; squarer crops are
+    checked for a near-empty band in their middle third (the gap between
+    the two rows of a two-row plate) using a row profile of the binarised
+    text pixels.
+
+    Args:
+        gray: Grayscale plate crop
+        two_row_max_aspect: Crops wider than this (width / height) are one row
+        max_gap_ink: A split row may hold at most this fraction of the
+            busiest row's text pixels
+
+    Returns:
+        EasyOCR horizontal_list boxes ([x_min, x_max, y_min, y_max]), top row first
+    """
+    h, w = gray.shape[:2]
+    whole = [[0, w, 0, h]]
+    if h < 16 or w / h > two_row_max_aspect:
+        return whole
+
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    # Text is the minority class whether the plate is dark-on-light or not
+    ink = binary > 0 if np.count_nonzero(binary) < binary.size / 2 else binary == 0
+    profile = ink.sum(axis=1).astype(np.float32)
+    if not profile.max():
+        return whole
+
+    lo, hi = h // 3, h - h // 3
+    split = lo + int(np.argmin(profile[lo:hi]))
+    if profile[split] > max_gap_ink * profile.max():
+        return whole
+    return [[0, w, 0, split], [0, w, split, h]]
+
+
+def recognize_plate_crop(
+    reader,
+    crop: np.ndarray,
+    allowlist: Optional[str] = PLATE_ALLOWLIST,
+    split_rows: bool = True,
+    **kwargs
+) -> Tuple[str, float]:
+    """Read a plate crop with EasyOCR's recognizer only, skipping CRAFT text detection.
+
+    Args:
+        reader: easyocr.Reader
+        crop: BGR or grayscale plate crop
+        allowlist: Characters the decoder may emit (None for all)
+        split_rows: Read two-row plates line by line
+        **kwargs: Extra arguments for reader.recognize
+
+    Returns:
+        Tuple of (text of all rows, top to bottom, mean row confidence)
+    """
+    if crop is None or crop.size == 0:
+        return "", 0.0
+    gray = crop if crop.ndim == 2 else cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    h, w = gray.shape[:2]
+    regions = plate_text_regions(gray) if split_rows else [[0, w, 0, h]]
+
+    results = reader.recognize(
+        gray, horizontal_list=regions, free_list=[],
+        allowlist=allowlist, detail=1, paragraph=False, **kwargs
+    )
+    if not results:
+        return "", 0.0
+
+    # Rows in reading order, by the top edge of their region
+    results = sorted(results, key=lambda result: result[0][0][1])
+    text = ''.join(result[1] for result in results)
+    confidence = float(np.mean([result[2] for result in results]))
+    return text, confidence
+
+
+def recognize_plate_crops(
+    reader,
+    crops: List[np.ndarray],
+    height: int = 64,
+    allowlist: Optional[str] = PLATE_ALLOWLIST,
+    split_rows: bool = True,
+    decoder: str = 'greedy',
+    contrast_ths: float = 0.1,
+    adjust_contrast: float = 0.5
+) -> List[Tuple[str, float]]:
+    """Read several plate crops with one batched recognizer pass.
+
+    Every crop is scaled to a common height and stacked on one grayscale
+    canvas; its text rows become regions of that canvas. EasyOCR's
+    Reader.recognize processes regions one at a time on the CPU, so the
+    regions are cut and decoded with its get_image_list/get_text helpers
+    directly, with the whole frame's rows as a single batch.
+
+    Args:
+        reader: easyocr.Reader
+        crops: BGR or grayscale plate crops
+        height: Common crop height on the canvas
+        allowlist: Characters the decoder may emit (None for the reader's languages)
+        split_rows: Read two-row plates line by line
+
+    Returns:
+        (text, confidence) per crop, in input order; ("", 0.0) for empty crops
+    """
+    from easyocr.recognition import get_text
+    from easyocr.utils import get_image_list
+
+    outputs = [("", 0.0)] * len(crops)
+    scaled = []
+    for i, crop in enumerate(crops):
+        if crop is None or crop.size == 0:
+            continue
+        gray = crop if crop.ndim == 2 else cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+        width = max(1, round(gray.shape[1] * height / gray.shape[0]))
+        scaled.append((i, cv2.resize(gray, (width, height), interpolation=cv2.INTER_LINEAR)))
+    if not scaled:
+        return outputs
+
+    canvas = np.zeros((height * len(scaled), max(gray.shape[1] for _, gray in scaled)), dtype=np.uint8)
+    regions = []
+    for slot, (_, gray) in enumerate(scaled):
+        top = slot * height
+        canvas[top:top + height, :gray.shape[1]] = gray
+        rows = plate_text_regions(gray) if split_rows else [[0, gray.shape[1], 0, height]]
+        regions.extend([x1, x2, top + y1, top + y2] for x1, x2, y1, y2 in rows)
+
+    # Same decoder restriction Reader.recognize derives from allowlist
+    characters = set(allowlist) if allowlist else set(reader.lang_char)
+    ignore_char = ''.join(set(reader.character) - characters)
+
+    model_height = getattr(reader, 'imgH', 64)
+    image_list, max_width = get_image_list(regions, [], canvas, model_height=model_height)
+    results = get_text(
+        reader.character, model_height, int(max_width), reader.recognizer, reader.converter, image_list,
+        ignore_char=ignore_char, decoder=decoder, batch_size=len(image_list),
+        contrast_ths=contrast_ths, adjust_contrast=adjust_contrast, workers=0, device=reader.device
+    )
+
+    # Regions come back sorted by position; the canvas row says which crop
+    # each one belongs to
+    rows_by_slot = {}
+    for box, text, confidence in results:
+        top = int(box[0][1])
+        rows_by_slot.setdefault(top // height, []).append((top, text, confidence))
+    for slot, rows in rows_by_slot.items():
+        rows.sort()
+        outputs[scaled[slot][0]] = (
+            ''.join(text for _, text, _ in rows),
+            float(np.mean([confidence for _, _, confidence in rows]))
+        )
+    return outputs
@@ -0,0 +1,186 @@
+# Reduced-precision (INT8) copies of the exported ONNX models
+import hashlib
+import logging
+import cv2
+import numpy as np
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+from yolo_engines import preprocess_classify, preprocess_detect
+
+try:
+    from onnxruntime.quantization import (
+        CalibrationDataReader, QuantFormat, QuantType, quantize_dynamic, quantize_static
+    )
+except ImportError:
+    CalibrationDataReader = object
+    quantize_dynamic = quantize_static = None
+
+try:
+    import nncf
+except ImportError:
+    nncf = None
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+# Only the convolution and matmul weights are quantized; the decode ops at the
+# end of the head (sigmoid, concat, box arithmetic) stay in fp32, where INT8
+# costs the most accuracy for the least speed
+QUANTIZED_OP_TYPES = ['Conv', 'MatMul']
+
+
+def _calibration_paths(folder: Union[str, Path]) -> List[Path]:
+    paths = sorted(p for p in Path(folder).iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+    if not paths:
+        raise ValueError(f"No calibration images found in {folder}")
+    return paths
+
+
+def calibration_digest(folder: Union[str, Path]) -> str:
+    """Short hash identifying a set of calibration frames.
+
+    Covers the folder's resolved path and the name, size and modification
+    time of every image in it, so a cached static INT8 model is only reused
+    for the frames it was calibrated on.
+    """
+    digest = hashlib.sha1(str(Path(folder).resolve()).encode())
+    for path in _calibration_paths(folder):
+        stat = path.stat()
+        digest.update(f"\0{path.name}\0{stat.st_size}\0{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:12]
+
+
+def load_calibration_images(folder: Union[str, Path], limit: int = 200) -> List[np.ndarray]:
+    """Read up to `limit` images spread evenly over a folder of frames."""
+    paths = _calibration_paths(folder)
+    if len(paths) > limit:
+        paths = [paths[i] for i in np.linspace(0, len(paths) - 1, limit).astype(int)]
+
+    images = [cv2.imread(str(p)) for p in paths]
+    return [image for image in images if image is not None]
+
+
+def calibration_batches(images: List[np.ndarray], metadata: Dict) -> Iterator[np.ndarray]:
+    """Yield single-image input batches preprocessed exactly as at inference time."""
+    for image in images:
+        if metadata['task'] == 'classify':
+            yield preprocess_classify([image], metadata['imgsz'])
+        else:
+            yield preprocess_detect([image], metadata['imgsz'])[0]
+
+
+def _is_fresh(path: Path, source: Path) -> bool:
+    return path.exists() and path.stat().st_mtime >= source.stat().st_mtime
+
+
+class FrameCalibrationReader(CalibrationDataReader):
+    """Feeds calibration frames to onnxruntime's static quantizer."""
+
+    def __init__(self, input_name: str, batches: Iterator[np.ndarray]):
+        self.input_name = input_name
+        self.batches = batches
+
+    def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+        batch = next(self.batches, None)
+        return None if batch is None else {self.input_name: batch}
+
+
+def quantize_onnx(
+    onnx_path: Union[str, Path],
+    metadata: Dict,
+    precision: str,
+    calibration_dir: Optional[Union[str, Path]] = None
+) -> Path:
+    """Create (or reuse) an INT8 copy of an ONNX export for ONNX Runtime.
+
+    'int8_dynamic' quantizes weights ahead of time and activations per call.
+    'int8_static' also fixes activation ranges from the calibration frames;
+    its file name carries calibration_digest(calibration_dir), so adding,
+    removing or replacing frames (or pointing at another folder) recalibrates
+    instead of reusing a model calibrated on different frames.
+
+    Args:
+        onnx_path: fp32 export from yolo_engines.export_onnx
+        metadata: Export metadata (task, imgsz, names)
+        precision: 'int8_dynamic' or 'int8_static'
+        calibration_dir: Folder of frames, required for 'int8_static'
+
+    Returns:
+        Path to the quantized model
+    """
+    if quantize_dynamic is None:
+        raise ImportError("onnxruntime is required for INT8 quantization")
+
+    onnx_path = Path(onnx_path)
+    if precision == 'int8_static':
+        if calibration_dir is None:
+            raise ValueError("int8_static needs a calibration_dir of representative frames")
+        output_path = onnx_path.with_suffix(f'.int8_static-{calibration_digest(calibration_dir)}.onnx')
+    else:
+        output_path = onnx_path.with_suffix(f'.{precision}.onnx')
+    if _is_fresh(output_path, onnx_path):
+        return output_path
+
+    logger = logging.getLogger(__name__)
+    if precision == 'int8_dynamic':
+        quantize_dynamic(
+            str(onnx_path), str(output_path),
+            op_types_to_quantize=QUANTIZED_OP_TYPES, weight_type=QuantType.QUInt8
+        )
+    elif precision == 'int8_static':
+        import onnxruntime as ort
+
+        input_name = ort.InferenceSession(str(onnx_path), providers=['CPUExecutionProvider']).get_inputs()[0].name
+        images = load_calibration_images(calibration_dir)
+        reader = FrameCalibrationReader(input_name, calibration_batches(images, metadata))
+        quantize_static(
+            str(onnx_path), str(output_path), reader,
+            quant_format=QuantFormat.QDQ,
+            op_types_to_quantize=QUANTIZED_OP_TYPES,
+            per_channel=True,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8
+        )
+        logger.info(f"Calibrated {output_path.name} on {len(images)} frames")
+    else:
+        raise ValueError(f"Not an INT8 precision: {precision}")
+
+    return output_path
+
+
+def quantize_openvino(
+    onnx_path: Union[str, Path],
+    metadata: Dict,
+    calibration_dir: Optional[Union[str, Path]] = None
+) -> Path:
+    """Create (or reuse) an NNCF post-training INT8 model for OpenVINO.
+
+    Like quantize_onnx's 'int8_static', the model is cached per
+    calibration_digest(calibration_dir).
+
+    Returns:
+        Path to the quantized OpenVINO IR (.xml)
+    """
+    if nncf is None:
+        raise ImportError("nncf is required for INT8 quantization on the openvino engine")
+    if calibration_dir is None:
+        raise ValueError("int8_static needs a calibration_dir of representative frames")
+    import openvino as ov
+
+    onnx_path = Path(onnx_path)
+    output_path = onnx_path.with_suffix(f'.int8_static-{calibration_digest(calibration_dir)}.xml')
+    if _is_fresh(output_path, onnx_path):
+        return output_path
+
+    images = load_calibration_images(calibration_dir)
+    model = ov.Core().read_model(str(onnx_path))
+    quantized = nncf.quantize(
+        model,
+        nncf.Dataset(list(calibration_batches(images, metadata))),
+        preset=nncf.QuantizationPreset.MIXED,
+        subset_size=len(images),
+        ignored_scope=nncf.IgnoredScope(types=['Sigmoid', 'Multiply', 'Subtract'])
+    )
+    ov.save_model(quantized, str(output_path))
+    logging.getLogger(__name__).info(f"Calibrated {output_path.name} on {len(images)} frames")
+    return output_path
@@ -0,0 +1,164 @@
+# One ANPR backend shared by several camera streams, batching frames across them
+import time
+import logging
+import threading
+import numpy as np
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from frame_queue import FrameQueue
+
+
+class SharedInference:
+    """Inference worker that serves many camera streams with one ANPRBackend.
+
+    Each registered stream has a latest-wins slot holding its freshest frame.
+    The worker collects whatever frames are pending across streams, detects
+    vehicles in all of them with a single backend call and routes each result
+    back to its stream's callback.
+    """
+
+    def __init__(self, backend, max_batch: int = 8):
+        """Initialize the shared inference worker.
+
+        Args:
+            backend: ANPRBackend used for every stream
+            max_batch: Maximum number of frames per backend call
+        """
+        self.logger = logging.getLogger(__name__)
+        self.backend = backend
+        self.max_batch = max_batch
+
+        self._streams: Dict[Hashable, Dict[str, Any]] = {}
+        self._order = []
+        self._cond = threading.Condition()
+        self._thread = None
+        self.running = False
+
+        self.batches = 0
+        self.batched_frames = 0
+
+    def register(
+        self,
+        stream_id: Hashable,
+        callback: Callable[[Any, Optional[Dict], float], None],
+        release: Optional[Callable[[Any], None]] = None
+    ):
+        """Add a stream.
+
+        Args:
+            stream_id: Camera identifier used to route results
+            callback: Called as callback(item, results, inference_time) on the
+                worker thread; results is None if inference failed
+            release: Called with an item that is dropped unprocessed
+        """
+        on_drop = (lambda entry: release(entry[0])) if release else None
+        with self._cond:
+            self._streams[stream_id] = {
+                'queue': FrameQueue(1, 'latest_wins', on_drop=on_drop),
+                'callback': callback,
+                'submitted': 0,
+                'processed': 0,
+                'inference_time': 0.0
+            }
+            self._order.append(stream_id)
+
+    def unregister(self, stream_id: Hashable):
+        """Remove a stream, releasing any frame it still has queued."""
+        with self._cond:
+            stream = self._streams.pop(stream_id, None)
+            if stream_id in self._order:
+                self._order.remove(stream_id)
+        if stream is not None:
+            stream['queue'].clear()
+        self.backend.reset_tracking(stream_id)
+
+    def submit(self, stream_id: Hashable, item: Any, frame: np.ndarray, roi=None):
+        """Queue a stream's newest frame, replacing one it has not had processed yet."""
+        with self._cond:
+            stream = self._streams[stream_id]
+            stream['submitted'] += 1
+            stream['queue'].put((item, frame, roi))
+            self._cond.notify()
+
+    def start(self):
+        """Start the worker thread."""
+        if self._thread is not None:
+            return
+        self.running = True
+        self._thread = threading.Thread(target=self._run, name='shared-inference', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the worker thread."""
+        self.running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _collect_batch(self):
+        """Take at most one pending frame per stream, rotating the start for fairness."""
+        batch = []
+        with self._cond:
+            self._cond.wait_for(
+                lambda: not self.running or any(s['queue'].qsize() for s in self._streams.values()),
+                timeout=0.1
+            )
+            for stream_id in list(self._order):
+                entry = self._streams[stream_id]['queue'].get_nowait()
+                if entry is not None:
+                    batch.append((stream_id, entry))
+                if len(batch) >= self.max_batch:
+                    break
+            if self._order:
+                self._order.append(self._order.pop(0))
+        return batch
+
+    def _run(self):
+        """Worker loop."""
+        while self.running:
+            batch = self._collect_batch()
+            if not batch:
+                continue
+
+            stream_ids = [stream_id for stream_id, _ in batch]
+            frames = [entry[1] for _, entry in batch]
+            rois = [entry[2] for _, entry in batch]
+
+            start = time.time()
+            try:
+                outputs = self.backend.process_frames(frames, rois, stream_ids)
+            except Exception as e:
+                self.logger.error(f"Shared inference error: {str(e)}")
+                outputs = [(None, None)] * len(batch)
+            elapsed = time.time() - start
+
+            self.batches += 1
+            self.batched_frames += len(batch)
+            for (stream_id, (item, _, _)), (results, _) in zip(batch, outputs):
+                stream = self._streams.get(stream_id)
+                if stream is None:
+                    continue
+                if results is not None:
+                    stream['processed'] += 1
+                    stream['inference_time'] = elapsed
+                stream['callback'](item, results, elapsed)
+
+    def get_metrics(self) -> Dict:
+        """Per-stream submission, processing and drop counts plus batching statistics."""
+        with self._cond:
+            streams = {
+                stream_id: {
+                    'submitted': stream['submitted'],
+                    'processed': stream['processed'],
+                    'dropped': stream['queue'].dropped,
+                    'inference_ms': stream['inference_time'] * 1000
+                }
+                for stream_id, stream in self._streams.items()
+            }
+        return {
+            'streams': streams,
+            'batches': self.batches,
+            'mean_batch_size': self.batched_frames / self.batches if self.batches else 0.0
+        }
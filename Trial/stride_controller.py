@@ -0,0 +1,124 @@
+# Processing-stride controller that keeps end-to-end latency under a budget
+import math
+import time
+from typing import Optional
+
+
+class StrideController:
+    """Choose how many captured frames to skip between inferences.
+
+    After every processed frame the controller sees that frame's end-to-end
+    latency (capture to result) and its inference time. With a latest-wins
+    inference queue, latency is inference time plus the time a frame waits
+    for the worker, and a longer stride shortens that wait. The controller
+    doubles the stride as soon as a frame goes over budget, and raises it to
+    whatever inference needs to keep up with capture. It only reacts to
+    frames captured after its previous change, since frames already in
+    flight still show the old stride's queueing. Once latency has stayed
+    comfortably under budget for a run of frames, it halves the distance to
+    the smallest sustainable stride.
+    """
+
+    def __init__(
+        self,
+        budget: float = 0.25,
+        initial_stride: int = 2,
+        min_stride: int = 1,
+        max_stride: int = 30,
+        headroom: float = 0.8,
+        recover_after: int = 5,
+        smoothing: float = 0.3
+    ):
+        """Initialize the controller.
+
+        Args:
+            budget: End-to-end latency budget in seconds
+            initial_stride: Stride to start with
+            min_stride: Smallest stride (1 processes every frame)
+            max_stride: Largest stride
+            headroom: Fraction of the budget (and of the inference worker's
+                capacity) the controller aims to use
+            recover_after: Consecutive calm frames before the stride is lowered
+            smoothing: Weight of each new sample in the latency average
+        """
+        self.budget = budget
+        self.min_stride = min_stride
+        self.max_stride = max_stride
+        self.headroom = headroom
+        self.recover_after = recover_after
+        self.smoothing = smoothing
+
+        self.stride = min(max(initial_stride, min_stride), max_stride)
+        self.latency = 0.0
+        self.last_decision = 'hold'
+        self.increases = 0
+        self.decreases = 0
+        self._calm = 0
+        self._changed_at = 0.0
+
+    def update(
+        self,
+        latency: float,
+        processing_time: float,
+        frame_interval: float,
+        captured_at: Optional[float] = None
+    ) -> int:
+        """Record one processed frame and return the stride to use next.
+
+        Args:
+            latency: Seconds from capture to result for this frame
+            processing_time: Seconds the inference took
+            frame_interval: Seconds between captured frames
+            captured_at: time.perf_counter() at which the frame was captured
+        """
+        self.latency += self.smoothing * (latency - self.latency) if self.latency else latency
+
+        # Smallest stride at which inference keeps up with capture
+        needed = self.min_stride
+        if frame_interval > 0:
+            needed = max(needed, math.ceil(processing_time / (frame_interval * self.headroom)))
+        settled = captured_at is None or captured_at >= self._changed_at
+
+        stride = self.stride
+        if needed > stride:
+            stride = needed
+            decision = 'falling behind'
+        elif latency > self.budget and settled:
+            if processing_time >= self.headroom * self.budget:
+                # Inference alone uses the budget; skipping more frames cannot help
+                decision = 'inference over budget'
+            else:
+                stride *= 2
+                decision = 'over budget'
+        elif self.latency < self.headroom * self.budget and stride > needed:
+            self._calm += 1
+            decision = 'hold'
+            if self._calm >= self.recover_after:
+                stride = max(needed, stride - max(1, (stride - needed) // 2))
+                decision = 'recovered'
+        else:
+            self._calm = 0
+            decision = 'hold'
+
+        stride = min(max(stride, self.min_stride), self.max_stride)
+        if stride != self.stride:
+            if stride > self.stride:
+                self.increases += 1
+            else:
+                self.decreases += 1
+            self._calm = 0
+            self._changed_at = time.perf_counter()
+        self.stride = stride
+        self.last_decision = decision
+        return stride
+
+    def stats(self) -> dict:
+        """Current stride, smoothed latency and decision counts."""
+        return {
+            'stride': self.stride,
+            'latency_ms': self.latency * 1000,
+            'budget_ms': self.budget * 1000,
+            'last_decision': self.last_decision,
+            'increases': self.increases,
+            'decreases': self.decreases
+        }
@@ -0,0 +1,71 @@
+# Per-track cache of vehicle attributes (type, colour, plate text)
+import cv2
+import numpy as np
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+def appearance_signature(crop: np.ndarray, size: int = 16) -> np.ndarray:
+    """Tiny grayscale thumbnail used to notice when a track's appearance changes."""
+    thumb = cv2.resize(crop, (size, size), interpolation=cv2.INTER_AREA)
+    if thumb.ndim == 3:
+        thumb = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY)
+    return thumb.astype(np.float32)
+
+
+class TrackAttributeCache:
+    """Cache stage outputs per track so they are only recomputed when needed.
+
+    A cached stage is reused while its confidence is at least the stage's
+    threshold and the track's appearance has not drifted from the thumbnail
+    taken when the value was computed.
+    """
+
+    def __init__(
+        self,
+        min_confidence: Optional[Dict[str, float]] = None,
+        appearance_threshold: float = 0.15
+    ):
+        """Initialize the cache.
+
+        Args:
+            min_confidence: Per-stage confidence below which a value is recomputed
+            appearance_threshold: Mean absolute thumbnail difference (0-1) that
+                counts as an appearance change
+        """
+        self.min_confidence = {'type': 0.5, 'color': 0.3, 'plate': 0.5}
+        if min_confidence:
+            self.min_confidence.update(min_confidence)
+        self.appearance_threshold = appearance_threshold
+
+        # track_id -> stage -> (value, confidence, signature)
+        self._entries: Dict[int, Dict[str, Tuple[Any, float, np.ndarray]]] = {}
+        self.hits = {stage: 0 for stage in self.min_confidence}
+        self.misses = {stage: 0 for stage in self.min_confidence}
+
+    def get(self, track_id: int, stage: str, signature: np.ndarray) -> Optional[Tuple[Any, float]]:
+        """Return the cached (value, confidence) or None if the stage must re-run."""
+        entry = self._entries.get(track_id, {}).get(stage)
+        if entry is not None:
+            value, confidence, cached_signature = entry
+            drift = float(np.mean(np.abs(signature - cached_signature))) / 255.0
+            if confidence >= self.min_confidence.get(stage, 0.0) and drift <= self.appearance_threshold:
+                self.hits[stage] = self.hits.get(stage, 0) + 1
+                return value, confidence
+        self.misses[stage] = self.misses.get(stage, 0) + 1
+        return None
+
+    def put(self, track_id: int, stage: str, value: Any, confidence: float, signature: np.ndarray):
+        """Store a freshly computed stage output for a track."""
+        self._entries.setdefault(track_id, {})[stage] = (value, confidence, signature)
+
+    def evict(self, track_ids: Iterable[int]):
+        """Forget expired tracks."""
+        for track_id in track_ids:
+            self._entries.pop(track_id, None)
+
+    def clear(self):
+        """Forget all tracks."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,267 @@
+# Lightweight multi-object tracking for vehicle detections
+import numpy as np
+from typing import List, Tuple
+
+from box_utils import iou_matrix
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:
+    linear_sum_assignment = None
+
+
+def _hungarian(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Minimum-cost assignment of a rectangular cost matrix (Hungarian method).
+
+    Fallback for scipy.optimize.linear_sum_assignment, with the same result
+    format; the inner column scan is vectorised, so each row costs O(n)
+    NumPy operations.
+
+    Args:
+        cost: (N, M) cost matrix
+
+    Returns:
+        (row indices, column indices) of the assignment, sorted by row
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+
+    # Potentials and the row matched to each column, 1-based with column 0
+    # as the augmenting path's root
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64)
+    way = np.zeros(m + 1, dtype=np.int64)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used
+            reduced = np.full(m + 1, np.inf)
+            reduced[1:] = cost[i0 - 1] - u[i0] - v[1:]
+            improve = free & (reduced < minv)
+            minv[improve] = reduced[improve]
+            way[improve] = j0
+
+            candidates = np.where(free, minv, np.inf)
+            j1 = int(np.argmin(candidates))
+            delta = candidates[j1]
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[free] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        # Flip the augmenting path
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    cols = np.nonzero(p[1:])[0]
+    rows = p[1:][cols] - 1
+    if transposed:
+        rows, cols = cols, rows
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+class SortTracker:
+    """SORT tracker: Kalman-filtered boxes matched to detections by IoU.
+
+    Every track is a constant-velocity Kalman filter over (cx, cy, area,
+    aspect ratio). Track state lives in stacked arrays, so prediction and
+    correction run as a few batched NumPy operations for all tracks at
+    once; detections are matched to the predicted boxes with the Hungarian
+    algorithm on an IoU cost matrix.
+
+    update() follows the interface of the reference SORT implementation;
+    assign() returns a track ID for every detection, for callers that keep
+    per-track state (ANPRBackend's tracked mode).
+    """
+
+    __slots__ = (
+        'max_age', 'min_hits', 'iou_threshold', 'frame_count', 'expired',
+        '_x', '_P', '_ids', '_since_update', '_hits', '_streak', '_next_id'
+    )
+
+    # Constant-velocity model over [cx, cy, s, r, vx, vy, vs]
+    _F = np.eye(7, dtype=np.float64)
+    _F[0, 4] = _F[1, 5] = _F[2, 6] = 1.0
+    _Q = np.diag([1.0, 1.0, 1.0, 1.0, 0.01, 0.01, 0.0001])
+    _R = np.diag([1.0, 1.0, 10.0, 10.0])
+    _P0 = np.diag([10.0, 10.0, 10.0, 10.0, 1e4, 1e4, 1e4])
+
+    def __init__(self, max_age: int = 1, min_hits: int = 3, iou_threshold: float = 0.3):
+        """Initialize the tracker.
+
+        Args:
+            max_age: Number of updates a track survives without a match
+            min_hits: Matches a track needs before update() reports it
+            iou_threshold: Minimum IoU for a detection to continue a track
+        """
+        self.max_age = max_age
+        self.min_hits = min_hits
+        self.iou_threshold = iou_threshold
+        self.frame_count = 0
+        self._next_id = 1
+        self._clear()
+
+        # Track IDs that expired during the last update
+        self.expired: List[int] = []
+
+    def _clear(self):
+        self._x = np.empty((0, 7), dtype=np.float64)
+        self._P = np.empty((0, 7, 7), dtype=np.float64)
+        self._ids = np.empty(0, dtype=np.int64)
+        self._since_update = np.empty(0, dtype=np.int64)
+        self._hits = np.empty(0, dtype=np.int64)
+        self._streak = np.empty(0, dtype=np.int64)
+
+    @staticmethod
+    def _to_z(boxes: np.ndarray) -> np.ndarray:
+        """(N, 4) xyxy boxes to (N, 4) [cx, cy, area, aspect ratio] measurements."""
+        w = boxes[:, 2] - boxes[:, 0]
+        h = boxes[:, 3] - boxes[:, 1]
+        return np.stack([boxes[:, 0] + w / 2, boxes[:, 1] + h / 2, w * h, w / np.maximum(h, 1e-6)], axis=1)
+
+    @staticmethod
+    def _to_boxes(x: np.ndarray) -> np.ndarray:
+        """(N, 7) states to (N, 4) xyxy boxes."""
+        w = np.sqrt(np.maximum(x[:, 2] * x[:, 3], 0.0))
+        h = x[:, 2] / np.maximum(w, 1e-6)
+        return np.stack([x[:, 0] - w / 2, x[:, 1] - h / 2, x[:, 0] + w / 2, x[:, 1] + h / 2], axis=1)
+
+    def _predict(self) -> np.ndarray:
+        """Advance every track one step and return the predicted boxes."""
+        # Keep the predicted area from going negative
+        shrinking = self._x[:, 2] + self._x[:, 6] <= 0
+        self._x[shrinking, 6] = 0.0
+        self._x = self._x @ self._F.T
+        self._P = self._F @ self._P @ self._F.T + self._Q
+        self._streak[self._since_update > 0] = 0
+        self._since_update += 1
+        return self._to_boxes(self._x)
+
+    def _correct(self, tracks: np.ndarray, z: np.ndarray):
+        """Kalman update of the given tracks with their matched measurements."""
+        x, P = self._x[tracks], self._P[tracks]
+        S = P[:, :4, :4] + self._R
+        K = P[:, :, :4] @ np.linalg.inv(S)
+        x = x + (K @ (z - x[:, :4])[:, :, None])[:, :, 0]
+        P = P - K @ P[:, :4, :]
+        self._x[tracks], self._P[tracks] = x, P
+        self._since_update[tracks] = 0
+        self._hits[tracks] += 1
+        self._streak[tracks] += 1
+
+    def _associate(self, boxes: np.ndarray, predicted: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Match detections to predicted track boxes; returns (detection, track) index arrays."""
+        empty = np.empty(0, dtype=np.int64)
+        if not len(boxes) or not len(predicted):
+            return empty, empty
+        iou = iou_matrix(boxes, predicted)
+        above = iou > self.iou_threshold
+        if above.sum(axis=1).max() == 1 and above.sum(axis=0).max() == 1:
+            # Unambiguous: every detection overlaps at most one track
+            dets, tracks = np.nonzero(above)
+        else:
+            assign = linear_sum_assignment if linear_sum_assignment is not None else _hungarian
+            dets, tracks = assign(-iou)
+        keep = iou[dets, tracks] >= self.iou_threshold
+        return dets[keep].astype(np.int64), tracks[keep].astype(np.int64)
+
+    def _step(self, boxes: np.ndarray) -> np.ndarray:
+        """Run one frame: predict, match, correct, spawn and expire tracks.
+
+        Returns:
+            (N,) track IDs aligned with the detections
+        """
+        self.frame_count += 1
+        predicted = self._predict()
+
+        # Drop tracks whose prediction broke down
+        valid = np.isfinite(predicted).all(axis=1)
+        if not valid.all():
+            self._keep(valid)
+            predicted = predicted[valid]
+
+        dets, tracks = self._associate(boxes, predicted)
+        z = self._to_z(boxes)
+        if len(dets):
+            self._correct(tracks, z[dets])
+
+        ids = np.zeros(len(boxes), dtype=np.int64)
+        ids[dets] = self._ids[tracks]
+
+        # Start a track for every unmatched detection
+        new = np.ones(len(boxes), dtype=bool)
+        new[dets] = False
+        count = int(new.sum())
+        if count:
+            new_ids = np.arange(self._next_id, self._next_id + count, dtype=np.int64)
+            self._next_id += count
+            ids[new] = new_ids
+            x = np.zeros((count, 7), dtype=np.float64)
+            x[:, :4] = z[new]
+            self._x = np.concatenate([self._x, x])
+            self._P = np.concatenate([self._P, np.broadcast_to(self._P0, (count, 7, 7))])
+            self._ids = np.concatenate([self._ids, new_ids])
+            self._since_update = np.concatenate([self._since_update, np.zeros(count, dtype=np.int64)])
+            self._hits = np.concatenate([self._hits, np.zeros(count, dtype=np.int64)])
+            self._streak = np.concatenate([self._streak, np.zeros(count, dtype=np.int64)])
+
+        alive = self._since_update <= self.max_age
+        self.expired = self._ids[~alive].tolist()
+        self._keep(alive)
+        return ids
+
+    def _keep(self, mask: np.ndarray):
+        self._x, self._P = self._x[mask], self._P[mask]
+        self._ids, self._since_update = self._ids[mask], self._since_update[mask]
+        self._hits, self._streak = self._hits[mask], self._streak[mask]
+
+    def update(self, dets: np.ndarray = np.empty((0, 5))) -> np.ndarray:
+        """Track one frame of detections, as the reference SORT does.
+
+        Args:
+            dets: (N, 5) [x1, y1, x2, y2, score] detections; call with an
+                empty array for frames without detections
+
+        Returns:
+            (M, 5) [x1, y1, x2, y2, track_id] rows for the confirmed tracks
+            matched in this frame, with Kalman-filtered boxes
+        """
+        dets = np.asarray(dets, dtype=np.float64).reshape(-1, 5) if len(dets) else np.empty((0, 5))
+        self._step(dets[:, :4])
+
+        confirmed = (self._since_update < 1) & (
+            (self._streak >= self.min_hits) | (self.frame_count <= self.min_hits)
+        )
+        boxes = self._to_boxes(self._x[confirmed])
+        return np.concatenate([boxes, self._ids[confirmed, None].astype(np.float64)], axis=1)
+
+    def assign(self, boxes: np.ndarray) -> np.ndarray:
+        """Match detections to tracks.
+
+        Args:
+            boxes: (N, 4) xyxy detection boxes of the current frame
+
+        Returns:
+            (N,) array of track IDs aligned with the input boxes; unmatched
+            detections start new tracks
+        """
+        return self._step(np.asarray(boxes, dtype=np.float64).reshape(-1, 4))
+
+    def reset(self):
+        """Drop all tracks."""
+        self.expired = self._ids.tolist()
+        self.frame_count = 0
+        self._clear()
@@ -3,6 +3,7 @@
 
 import sys
 import os
+import logging
 import cv2
 import numpy as np
 from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFileDialog
@@ -10,15 +11,34 @@ from PySide6.QtCore import Qt, QTimer, Signal, Slot
 from PySide6.QtGui import QImage, QPixmap
 from camera_thread import CameraThread
 from anpr_processor import ANPRBackend
+from ocr_cache import OCRCache
+from frame_result import FrameResult
+from warmup_thread import WarmupThread
+
+def pixmap_from_ring(ring, slot: int, seq: int):
+    """Build a QPixmap straight from a FrameRing slot, or None if it was recycled."""
+    # Pin the slot so the camera thread cannot reuse it mid-read; this
+    # fails if it already has
+    if not ring.pin(slot, expected_seq=seq):
+        return None
+    try:
+        frame = ring.buffer(slot)
+        height, width = frame.shape[:2]
+        # Wrap the BGR buffer directly; fromImage makes the only copy
+        q_img = QImage(frame.data, width, height, frame.strides[0], QImage.Format.Format_BGR888)
+        return QPixmap.fromImage(q_img)
+    finally:
+        ring.unpin(slot)
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, motion_threshold=None, latency_budget=None):
         super().__init__()
+        self.logger = logging.getLogger(__name__)
         self.setWindowTitle("ANPR System")
         self.setMinimumSize(800, 600)
         
-        # Initialize backend
-        self.anpr_backend = ANPRBackend()
+        # Initialize backend; a parked or queued vehicle's plate is read once
+        self.anpr_backend = ANPRBackend(ocr_cache=OCRCache())
         
         # Create central widget and layout
         central_widget = QWidget()
@@ -35,6 +55,7 @@ class MainWindow(QMainWindow):
         
         self.start_button = QPushButton("Start Camera")
         self.start_button.clicked.connect(self.start_camera)
+        self.start_button.setEnabled(False)
         button_layout.addWidget(self.start_button)
         
         self.stop_button = QPushButton("Stop Camera")
@@ -56,21 +77,47 @@ class MainWindow(QMainWindow):
         self.vehicle_label = QLabel("Vehicle Type: ")
         layout.addWidget(self.vehicle_label)
         
+        self.status_label = QLabel("Loading models...")
+        layout.addWidget(self.status_label)
+        
         # Initialize camera thread
         self.camera_thread = None
-        self.frame = None
+        self.motion_threshold = motion_threshold
+        self.latency_budget = latency_budget
+        self.frame_slot = None
+        self.displayed_seq = None
         self.last_detection = None
         
         # Setup timer for frame updates
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_frame)
         self.timer.start(30)  # 30ms = ~33 fps
+        
+        # Load and warm up the models in the background; the camera can
+        # start once they are ready
+        self.warmup_thread = WarmupThread(self.anpr_backend)
+        self.warmup_thread.ready.connect(self.on_backend_ready)
+        self.warmup_thread.error.connect(self.on_backend_error)
+        self.warmup_thread.start()
+    
+    @Slot(dict)
+    def on_backend_ready(self, warmup_times):
+        self.status_label.setText("Models ready")
+        if not self.camera_thread:
+            self.start_button.setEnabled(True)
+    
+    @Slot(str)
+    def on_backend_error(self, msg):
+        self.status_label.setText(f"Model loading failed: {msg}")
     
     def start_camera(self):
         if not self.camera_thread:
-            self.camera_thread = CameraThread()
+            self.camera_thread = CameraThread(motion_threshold=self.motion_threshold,
+                                             latency_budget=self.latency_budget)
             self.camera_thread.set_anpr_backend(self.anpr_backend)
             self.camera_thread.frame_ready.connect(self.on_frame_ready)
+            self.camera_thread.results_ready.connect(self.on_results_ready)
+            self.camera_thread.stats_ready.connect(self.on_stats_ready)
             self.camera_thread.error.connect(self.on_camera_error)
             self.camera_thread.start()
             self.start_button.setEnabled(False)
@@ -81,44 +128,64 @@ class MainWindow(QMainWindow):
         if self.camera_thread:
             self.camera_thread.stop()
             self.camera_thread = None
+            self.frame_slot = None
+            self.displayed_seq = None
+            self.last_detection = None
             self.start_button.setEnabled(True)
             self.stop_button.setEnabled(False)
             self.capture_button.setEnabled(False)
             self.camera_label.clear()
     
-    @Slot(np.ndarray)
-    def on_frame_ready(self, frame):
-        self.frame = frame.copy()
-        # Optionally, run detection on every frame for live results
-        results, _ = self.anpr_backend.process_frame(self.frame)
-        self.last_detection = results
-        self.update_labels_from_results(results)
+    @Slot(int, int)
+    def on_frame_ready(self, slot, seq):
+        # Only remember where the newest frame is; update_frame reads it in place
+        self.frame_slot = (slot, seq)
+    
+    @Slot(object)
+    def on_results_ready(self, result: FrameResult):
+        # Inference already ran on the camera thread; only render its output
+        if self.last_detection is not None and result.seq <= self.last_detection.seq:
+            return
+        self.last_detection = result
+        self.update_labels_from_results({'vehicles': result.vehicles})
+    
+    @Slot(dict)
+    def on_stats_ready(self, stats):
+        # Every processed frame must cost exactly one backend inference
+        if stats['backend_inferences'] != stats['frames_processed']:
+            self.logger.warning(
+                f"Inference count mismatch: {stats['backend_inferences']} backend calls "
+                f"for {stats['frames_processed']} processed frames"
+            )
     
     @Slot(str)
     def on_camera_error(self, msg):
         self.camera_label.setText(f"Camera Error: {msg}")
     
     def update_frame(self):
-        if self.frame is not None:
-            height, width = self.frame.shape[:2]
-            bytes_per_line = 3 * width
-            # Convert BGR to RGB
-            rgb_frame = cv2.cvtColor(self.frame, cv2.COLOR_BGR2RGB)
-            # Create QImage from frame
-            q_img = QImage(rgb_frame.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
-            # Scale image to fit label while maintaining aspect ratio
-            scaled_pixmap = QPixmap.fromImage(q_img).scaled(
-                self.camera_label.size(), 
-                Qt.AspectRatioMode.KeepAspectRatio, 
-                Qt.TransformationMode.SmoothTransformation
-            )
-            self.camera_label.setPixmap(scaled_pixmap)
+        if self.frame_slot is None or self.camera_thread is None:
+            return
+        slot, seq = self.frame_slot
+        if seq == self.displayed_seq:
+            return
+        
+        pixmap = pixmap_from_ring(self.camera_thread.display_ring, slot, seq)
+        if pixmap is None:
+            return
+        self.displayed_seq = seq
+        
+        # Scale image to fit label while maintaining aspect ratio
+        scaled_pixmap = pixmap.scaled(
+            self.camera_label.size(), 
+            Qt.AspectRatioMode.KeepAspectRatio, 
+            Qt.TransformationMode.SmoothTransformation
+        )
+        self.camera_label.setPixmap(scaled_pixmap)
     
     def capture_frame(self):
-        if self.frame is not None:
-            # Process frame with ANPR backend
-            results, _ = self.anpr_backend.process_frame(self.frame)
-            self.update_labels_from_results(results)
+        # Show the results of the most recently processed frame
+        if self.last_detection is not None:
+            self.update_labels_from_results({'vehicles': self.last_detection.vehicles})
     
     def update_labels_from_results(self, results):
         # Show the first detected plate and vehicle type
@@ -137,4 +204,5 @@ class MainWindow(QMainWindow):
     
     def closeEvent(self, event):
         self.stop_camera()
+        self.warmup_thread.wait()
         event.accept()
\ No newline at end of file
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QGridLayout, QLabel
+from PySide6.QtCore import Qt, QTimer, Slot
+from camera_manager import CameraManager
+from anpr_processor import ANPRBackend
+from ocr_cache import OCRCache
+from ui_mainwindow import pixmap_from_ring
+from warmup_thread import WarmupThread
+
+class MultiCameraWindow(QMainWindow):
+    def __init__(self, sources, motion_thresholds=None, latency_budget=None):
+        super().__init__()
+        self.setWindowTitle("ANPR System - Multi Camera")
+        self.setMinimumSize(1200, 800)
+        
+        # One backend, and one OCR cache, serves every camera
+        self.anpr_backend = ANPRBackend(ocr_cache=OCRCache())
+        self.manager = CameraManager(self.anpr_backend)
+        
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        layout = QVBoxLayout(central_widget)
+        grid = QGridLayout()
+        layout.addLayout(grid)
+        
+        # Create one tile per camera
+        self.tiles = {}
+        self.frame_slots = {}
+        self.displayed_seqs = {}
+        columns = max(1, math.ceil(math.sqrt(len(sources))))
+        motion_thresholds = motion_thresholds or [None] * len(sources)
+        for index, (source, motion_threshold) in enumerate(zip(sources, motion_thresholds)):
+            camera_id = f"cam{index + 1}"
+            self.manager.add_camera(camera_id, source, motion_threshold=motion_threshold,
+                                    latency_budget=latency_budget)
+            
+            tile = QVBoxLayout()
+            view = QLabel()
+            view.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            view.setMinimumSize(320, 180)
+            info = QLabel(f"{camera_id}: {source}")
+            tile.addWidget(view)
+            tile.addWidget(info)
+            grid.addLayout(tile, index // columns, index % columns)
+            self.tiles[camera_id] = (view, info, source)
+        
+        self.metrics_label = QLabel("Loading models...")
+        layout.addWidget(self.metrics_label)
+        
+        self.manager.frame_ready.connect(self.on_frame_ready)
+        self.manager.results_ready.connect(self.on_results_ready)
+        self.manager.metrics_ready.connect(self.on_metrics_ready)
+        self.manager.error.connect(self.on_camera_error)
+        
+        # Cameras start once the shared backend has warmed up
+        self.warmup_thread = WarmupThread(self.anpr_backend)
+        self.warmup_thread.ready.connect(self.on_backend_ready)
+        self.warmup_thread.error.connect(lambda msg: self.metrics_label.setText(f"Model loading failed: {msg}"))
+        self.warmup_thread.start()
+        
+        # Setup timer for frame updates
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.update_frames)
+        self.timer.start(30)
+    
+    @Slot(dict)
+    def on_backend_ready(self, warmup_times):
+        self.metrics_label.setText("Throughput: ")
+        self.manager.start()
+    
+    @Slot(str, int, int)
+    def on_frame_ready(self, camera_id, slot, seq):
+        self.frame_slots[camera_id] = (slot, seq)
+    
+    @Slot(str, object)
+    def on_results_ready(self, camera_id, result):
+        view, info, source = self.tiles[camera_id]
+        plates = [plate['text'] for vehicle in result.vehicles for plate in vehicle['plates'] if plate['text']]
+        info.setText(f"{camera_id}: {len(result.vehicles)} vehicles  {' '.join(plates)}")
+    
+    @Slot(dict)
+    def on_metrics_ready(self, metrics):
+        parts = [
+            f"{camera_id} {m['capture_fps']:.1f}/{m['processed_fps']:.1f} fps, stride {m['stride']}"
+            for camera_id, m in metrics['cameras'].items()
+        ]
+        self.metrics_label.setText(
+            f"Throughput: {metrics['total_processed_fps']:.1f} processed fps, "
+            f"batch {metrics['mean_batch_size']:.1f}, "
+            f"motion gate saved {metrics['total_cpu_saved_s']:.0f} s, "
+            f"OCR cache hits {metrics['ocr_cache']['hit_rate']:.0%}  |  " + "  ".join(parts)
+        )
+    
+    @Slot(str, str)
+    def on_camera_error(self, camera_id, msg):
+        view, info, source = self.tiles[camera_id]
+        info.setText(f"{camera_id}: Camera Error: {msg}")
+    
+    def update_frames(self):
+        for camera_id, (slot, seq) in list(self.frame_slots.items()):
+            if seq == self.displayed_seqs.get(camera_id):
+                continue
+            ring = self.manager.cameras[camera_id].display_ring
+            pixmap = pixmap_from_ring(ring, slot, seq)
+            if pixmap is None:
+                continue
+            self.displayed_seqs[camera_id] = seq
+            view = self.tiles[camera_id][0]
+            view.setPixmap(pixmap.scaled(
+                view.size(),
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            ))
+    
+    def closeEvent(self, event):
+        self.timer.stop()
+        self.warmup_thread.wait()
+        self.manager.stop()
+        event.accept()
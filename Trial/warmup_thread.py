@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ============================================================================
+# Warm-up Thread Module
+# This module loads and warms up the ANPR backend off the GUI thread and
+# signals when it is ready to process frames.
+# ============================================================================
+
+import logging
+
+from PySide6.QtCore import QThread, Signal
+
+
+class WarmupThread(QThread):
+    """Runs ANPRBackend.warmup() in the background."""
+
+    # Signals
+    ready = Signal(dict)  # per-stage warm-up latencies in ms
+    error = Signal(str)
+
+    def __init__(self, backend, runs: int = None):
+        """Initialize the warm-up thread.
+
+        Args:
+            backend: ANPRBackend to warm up
+            runs: Dummy runs per stage (None for the backend's setting)
+        """
+        super().__init__()
+        self.logger = logging.getLogger(__name__)
+        self.backend = backend
+        self.runs = runs
+
+    def run(self):
+        """Load every enabled model and run the dummy inputs."""
+        try:
+            self.ready.emit(self.backend.warmup(self.runs))
+        except Exception as e:
+            self.logger.error(f"Warm-up error: {str(e)}")
+            self.error.emit(str(e))
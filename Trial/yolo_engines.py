@@ -0,0 +1,428 @@
+# Interchangeable inference engines for the YOLO detection and classification models
+import json
+import logging
+import threading
+import cv2
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+from box_utils import letterbox, nms, unletterbox_boxes
+
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+try:
+    import openvino as ov
+except ImportError:
+    ov = None
+
+ENGINES = ('torch', 'onnxruntime', 'openvino')
+PRECISIONS = ('fp32', 'int8_dynamic', 'int8_static', 'bf16')
+ENGINE_ALIASES = {'onnx': 'onnxruntime', 'ort': 'onnxruntime', 'ov': 'openvino'}
+
+# Offset that keeps boxes of different classes apart during class-aware NMS
+MAX_WH = 7680
+
+
+class Detections(NamedTuple):
+    """Detector output for one image, in source image coordinates."""
+    boxes: np.ndarray       # (N, 4) xyxy
+    scores: np.ndarray      # (N,)
+    class_ids: np.ndarray   # (N,)
+    names: Dict[int, str]
+
+
+class Classification(NamedTuple):
+    """Classifier output for one image."""
+    probs: np.ndarray       # (num_classes,)
+    names: Dict[int, str]
+
+    @property
+    def top1(self) -> int:
+        return int(np.argmax(self.probs))
+
+    @property
+    def top1conf(self) -> float:
+        return float(self.probs[self.top1])
+
+
+def resolve_engine(engine: Optional[str], device: str) -> Tuple[str, str]:
+    """Pick the engine from an explicit name or from the device string.
+
+    'onnx'/'onnxruntime' and 'openvino' are accepted as devices so existing
+    callers can switch engines through the `device` argument alone.
+
+    Returns:
+        Tuple of (engine name, torch device)
+    """
+    name = ENGINE_ALIASES.get(engine or device, engine or device)
+    if name in ('onnxruntime', 'openvino'):
+        return name, 'cpu'
+    if engine is not None and name not in ENGINES:
+        raise ValueError(f"Unknown inference engine: {engine}")
+    return 'torch', device
+
+
+def check_engine_options(
+    engine: Optional[str],
+    device: str,
+    precision: str = 'fp32',
+    calibration_dir: Optional[Union[str, Path]] = None
+) -> Tuple[str, str]:
+    """Check that an engine can run a precision, without loading any model.
+
+    Raises the errors load_yolo_engine() would otherwise raise only once a
+    model is loaded: an unknown engine or precision, a precision the engine
+    does not support, a missing runtime or a missing calibration folder.
+
+    Returns:
+        Tuple of (engine name, torch device), as resolve_engine()
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision: {precision}")
+    name, torch_device = resolve_engine(engine, device)
+    if name == 'torch':
+        if precision != 'fp32':
+            raise ValueError("Reduced precision needs the 'onnxruntime' or 'openvino' engine")
+        return name, torch_device
+
+    engine_class = OnnxRuntimeEngine if name == 'onnxruntime' else OpenVINOEngine
+    if precision not in engine_class.SUPPORTED_PRECISIONS:
+        raise ValueError(
+            f"The {name} engine supports precisions {engine_class.SUPPORTED_PRECISIONS}, not {precision!r}"
+        )
+    if (ort if name == 'onnxruntime' else ov) is None:
+        raise ImportError(f"{name} is required for the '{name}' engine")
+    if precision == 'int8_static' and calibration_dir is None:
+        raise ValueError("int8_static needs a calibration_dir of representative frames")
+    return name, torch_device
+
+
+def export_onnx(model_path: Union[str, Path], imgsz: Optional[int] = None) -> Tuple[Path, Dict]:
+    """Export a .pt model to ONNX once and cache it next to the weights.
+
+    The export is reused while it is newer than the weights. Class names,
+    task and input size are kept in a JSON sidecar so the runtimes do not
+    need ultralytics or the onnx package to interpret the model.
+
+    Returns:
+        Tuple of (path to the .onnx file, metadata dict)
+    """
+    model_path = Path(model_path)
+    onnx_path = model_path.with_suffix('.onnx')
+    meta_path = model_path.with_suffix('.onnx.json')
+
+    fresh = (
+        onnx_path.exists() and meta_path.exists()
+        and (not model_path.exists() or onnx_path.stat().st_mtime >= model_path.stat().st_mtime)
+    )
+    if not fresh:
+        from ultralytics import YOLO
+
+        model = YOLO(str(model_path))
+        train_args = getattr(model, 'ckpt', None) or {}
+        train_args = train_args.get('train_args', {}) if isinstance(train_args, dict) else {}
+        default_size = 224 if model.task == 'classify' else 640
+        size = imgsz or train_args.get('imgsz') or default_size
+        if isinstance(size, (list, tuple)):
+            size = max(size)
+
+        exported = Path(model.export(format='onnx', imgsz=size, dynamic=True))
+        if exported != onnx_path:
+            exported.replace(onnx_path)
+        metadata = {
+            'task': model.task,
+            'imgsz': int(size),
+            'names': {int(k): v for k, v in model.names.items()}
+        }
+        meta_path.write_text(json.dumps(metadata))
+        logging.getLogger(__name__).info(f"Exported {model_path} to {onnx_path}")
+
+    metadata = json.loads(meta_path.read_text())
+    metadata['names'] = {int(k): v for k, v in metadata['names'].items()}
+    return onnx_path, metadata
+
+
+def to_tensor(images: List[np.ndarray]) -> np.ndarray:
+    """Stack equally sized BGR images into a (B, 3, H, W) float32 RGB batch in [0, 1]."""
+    batch = np.stack(images)[..., ::-1].transpose(0, 3, 1, 2)
+    return np.ascontiguousarray(batch, dtype=np.float32) / 255.0
+
+
+def preprocess_detect(images: List[np.ndarray], size: int) -> Tuple[np.ndarray, List[Tuple[float, Tuple[int, int]]]]:
+    """Letterbox images into a detector batch.
+
+    Returns:
+        Tuple of (batch, per-image (scale, pad) for mapping boxes back)
+    """
+    boxed = [letterbox(image, size) for image in images]
+    return to_tensor([image for image, _, _ in boxed]), [(scale, pad) for _, scale, pad in boxed]
+
+
+def preprocess_classify(images: List[np.ndarray], size: int) -> np.ndarray:
+    """Resize the short side and centre-crop, like ultralytics' classify transforms."""
+    crops = []
+    for image in images:
+        h, w = image.shape[:2]
+        scale = size / min(h, w)
+        resized = cv2.resize(image, (max(size, round(w * scale)), max(size, round(h * scale))),
+                             interpolation=cv2.INTER_LINEAR)
+        top = (resized.shape[0] - size) // 2
+        left = (resized.shape[1] - size) // 2
+        crops.append(resized[top:top + size, left:left + size])
+    return to_tensor(crops)
+
+
+class TorchEngine:
+    """Runs a model through ultralytics on PyTorch.
+
+    Each distinct (conf, imgsz) setting gets its own predictor, configured
+    once and then called directly, so per-call argument merging and model
+    setup are not repeated for every frame. Predictors keep per-call state,
+    so calls are serialised for engines shared between threads.
+    """
+
+    name = 'torch'
+
+    def __init__(self, model_path: Union[str, Path], device: str = 'cpu'):
+        from ultralytics import YOLO
+
+        self.model = YOLO(str(model_path))
+        self.device = device
+        self.task = self.model.task
+        self.names = self.model.names
+        imgsz = self.model.overrides.get('imgsz') or 640
+        self.imgsz = max(imgsz) if isinstance(imgsz, (list, tuple)) else int(imgsz)
+        self._predictors = {}
+        self._lock = threading.Lock()
+
+    def _predictor(self, **args):
+        """Return the persistent predictor for these settings, creating it on first use.
+
+        Predictors are built through ultralytics' private _smart_load hook;
+        if that is missing or its interface changed, the settings are passed
+        to the public model.predict() on every call instead.
+        """
+        key = tuple(sorted(args.items()))
+        with self._lock:
+            predictor = self._predictors.get(key)
+            if predictor is None:
+                predictor = self._build_predictor(args)
+                self._predictors[key] = predictor
+        return predictor
+
+    def _build_predictor(self, args: Dict):
+        # The defaults model.predict() applies on top of the model's
+        # overrides; without 'rect' non-square frames are padded to a square
+        # input, and boxes and scores drift from what model.predict() returns
+        overrides = {
+            **self.model.overrides, 'conf': 0.25, 'rect': True, 'mode': 'predict', 'save': False,
+            'verbose': False, 'batch': 1, 'device': self.device, **args
+        }
+        try:
+            predictor = self.model._smart_load('predictor')(overrides=overrides, _callbacks=self.model.callbacks)
+            predictor.setup_model(model=self.model.model, verbose=False)
+            return predictor
+        except (AttributeError, TypeError) as e:
+            logging.getLogger(__name__).warning(f"Persistent predictor unavailable, using model.predict: {e}")
+            return lambda images: self.model.predict(images, verbose=False, device=self.device, **args)
+
+    @property
+    def weight_bytes(self) -> int:
+        """Size of the network's parameters and buffers."""
+        tensors = list(self.model.model.parameters()) + list(self.model.model.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+
+    def detect(self, images: List[np.ndarray], conf: float = 0.25, imgsz: Optional[int] = None) -> List[Detections]:
+        predictor = self._predictor(conf=conf, imgsz=imgsz) if imgsz else self._predictor(conf=conf)
+        with self._lock:
+            outputs = predictor(images)
+        return [
+            Detections(
+                results.boxes.xyxy.cpu().numpy(),
+                results.boxes.conf.cpu().numpy(),
+                results.boxes.cls.cpu().numpy().astype(np.int64),
+                results.names
+            )
+            for results in outputs
+        ]
+
+    def classify(self, images: List[np.ndarray]) -> List[Classification]:
+        predictor = self._predictor()
+        with self._lock:
+            outputs = predictor(images)
+        return [Classification(results.probs.data.cpu().numpy(), results.names) for results in outputs]
+
+
+class OnnxEngine:
+    """Shared NumPy pre- and post-processing for runtimes that execute the ONNX export."""
+
+    name = 'onnx'
+    SUPPORTED_PRECISIONS = ('fp32',)
+
+    def __init__(
+        self,
+        model_path: Union[str, Path],
+        precision: str = 'fp32',
+        calibration_dir: Optional[Union[str, Path]] = None,
+        iou_threshold: float = 0.7,
+        max_det: int = 300
+    ):
+        if precision not in self.SUPPORTED_PRECISIONS:
+            raise ValueError(
+                f"The {self.name} engine supports precisions {self.SUPPORTED_PRECISIONS}, not {precision!r}"
+            )
+        self.onnx_path, self.metadata = export_onnx(model_path)
+        self.model_file = self.onnx_path
+        self.task = self.metadata['task']
+        self.names = self.metadata['names']
+        self.imgsz = self.metadata['imgsz']
+        self.precision = precision
+        self.calibration_dir = calibration_dir
+        self.iou_threshold = iou_threshold
+        self.max_det = max_det
+
+    def _infer(self, batch: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    @property
+    def weight_bytes(self) -> int:
+        """On-disk size of the model the runtime executes."""
+        path = Path(self.model_file)
+        size = path.stat().st_size
+        if path.suffix == '.xml':
+            size += path.with_suffix('.bin').stat().st_size
+        return size
+
+    def detect(self, images: List[np.ndarray], conf: float = 0.25, imgsz: Optional[int] = None) -> List[Detections]:
+        batch, transforms = preprocess_detect(images, imgsz or self.imgsz)
+        outputs = self._infer(batch)
+
+        detections = []
+        # YOLOv8 output is (B, 4 + num_classes, anchors) with cx, cy, w, h boxes
+        for image, (scale, pad), output in zip(images, transforms, outputs):
+            preds = output.T
+            class_scores = preds[:, 4:]
+            class_ids = class_scores.argmax(axis=1)
+            scores = class_scores[np.arange(len(preds)), class_ids]
+            keep = scores > conf
+            preds, scores, class_ids = preds[keep], scores[keep], class_ids[keep]
+
+            boxes = np.empty((len(preds), 4), dtype=np.float32)
+            boxes[:, :2] = preds[:, :2] - preds[:, 2:4] / 2
+            boxes[:, 2:] = preds[:, :2] + preds[:, 2:4] / 2
+
+            kept = nms(boxes + class_ids[:, None] * MAX_WH, scores, self.iou_threshold)[:self.max_det]
+            detections.append(Detections(
+                unletterbox_boxes(boxes[kept], scale, pad, image.shape[:2]),
+                scores[kept],
+                class_ids[kept].astype(np.int64),
+                self.names
+            ))
+        return detections
+
+    def classify(self, images: List[np.ndarray]) -> List[Classification]:
+        probs = self._infer(preprocess_classify(images, self.imgsz))
+        return [Classification(p, self.names) for p in probs]
+
+
+class OnnxRuntimeEngine(OnnxEngine):
+    """Runs the ONNX export on ONNX Runtime's CPU execution provider.
+
+    INT8 precisions run a QDQ/integer copy of the export made with
+    onnxruntime.quantization (see quantization.py).
+    """
+
+    name = 'onnxruntime'
+    SUPPORTED_PRECISIONS = ('fp32', 'int8_dynamic', 'int8_static')
+
+    def __init__(self, model_path: Union[str, Path], threads: Optional[int] = None, **kwargs):
+        if ort is None:
+            raise ImportError("onnxruntime is required for the 'onnxruntime' engine")
+        super().__init__(model_path, **kwargs)
+
+        if self.precision != 'fp32':
+            from quantization import quantize_onnx
+
+            self.model_file = quantize_onnx(self.onnx_path, self.metadata, self.precision, self.calibration_dir)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(str(self.model_file), options, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def _infer(self, batch: np.ndarray) -> np.ndarray:
+        return self.session.run(None, {self.input_name: batch})[0]
+
+
+class OpenVINOEngine(OnnxEngine):
+    """Runs the ONNX export on OpenVINO's CPU plugin.
+
+    'int8_static' runs an NNCF-quantized copy of the export; 'bf16' asks the
+    plugin for bfloat16 inference and falls back to fp32 on CPUs without it.
+    """
+
+    name = 'openvino'
+    SUPPORTED_PRECISIONS = ('fp32', 'int8_static', 'bf16')
+
+    def __init__(self, model_path: Union[str, Path], threads: Optional[int] = None, **kwargs):
+        if ov is None:
+            raise ImportError("openvino is required for the 'openvino' engine")
+        super().__init__(model_path, **kwargs)
+
+        config = {'PERFORMANCE_HINT': 'LATENCY'}
+        if threads:
+            config['INFERENCE_NUM_THREADS'] = threads
+        core = ov.Core()
+
+        if self.precision == 'int8_static':
+            from quantization import quantize_openvino
+
+            self.model_file = quantize_openvino(self.onnx_path, self.metadata, self.calibration_dir)
+        elif self.precision == 'bf16':
+            if 'BF16' in core.get_property('CPU', 'OPTIMIZATION_CAPABILITIES'):
+                config['INFERENCE_PRECISION_HINT'] = 'bf16'
+            else:
+                logging.getLogger(__name__).warning("CPU has no bfloat16 support, running fp32")
+                self.precision = 'fp32'
+        if 'INFERENCE_PRECISION_HINT' not in config:
+            # Keep fp32 explicit so the plugin does not pick bf16 on its own
+            config['INFERENCE_PRECISION_HINT'] = 'f32'
+
+        self.compiled = core.compile_model(core.read_model(str(self.model_file)), 'CPU', config)
+        self.output = self.compiled.output(0)
+
+    def _infer(self, batch: np.ndarray) -> np.ndarray:
+        return self.compiled([batch])[self.output]
+
+
+def load_yolo_engine(
+    model_path: Union[str, Path],
+    engine: Optional[str] = None,
+    device: str = 'cpu',
+    threads: Optional[int] = None,
+    precision: str = 'fp32',
+    calibration_dir: Optional[Union[str, Path]] = None
+):
+    """Load a YOLO model on the requested engine.
+
+    Args:
+        model_path: Path to the .pt weights
+        engine: 'torch', 'onnxruntime' or 'openvino' (None picks from device)
+        device: Torch device, or an engine name used as a device
+        threads: CPU threads for the ONNX runtimes (None for the runtime default)
+        precision: One of PRECISIONS; reduced precisions need an ONNX engine
+        calibration_dir: Folder of frames used to calibrate 'int8_static'
+    """
+    name, torch_device = check_engine_options(engine, device, precision, calibration_dir)
+    kwargs = {'threads': threads, 'precision': precision, 'calibration_dir': calibration_dir}
+    if name == 'onnxruntime':
+        return OnnxRuntimeEngine(model_path, **kwargs)
+    if name == 'openvino':
+        return OpenVINOEngine(model_path, **kwargs)
+    return TorchEngine(model_path, torch_device)